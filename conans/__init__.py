@@ -2,60 +2,26 @@
 # to allow refactors
 import warnings
 
-from conans.client.build.autotools_environment import AutoToolsBuildEnvironment
-from conans.client.build.cmake import CMake
-from conans.client.build.meson import Meson
-from conans.client.build.msbuild import MSBuild
-from conans.client.build.visual_environment import VisualStudioBuildEnvironment
-from conans.client.run_environment import RunEnvironment
 from conans.model.conan_file import ConanFile
 from conans.model.options import Options
 from conans.model.settings import Settings
 from conans.util.files import load
+from conans.util.lazy_import import lazy_attributes
 
-
-try:
-    from conan.tools.gnu import MakeToolchain as _MakeToolchain
-    from conans.client.output import Color, ConanOutput
-    class MakeToolchain(_MakeToolchain):
-        def __init__(self, conanfile, *args, **kwargs):
-            msg = ("\n*****************************************************************\n"
-                   "*****************************************************************\n"
-                   "'from conans import MakeToolchain' has been deprecated and moved.\n"
-                   "It will be removed in next Conan release.\n"
-                   "Use 'from conan.tools.gnu import MakeToolchain' instead.\n"
-                   "*****************************************************************\n"
-                   "*****************************************************************\n")
-            ConanOutput(conanfile.output._stream,
-                        color=conanfile.output._color).writeln(msg, front=Color.BRIGHT_RED)
-            warnings.warn(msg)
-            super(MakeToolchain, self).__init__(conanfile, *args, **kwargs)
-except ImportError:
-    class MakeToolchain(object):
-        def __init__(self, conanfile, *args, **kwargs):
-            raise Exception("Python 2.7 is no longer supported for MakeToolchain")
-
-
-try:
-    from conan.tools.microsoft import MSBuildToolchain as _MSBuildToolchain
-    from conans.client.output import Color, ConanOutput
-    class MSBuildToolchain(_MSBuildToolchain):
-        def __init__(self, conanfile, *args, **kwargs):
-            msg = ("\n*****************************************************************\n"
-                   "*****************************************************************\n"
-                   "'from conans import MSBuildToolchain' has been deprecated and moved.\n"
-                   "It will be removed in next Conan release.\n"
-                   "Use 'from conan.tools.microsoft import MSBuildToolchain' instead.\n"
-                   "*****************************************************************\n"
-                   "*****************************************************************\n")
-            ConanOutput(conanfile.output._stream,
-                        color=conanfile.output._color).writeln(msg, front=Color.BRIGHT_RED)
-            warnings.warn(msg)
-            super(MSBuildToolchain, self).__init__(conanfile, *args, **kwargs)
-except ImportError:
-    class MSBuildToolchain(object):
-        def __init__(self, conanfile, *args, **kwargs):
-            raise Exception("Python 2.7 is no longer supported for MSBuildToolchain")
+# The build helpers are imported on first use, most Conan commands don't need them
+_lazy_exports = {
+    "AutoToolsBuildEnvironment": "conans.client.build.autotools_environment",
+    "CMake": "conans.client.build.cmake",
+    "Meson": "conans.client.build.meson",
+    "MSBuild": "conans.client.build.msbuild",
+    "VisualStudioBuildEnvironment": "conans.client.build.visual_environment",
+    "RunEnvironment": "conans.client.run_environment",
+    "MakeToolchain": "conans.client.build.toolchain_aliases",
+    "MSBuildToolchain": "conans.client.build.toolchain_aliases",
+    # Exported by "from conans import *" when the build helpers were imported eagerly
+    "Color": "conans.client.output",
+    "ConanOutput": "conans.client.output"}
+lazy_attributes(globals(), _lazy_exports)
 
 
 def CMakeToolchain(conanfile, **kwargs):
@@ -85,7 +51,18 @@ REVISIONS = "revisions"  # Only when enabled in config, not by default look at s
 ONLY_V2 = "only_v2"  # Remotes and virtuals from Artifactory returns this capability
 MATRIX_PARAMS = "matrix_params"
 OAUTH_TOKEN = "oauth_token"
-SERVER_CAPABILITIES = [COMPLEX_SEARCH_CAPABILITY, REVISIONS]  # Server is always with revisions
+TXZ_PACKAGES = "txz_packages"  # The server accepts and serves conan_package.txz files
+BATCH_METADATA = "batch_metadata"  # Only when v2, the metadata of many references in one request
+SERVER_CAPABILITIES = [COMPLEX_SEARCH_CAPABILITY, REVISIONS, CHECKSUM_DEPLOY,
+                       TXZ_PACKAGES, BATCH_METADATA]  # Server is always with revisions
 DEFAULT_REVISION_V1 = "0"
 
+# The names exported by "from conans import *", the lazy ones are not in the module namespace
+# until they are used. The submodules, and the "tools" used by the recipes, are imported by it
+__all__ = ["ConanFile", "Options", "Settings", "load", "CMakeToolchain", "warnings",
+           "COMPLEX_SEARCH_CAPABILITY", "CHECKSUM_DEPLOY", "REVISIONS", "ONLY_V2",
+           "MATRIX_PARAMS", "OAUTH_TOKEN", "TXZ_PACKAGES", "BATCH_METADATA",
+           "SERVER_CAPABILITIES", "DEFAULT_REVISION_V1",
+           "client", "errors", "model", "paths", "tools", "unicode", "util"] + list(_lazy_exports)
+
 __version__ = '1.33.0-dev'
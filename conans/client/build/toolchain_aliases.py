@@ -0,0 +1,45 @@
+import warnings
+
+
+try:
+    from conan.tools.gnu import MakeToolchain as _MakeToolchain
+    from conans.client.output import Color, ConanOutput
+    class MakeToolchain(_MakeToolchain):
+        def __init__(self, conanfile, *args, **kwargs):
+            msg = ("\n*****************************************************************\n"
+                   "*****************************************************************\n"
+                   "'from conans import MakeToolchain' has been deprecated and moved.\n"
+                   "It will be removed in next Conan release.\n"
+                   "Use 'from conan.tools.gnu import MakeToolchain' instead.\n"
+                   "*****************************************************************\n"
+                   "*****************************************************************\n")
+            ConanOutput(conanfile.output._stream,
+                        color=conanfile.output._color).writeln(msg, front=Color.BRIGHT_RED)
+            warnings.warn(msg)
+            super(MakeToolchain, self).__init__(conanfile, *args, **kwargs)
+except ImportError:
+    class MakeToolchain(object):
+        def __init__(self, conanfile, *args, **kwargs):
+            raise Exception("Python 2.7 is no longer supported for MakeToolchain")
+
+
+try:
+    from conan.tools.microsoft import MSBuildToolchain as _MSBuildToolchain
+    from conans.client.output import Color, ConanOutput
+    class MSBuildToolchain(_MSBuildToolchain):
+        def __init__(self, conanfile, *args, **kwargs):
+            msg = ("\n*****************************************************************\n"
+                   "*****************************************************************\n"
+                   "'from conans import MSBuildToolchain' has been deprecated and moved.\n"
+                   "It will be removed in next Conan release.\n"
+                   "Use 'from conan.tools.microsoft import MSBuildToolchain' instead.\n"
+                   "*****************************************************************\n"
+                   "*****************************************************************\n")
+            ConanOutput(conanfile.output._stream,
+                        color=conanfile.output._color).writeln(msg, front=Color.BRIGHT_RED)
+            warnings.warn(msg)
+            super(MSBuildToolchain, self).__init__(conanfile, *args, **kwargs)
+except ImportError:
+    class MSBuildToolchain(object):
+        def __init__(self, conanfile, *args, **kwargs):
+            raise Exception("Python 2.7 is no longer supported for MSBuildToolchain")
@@ -6,6 +6,7 @@ from collections import OrderedDict
 from jinja2 import Environment, select_autoescape, FileSystemLoader, ChoiceLoader
 
 from conans.assets.templates import dict_loader
+from conans.client.cache.cache_index import CacheIndex
 from conans.client.cache.editable import EditablePackages
 from conans.client.cache.remote_registry import RemoteRegistry
 from conans.client.conf import ConanClientConfigParser, get_default_client_conf, \
@@ -24,6 +25,7 @@ from conans.paths.package_layouts.package_cache_layout import PackageCacheLayout
 from conans.paths.package_layouts.package_editable_layout import PackageEditableLayout
 from conans.unicode import get_cwd
 from conans.util.files import list_folder_subdirs, load, normalize, save, remove
+from conans.util.hash_cache import stat_key
 from conans.util.locks import Lock
 
 CONAN_CONF = 'conan.conf'
@@ -35,6 +37,10 @@ HOOKS_FOLDER = "hooks"
 TEMPLATES_FOLDER = "templates"
 GENERATORS_FOLDER = "generators"
 
+# The settings.yml files parsed by this process {path: (stat of the file, Settings)}, the parsed
+# Settings are never modified, every caller gets a copy-on-write copy of them
+_parsed_settings = {}
+
 
 def _is_case_insensitive_os():
     system = platform.system()
@@ -77,17 +83,18 @@ class ClientCache(object):
 
         # Caching
         self._no_lock = None
+        self._polled_lock = None
         self._config = None
         self._new_config = None
         self.editable_packages = EditablePackages(self.cache_folder)
         # paths
         self._store_folder = self.config.storage_path or os.path.join(self.cache_folder, "data")
+        self.index = CacheIndex(self._store_folder, self.cache_folder)
         # Just call it to make it raise in case of short_paths misconfiguration
         _ = self.config.short_paths_home
 
     def all_refs(self):
-        subdirs = list_folder_subdirs(basedir=self._store_folder, level=4)
-        return [ConanFileReference.load_dir_repr(folder) for folder in subdirs]
+        return self.index.refs()
 
     @property
     def store(self):
@@ -112,7 +119,8 @@ class ClientCache(object):
             _check_ref_case(ref, self.store)
             base_folder = os.path.normpath(os.path.join(self.store, ref.dir_repr()))
             return PackageCacheLayout(base_folder=base_folder, ref=ref,
-                                      short_paths=short_paths, no_lock=self._no_locks())
+                                      short_paths=short_paths, no_lock=self._no_locks(),
+                                      index=self.index, polled_locks=self._polled_locks())
 
     @property
     def remotes_path(self):
@@ -127,6 +135,11 @@ class ClientCache(object):
             self._no_lock = self.config.cache_no_locks
         return self._no_lock
 
+    def _polled_locks(self):
+        if self._polled_lock is None:
+            self._polled_lock = self.config.cache_polled_locks
+        return self._polled_lock
+
     @property
     def artifacts_properties_path(self):
         return os.path.join(self.cache_folder, ARTIFACTS_PROPERTIES_FILE)
@@ -224,8 +237,7 @@ class ClientCache(object):
         """Returns {setting: [value, ...]} defining all the possible
            settings without values"""
         self.initialize_settings()
-        content = load(self.settings_path)
-        return Settings.loads(content)
+        return _load_settings(self.settings_path)
 
     @property
     def hooks(self):
@@ -353,3 +365,12 @@ def _mix_settings_with_env(settings):
         if env.startswith("CONAN_ENV_") and get_setting_name(env) not in ret:
             ret[get_setting_name(env)] = value
     return ret
+
+
+def _load_settings(settings_path):
+    state = stat_key(settings_path)
+    parsed = _parsed_settings.get(settings_path)
+    if parsed is None or parsed[0] != state:
+        parsed = state, Settings.loads(load(settings_path))
+        _parsed_settings[settings_path] = parsed
+    return parsed[1].copy()
@@ -0,0 +1,289 @@
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+
+from conans.errors import ConanException
+from conans.model.package_metadata import PackageMetadata
+from conans.model.ref import ConanFileReference, PackageReference
+from conans.paths import PACKAGE_METADATA
+from conans.search.packages_index import create_tables, query_package_infos, \
+    remove_package_infos, sync_package_infos
+from conans.util.files import load
+from conans.util.hash_cache import RACY_SECONDS, stat_key
+from conans.util.log import logger
+
+CACHE_INDEX = "cache_index.sqlite"
+RECIPES_TABLE = "recipes"
+PACKAGES_TABLE = "packages"
+FOLDERS_TABLE = "folders"
+INFO_TABLE = "info"
+REF_LEVEL = 4  # The reference folders are <name>/<version>/<user>/<channel>
+
+
+class CacheIndex(object):
+    """ Index of the references in the cache storage, with the revisions and remotes of their
+    metadata, so listing and searching the cache doesn't need to walk the storage folder and
+    parse every metadata.json. It also stores the settings and options of the binary packages,
+    to resolve the package queries without parsing every conaninfo.txt.
+
+    It lives in the Conan home. It is updated every time a metadata is saved (export, install,
+    download, upload...) and when a reference is removed. The changes made to the storage by
+    other tools, Conan versions or Conan homes sharing the same 'storage.path' are detected
+    before listing the references with the stat of the storage folders and of the metadata
+    files: only the folders and the metadata that changed are read again. It can also be
+    rebuilt with reindex().
+
+    It is only an optimization, the errors updating it are logged and it is marked to be built
+    again, they don't fail the operation that already modified the storage
+    """
+
+    def __init__(self, store_folder, cache_folder):
+        self._store_folder = store_folder
+        self._dbfile = os.path.join(cache_folder, CACHE_INDEX)
+
+    @contextmanager
+    def _connect(self, rebuild=False, sync=False):
+        folder = os.path.dirname(self._dbfile)
+        if not os.path.exists(folder):
+            os.makedirs(folder)
+        connection = sqlite3.connect(self._dbfile, timeout=60)
+        connection.text_factory = str
+        try:
+            cursor = connection.cursor()
+            cursor.execute("CREATE TABLE IF NOT EXISTS %s (ref TEXT PRIMARY KEY, revision TEXT, "
+                           "remote TEXT, timestamp REAL, metadata TEXT)" % RECIPES_TABLE)
+            cursor.execute("CREATE TABLE IF NOT EXISTS %s (ref TEXT, package_id TEXT, "
+                           "revision TEXT, recipe_revision TEXT, remote TEXT, timestamp REAL, "
+                           "PRIMARY KEY (ref, package_id))" % PACKAGES_TABLE)
+            cursor.execute("CREATE TABLE IF NOT EXISTS %s (path TEXT PRIMARY KEY, stat TEXT)"
+                           % FOLDERS_TABLE)
+            cursor.execute("CREATE TABLE IF NOT EXISTS %s (name TEXT PRIMARY KEY, value TEXT)"
+                           % INFO_TABLE)
+            create_tables(cursor)
+            cursor.execute("SELECT value FROM %s WHERE name = 'built'" % INFO_TABLE)
+            if rebuild or not cursor.fetchone():  # New index, or a previous build didn't finish
+                self._build(cursor)
+            elif sync:
+                self._sync(cursor)
+            yield cursor
+            connection.commit()
+        except sqlite3.Error as e:
+            raise ConanException("Error accessing the cache index %s: %s"
+                                 % (self._dbfile, str(e)))
+        finally:
+            connection.close()
+
+    @staticmethod
+    def _key(ref):
+        return ref.copy_clear_rev().dir_repr()
+
+    def _stat(self, path):
+        """ :return: the stat key of a file or folder of the storage, as stored in the index,
+                 None if it doesn't exist or it was modified too recently to trust it
+        """
+        try:
+            key = stat_key(os.path.join(self._store_folder, path))
+        except OSError:
+            return None
+        if key[1] > (time.time() - RACY_SECONDS) * 1000000000:
+            return None
+        return ",".join(str(v) for v in key)
+
+    @staticmethod
+    def _save(cursor, key, metadata, metadata_stat=None):
+        now = time.time()
+        cursor.execute("DELETE FROM %s WHERE ref = ?" % PACKAGES_TABLE, (key, ))
+        cursor.execute("INSERT OR REPLACE INTO %s (ref, revision, remote, timestamp, metadata) "
+                       "VALUES (?, ?, ?, ?, ?)" % RECIPES_TABLE,
+                       (key, metadata.recipe.revision, metadata.recipe.remote, now,
+                        metadata_stat))
+        cursor.executemany("INSERT INTO %s (ref, package_id, revision, recipe_revision, remote, "
+                           "timestamp) VALUES (?, ?, ?, ?, ?, ?)" % PACKAGES_TABLE,
+                           [(key, package_id, pkg_metadata.revision,
+                             pkg_metadata.recipe_revision, pkg_metadata.remote, now)
+                            for package_id, pkg_metadata in metadata.packages.items()])
+
+    def _index_ref(self, cursor, key):
+        metadata_path = "%s/%s" % (key, PACKAGE_METADATA)
+        metadata_stat = self._stat(metadata_path)
+        metadata = PackageMetadata()
+        if os.path.exists(os.path.join(self._store_folder, metadata_path)):
+            try:
+                metadata = PackageMetadata.loads(load(os.path.join(self._store_folder,
+                                                                   metadata_path)))
+            except Exception as e:
+                logger.error("Invalid metadata in %s: %s" % (key, str(e)))
+        self._save(cursor, key, metadata, metadata_stat)
+
+    @staticmethod
+    def _remove(cursor, key):
+        cursor.execute("DELETE FROM %s WHERE ref = ?" % RECIPES_TABLE, (key, ))
+        cursor.execute("DELETE FROM %s WHERE ref = ?" % PACKAGES_TABLE, (key, ))
+        remove_package_infos(cursor, key)
+
+    @staticmethod
+    def _under(cursor, table, column, path):
+        """ :return: the keys of the table under a relative folder of the storage, all of them
+                 for the storage folder ("")
+        """
+        if not path:
+            cursor.execute("SELECT %s FROM %s" % (column, table))
+        else:  # The paths inside "path/" sort between "path/" and "path0"
+            cursor.execute("SELECT %s FROM %s WHERE %s >= ? AND %s < ?"
+                           % (column, table, column, column), (path + "/", path + "0"))
+        return [row[0] for row in cursor.fetchall()]
+
+    def _sync_folder(self, cursor, path, synced):
+        """ lists again a folder above the reference folders, indexing the references under its
+        new subfolders and removing the ones under its missing subfolders
+        :param path: relative path of the folder, "" for the storage folder
+        :param synced: the references indexed now, updated
+        """
+        level = path.count("/") + 1 if path else 0
+        abs_path = os.path.join(self._store_folder, path)
+        try:
+            current = set(name for name in os.listdir(abs_path)
+                          if os.path.isdir(os.path.join(abs_path, name)))
+        except OSError:  # Removed, it will be removed from its parent
+            current = set()
+        prefix = path + "/" if path else ""
+        if level + 1 == REF_LEVEL:
+            known = self._under(cursor, RECIPES_TABLE, "ref", path)
+        else:
+            known = self._under(cursor, FOLDERS_TABLE, "path", path)
+        known = set(p[len(prefix):] for p in known if p and p.count("/") == level)
+
+        for name in known - current:
+            removed = prefix + name
+            for ref in self._under(cursor, RECIPES_TABLE, "ref", removed) + [removed]:
+                self._remove(cursor, ref)
+            for folder in self._under(cursor, FOLDERS_TABLE, "path", removed) + [removed]:
+                cursor.execute("DELETE FROM %s WHERE path = ?" % FOLDERS_TABLE, (folder, ))
+        for name in current - known:
+            added = prefix + name
+            if level + 1 == REF_LEVEL:
+                self._index_ref(cursor, added)
+                synced.add(added)
+            else:
+                self._sync_folder(cursor, added, synced)
+
+        cursor.execute("INSERT OR REPLACE INTO %s (path, stat) VALUES (?, ?)" % FOLDERS_TABLE,
+                       (path, self._stat(path)))
+
+    def _sync(self, cursor):
+        """ updates the index with the changes made to the storage by other tools, Conan
+        versions or homes: the folders whose stat changed are listed again, and the metadata
+        files whose stat changed are loaded again
+        """
+        cursor.execute("SELECT path, stat FROM %s" % FOLDERS_TABLE)
+        folders = dict(cursor.fetchall())
+        folders.setdefault("", None)  # The storage folder itself
+        changed = [path for path, stat in folders.items()
+                   if stat is None or self._stat(path) != stat]
+        synced = set()
+        # The parents first, the folders removed from them don't need to be listed
+        for path in sorted(changed, key=lambda p: p.count("/") + 1 if p else 0):
+            cursor.execute("SELECT 1 FROM %s WHERE path = ?" % FOLDERS_TABLE, (path, ))
+            if not path or cursor.fetchone():
+                self._sync_folder(cursor, path, synced)
+
+        cursor.execute("SELECT ref, metadata FROM %s" % RECIPES_TABLE)
+        for key, metadata_stat in cursor.fetchall():
+            if key in synced:
+                continue
+            if metadata_stat is None or \
+                    self._stat("%s/%s" % (key, PACKAGE_METADATA)) != metadata_stat:
+                self._index_ref(cursor, key)
+
+    def _build(self, cursor):
+        """ indexes all the reference folders in the storage folder, in the same transaction, so
+        concurrent processes never see a partial index
+        """
+        cursor.execute("DELETE FROM %s" % RECIPES_TABLE)
+        cursor.execute("DELETE FROM %s" % PACKAGES_TABLE)
+        cursor.execute("DELETE FROM %s" % FOLDERS_TABLE)
+        remove_package_infos(cursor)
+        self._sync(cursor)
+        cursor.execute("INSERT OR REPLACE INTO %s (name, value) VALUES ('built', ?)"
+                       % INFO_TABLE, (str(time.time()), ))
+
+    def reindex(self):
+        """ rebuilds the index from the contents of the storage folder
+        :return: the number of indexed references
+        """
+        with self._connect(rebuild=True) as cursor:
+            cursor.execute("SELECT COUNT(*) FROM %s" % RECIPES_TABLE)
+            return cursor.fetchone()[0]
+
+    def _invalidate(self, error):
+        """ marks the index to be built again from the storage the next time it is used, after
+        an update failed
+        """
+        logger.error("Error updating the cache index %s: %s" % (self._dbfile, str(error)))
+        try:
+            connection = sqlite3.connect(self._dbfile, timeout=60)
+            try:
+                connection.execute("DELETE FROM %s WHERE name = 'built'" % INFO_TABLE)
+                connection.commit()
+            finally:
+                connection.close()
+        except sqlite3.Error as e:  # The storage folders will still be synced by their stat
+            logger.error("Error invalidating the cache index %s: %s" % (self._dbfile, str(e)))
+
+    def update(self, ref, metadata):
+        key = self._key(ref)
+        try:
+            with self._connect() as cursor:
+                self._save(cursor, key, metadata, self._stat("%s/%s" % (key, PACKAGE_METADATA)))
+        except ConanException as e:
+            self._invalidate(e)
+
+    def remove(self, ref):
+        try:
+            with self._connect() as cursor:
+                self._remove(cursor, self._key(ref))
+        except ConanException as e:
+            self._invalidate(e)
+
+    def search_packages(self, ref, conaninfo_paths, condition):
+        """ filters the binary packages of a reference with a query, using the settings and
+        options stored for them, that are only parsed again from the conaninfo.txt files
+        modified since the last search
+        :param conaninfo_paths: {package_id: conaninfo.txt path} of the existing packages
+        :param condition: the query compiled by postfix_to_sql()
+        :return: {package_id: serialize_min() dict} of the matching packages
+        """
+        key = self._key(ref)
+        with self._connect() as cursor:
+            sync_package_infos(cursor, key, conaninfo_paths)
+            return query_package_infos(cursor, key, condition)
+
+    def refs(self):
+        with self._connect(sync=True) as cursor:
+            cursor.execute("SELECT ref FROM %s" % RECIPES_TABLE)
+            return [ConanFileReference.load_dir_repr(row[0]) for row in cursor.fetchall()]
+
+    def recipe_remotes(self):
+        """ :return: {ref: remote_name or None} of all the references in the cache
+        """
+        with self._connect(sync=True) as cursor:
+            cursor.execute("SELECT ref, remote FROM %s" % RECIPES_TABLE)
+            return {ConanFileReference.load_dir_repr(key): remote
+                    for key, remote in cursor.fetchall()}
+
+    def package_remotes(self):
+        """ :return: {pref: remote_name or None} of all the packages in the metadata of the
+                 references in the cache
+        """
+        with self._connect(sync=True) as cursor:
+            cursor.execute("SELECT ref, package_id, remote FROM %s" % PACKAGES_TABLE)
+            rows = cursor.fetchall()
+        refs = {}
+        result = {}
+        for key, package_id, remote in rows:
+            ref = refs.get(key)
+            if ref is None:
+                ref = refs[key] = ConanFileReference.load_dir_repr(key)
+            result[PackageReference(ref, package_id)] = remote
+        return result
@@ -0,0 +1,109 @@
+import json
+import os
+import platform
+import shutil
+import threading
+
+from conans.errors import ConanException
+from conans.model.manifest import FileTreeManifest
+from conans.util.files import link_or_copy, load, make_file_read_only, mkdir, rmdir, save
+from conans.util.log import logger
+from conans.util.sha import sha256
+
+CHECKSUMS_FILE = "checksums.json"
+TREE_FOLDER = "p"
+
+
+def _copy_tree(src, dst, copy_file):
+    """ replicates the src folder in dst, including empty folders and symlinks, materializing
+    the regular files with copy_file(src_file, dst_file)
+    """
+    for root, dirs, files in os.walk(src):
+        dst_root = os.path.normpath(os.path.join(dst, os.path.relpath(root, src)))
+        mkdir(dst_root)
+        for name in dirs + files:
+            src_path = os.path.join(root, name)
+            dst_path = os.path.join(dst_root, name)
+            if os.path.islink(src_path):
+                os.symlink(os.readlink(src_path), dst_path)
+            elif name in files:
+                copy_file(src_path, dst_path)
+        dirs[:] = [d for d in dirs if not os.path.islink(os.path.join(root, d))]
+
+
+class PackageBlobCache(object):
+    """ Content addressed store of extracted package folders, that can be shared among different
+    Conan homes of the same machine, so a package revision downloaded and extracted once can be
+    installed again reflinking or copying its files, or hardlinking them if the installed
+    packages are read-only (CONAN_READ_ONLY_CACHE), so the entries are never modified through
+    the installed packages.
+
+    Every entry is keyed by the package reference with revisions and the manifest summary hash,
+    and it is never modified once it has been created, the files are read-only.
+    """
+
+    def __init__(self, folder):
+        self._folder = folder
+
+    @staticmethod
+    def key(pref, manifest):
+        return sha256(("%s %s" % (pref.full_str(), manifest.summary_hash)).encode())
+
+    def restore(self, key, package_folder, manifest, read_only=False):
+        """ populates package_folder from the store entry, checking its contents against the
+        manifest of the package. Corrupted entries are removed
+        :param read_only: the package folder is read-only, so its files can be hardlinks
+        :return: the checksums of the downloaded files of the package, or None if the entry
+                 doesn't exist or it is corrupted
+        """
+        entry_folder = os.path.join(self._folder, key)
+        tree_folder = os.path.join(entry_folder, TREE_FOLDER)
+        checksums_path = os.path.join(entry_folder, CHECKSUMS_FILE)
+        if not os.path.exists(checksums_path):  # Written last, the entry is complete
+            return None
+
+        # Removing read-only files in Windows changes their permissions, shared by the hardlinks
+        hardlink = read_only and platform.system() != "Windows"
+
+        def restore_file(src, dst):
+            link_or_copy(src, dst, hardlink=hardlink)
+
+        _copy_tree(tree_folder, package_folder, restore_file)
+        try:
+            stored_manifest = FileTreeManifest.load(package_folder)
+            if stored_manifest != manifest or FileTreeManifest.create(package_folder) != manifest:
+                raise ConanException("The contents do not match the manifest")
+            return json.loads(load(checksums_path))
+        except Exception as e:
+            logger.error("Package blob cache entry %s is not valid: %s" % (entry_folder, str(e)))
+            rmdir(package_folder)
+            rmdir(entry_folder)  # It will be stored again from the downloaded package
+            return None
+
+    def store(self, key, package_folder, checksums):
+        """ copies the extracted package_folder into the store, if the entry doesn't exist yet.
+        It is created in a temporary folder and renamed, so concurrent processes never see a
+        partial entry
+        """
+        entry_folder = os.path.join(self._folder, key)
+        if os.path.exists(entry_folder):
+            return
+        tmp_folder = os.path.join(self._folder, "%s.%s.%s.tmp" % (key, os.getpid(),
+                                                                  threading.current_thread().ident))
+        try:
+            def copy_read_only(src, dst):
+                shutil.copy2(src, dst)
+                make_file_read_only(dst)
+
+            _copy_tree(package_folder, os.path.join(tmp_folder, TREE_FOLDER), copy_read_only)
+            save(os.path.join(tmp_folder, CHECKSUMS_FILE), json.dumps(checksums))
+            try:
+                os.rename(tmp_folder, entry_folder)
+            except OSError:  # Other process stored the same entry meanwhile
+                pass
+        except Exception as e:
+            logger.error("Package blob cache entry %s could not be stored: %s"
+                         % (entry_folder, str(e)))
+        finally:
+            if os.path.exists(tmp_folder):
+                rmdir(tmp_folder)
@@ -406,19 +406,9 @@ class RemoteRegistry(object):
 
     @property
     def refs_list(self):
-        result = {}
-        for ref in self._cache.all_refs():
-            metadata = self._cache.package_layout(ref).load_metadata()
-            if metadata.recipe.remote:
-                result[ref] = metadata.recipe.remote
-        return result
+        return {ref: remote for ref, remote in self._cache.index.recipe_remotes().items()
+                if remote}
 
     @property
     def prefs_list(self):
-        result = {}
-        for ref in self._cache.all_refs():
-            metadata = self._cache.package_layout(ref).load_metadata()
-            for pid, pkg_metadata in metadata.packages.items():
-                pref = PackageReference(ref, pid)
-                result[pref] = pkg_metadata.remote
-        return result
+        return self._cache.index.package_remotes()
@@ -6,6 +6,7 @@ import traceback
 from collections import defaultdict
 from multiprocessing.pool import ThreadPool
 
+from conans import TXZ_PACKAGES
 from conans.util import progress_bar
 from conans.util.env_reader import get_env
 from conans.util.progress_bar import left_justify_message
@@ -15,7 +16,7 @@ from conans.errors import ConanException, NotFoundException
 from conans.model.manifest import gather_files, FileTreeManifest
 from conans.model.ref import ConanFileReference, PackageReference, check_valid_ref
 from conans.paths import (CONAN_MANIFEST, CONANFILE, EXPORT_SOURCES_TGZ_NAME,
-                          EXPORT_TGZ_NAME, PACKAGE_TGZ_NAME, CONANINFO)
+                          EXPORT_TGZ_NAME, PACKAGE_TGZ_NAME, PACKAGE_TXZ_NAME, CONANINFO)
 from conans.search.search import search_packages, search_recipes
 from conans.util.files import (load, clean_dirty, is_dirty,
                                gzopen_without_timestamps, set_dirty_context_manager)
@@ -362,7 +363,7 @@ class CmdUpload(object):
                                    remote=p_remote)
 
         t1 = time.time()
-        the_files = self._compress_package_files(pkg_layout, pref, integrity_check)
+        the_files = self._compress_package_files(pkg_layout, pref, integrity_check, p_remote)
 
         if policy == UPLOAD_POLICY_SKIP:
             return None
@@ -428,7 +429,15 @@ class CmdUpload(object):
 
         return result
 
-    def _compress_package_files(self, layout, pref, integrity_check):
+    def _package_tgz_name(self, remote):
+        """ txz packages are smaller, but only when the remote can serve them
+        """
+        if (self._cache.config.compression_format == "txz" and
+                self._remote_manager.server_supports(remote, TXZ_PACKAGES)):
+            return PACKAGE_TXZ_NAME
+        return PACKAGE_TGZ_NAME
+
+    def _compress_package_files(self, layout, pref, integrity_check, remote):
         t1 = time.time()
         if layout.package_is_dirty(pref):
             raise ConanException("Package %s is corrupted, aborting upload.\n"
@@ -436,9 +445,10 @@ class CmdUpload(object):
                                  % (pref, pref.ref, pref.id))
 
         download_pkg_folder = layout.download_package(pref)
-        package_tgz = os.path.join(download_pkg_folder, PACKAGE_TGZ_NAME)
+        tgz_name = self._package_tgz_name(remote)
+        package_tgz = os.path.join(download_pkg_folder, tgz_name)
         if is_dirty(package_tgz):
-            self._output.warn("%s: Removing %s, marked as dirty" % (str(pref), PACKAGE_TGZ_NAME))
+            self._output.warn("%s: Removing %s, marked as dirty" % (str(pref), tgz_name))
             os.remove(package_tgz)
             clean_dirty(package_tgz)
 
@@ -462,12 +472,12 @@ class CmdUpload(object):
                 self._output.writeln("Compressing package...")
             tgz_files = {f: path for f, path in files.items() if
                          f not in [CONANINFO, CONAN_MANIFEST]}
-            tgz_path = compress_files(tgz_files, symlinks, PACKAGE_TGZ_NAME, download_pkg_folder,
+            tgz_path = compress_files(tgz_files, symlinks, tgz_name, download_pkg_folder,
                                       self._output)
             assert tgz_path == package_tgz
             assert os.path.exists(package_tgz)
 
-        return {PACKAGE_TGZ_NAME: package_tgz,
+        return {tgz_name: package_tgz,
                 CONANINFO: files[CONANINFO],
                 CONAN_MANIFEST: files[CONAN_MANIFEST]}
 
@@ -593,7 +603,13 @@ def compress_files(files, symlinks, name, dest_dir, output=None):
     # FIXME, better write to disk sequentially and not keep tgz contents in memory
     tgz_path = os.path.join(dest_dir, name)
     with set_dirty_context_manager(tgz_path), open(tgz_path, "wb") as tgz_handle:
-        tgz = gzopen_without_timestamps(name, mode="w", fileobj=tgz_handle)
+        if name.endswith(".txz"):
+            # xz has no timestamps, the result is deterministic too
+            preset = int(os.getenv("CONAN_COMPRESSION_LEVEL", 9))
+            tgz = tarfile.open(name, mode="w:xz", fileobj=tgz_handle, format=tarfile.GNU_FORMAT,
+                               preset=preset)
+        else:
+            tgz = gzopen_without_timestamps(name, mode="w", fileobj=tgz_handle)
 
         for filename, dest in sorted(symlinks.items()):
             info = tarfile.TarInfo(name=filename)
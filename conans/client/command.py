@@ -339,6 +339,7 @@ class Command(object):
 
         _add_manifests_arguments(parser)
         _add_common_install_arguments(parser, build_help=_help_build_policies.format("package name"))
+        _add_metadata_ttl_argument(parser)
 
         args = parser.parse_args(*args)
         self._warn_python_version()
@@ -373,7 +374,8 @@ class Command(object):
                                       lockfile=args.lockfile,
                                       lockfile_out=args.lockfile_out,
                                       ignore_dirty=args.ignore_dirty,
-                                      profile_build=profile_build)
+                                      profile_build=profile_build,
+                                      metadata_ttl=args.metadata_ttl)
         except ConanException as exc:
             info = exc.info
             raise
@@ -475,6 +477,7 @@ class Command(object):
         _add_common_install_arguments(parser, build_help=_help_build_policies.format("never"))
         parser.add_argument("--lockfile-node-id", action=OnceArgument,
                             help="NodeID of the referenced package in the lockfile")
+        _add_metadata_ttl_argument(parser)
 
         args = parser.parse_args(*args)
         self._check_lockfile_args(args)
@@ -505,7 +508,8 @@ class Command(object):
                                            no_imports=args.no_imports,
                                            install_folder=args.install_folder,
                                            lockfile=args.lockfile,
-                                           lockfile_out=args.lockfile_out)
+                                           lockfile_out=args.lockfile_out,
+                                           metadata_ttl=args.metadata_ttl)
             else:
                 if args.reference:
                     raise ConanException("A full reference was provided as first argument, second "
@@ -528,7 +532,8 @@ class Command(object):
                                                      install_folder=args.install_folder,
                                                      lockfile=args.lockfile,
                                                      lockfile_out=args.lockfile_out,
-                                                     lockfile_node_id=args.lockfile_node_id)
+                                                     lockfile_node_id=args.lockfile_node_id,
+                                                     metadata_ttl=args.metadata_ttl)
 
         except ConanException as exc:
             info = exc.info
@@ -1139,6 +1144,48 @@ class Command(object):
                                   packages=args.packages, builds=args.builds, src=args.src,
                                   force=args.force, remote_name=args.remote, outdated=args.outdated)
 
+    def cache(self, *args):
+        """
+        Manages the Conan caches.
+
+        It cleans the download cache defined in 'storage.download_cache', and rebuilds the
+        index of the references in the local cache.
+        """
+        parser = argparse.ArgumentParser(description=self.cache.__doc__,
+                                         prog="conan cache",
+                                         formatter_class=SmartFormatter)
+        subparsers = parser.add_subparsers(dest='subcommand', help='sub-command help')
+        subparsers.required = True
+
+        clean_subparser = subparsers.add_parser('clean',
+                                                help="Remove files from the download cache, by "
+                                                     "default all of them, and report its usage")
+        clean_subparser.add_argument("--max-size", action=OnceArgument,
+                                     help="Remove the least recently used files until the cache "
+                                          "is not bigger than this, e.g. 10GB. Defaults to the "
+                                          "'storage.download_cache_max_size' configuration")
+        clean_subparser.add_argument("--max-age", action=OnceArgument,
+                                     help="Remove the files not used during this time, e.g. 30d. "
+                                          "Defaults to the 'storage.download_cache_max_age' "
+                                          "configuration")
+        subparsers.add_parser('reindex',
+                              help="Rebuild the index of the references in the local cache from "
+                                   "its storage folder, e.g. after modifying it with other tools")
+        args = parser.parse_args(*args)
+
+        if args.subcommand == "clean":
+            result = self._conan.cache_clean(max_size=args.max_size, max_age=args.max_age)
+            requests = result["hits"] + result["misses"]
+            hit_rate = 100.0 * result["hits"] / requests if requests else 0
+            self._out.info("Download cache: %s hits, %s misses (%.1f%% hit rate)"
+                           % (result["hits"], result["misses"], hit_rate))
+            self._out.info("Removed %s files, %s bytes reclaimed"
+                           % (result["removed"], result["reclaimed"]))
+            return result
+        elif args.subcommand == "reindex":
+            count = self._conan.cache_reindex()
+            self._out.info("Indexed %s references" % count)
+
     def copy(self, *args):
         """
         Copies conan recipes and packages to another user/channel.
@@ -1950,7 +1997,8 @@ class Command(object):
                 ("Package development commands", ("source", "build", "package", "editable",
                                                   "workspace")),
                 ("Misc commands", ("profile", "remote", "user", "imports", "copy", "remove",
-                                   "alias", "download", "inspect", "help", "lock", "frogarian"))]
+                                   "alias", "download", "inspect", "help", "lock", "cache",
+                                   "frogarian"))]
 
         def check_all_commands_listed():
             """Keep updated the main directory, raise if don't"""
@@ -2153,6 +2201,14 @@ def _add_manifests_arguments(parser):
                         action=OnceArgument)
 
 
+def _add_metadata_ttl_argument(parser):
+    parser.add_argument("--metadata-ttl", type=int, action=OnceArgument,
+                        help="Seconds the revisions, versions and capabilities already queried "
+                             "to the remotes are used without checking them again. Overrides "
+                             "'general.metadata_ttl' of conan.conf (default 0: always checked). "
+                             "They are always checked with --update")
+
+
 def _add_common_install_arguments(parser, build_help, update_help=None, lockfile=True):
     if build_help:
         parser.add_argument("-b", "--build", action=Extender, nargs="?", help=build_help)
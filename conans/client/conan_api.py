@@ -9,6 +9,7 @@ from six import StringIO
 import conans
 from conans import __version__ as client_version
 from conans.client.cache.cache import ClientCache
+from conans.client.cache.editable import EDITABLE_PACKAGES_FILE
 from conans.client.cmd.build import cmd_build
 from conans.client.cmd.create import create
 from conans.client.cmd.download import download
@@ -22,6 +23,7 @@ from conans.client.cmd.uploader import CmdUpload
 from conans.client.cmd.user import user_set, users_clean, users_list, token_present
 from conans.client.conanfile.package import run_package_method
 from conans.client.conf.required_version import check_required_conan_version
+from conans.client.downloaders.cached_file_downloader import CachedFileDownloader
 from conans.client.generators import GeneratorManager
 from conans.client.graph.graph import RECIPE_EDITABLE
 from conans.client.graph.graph_binaries import GraphBinariesAnalyzer
@@ -45,6 +47,7 @@ from conans.client.remote_manager import RemoteManager
 from conans.client.remover import ConanRemover
 from conans.client.rest.auth_manager import ConanApiAuthManager
 from conans.client.rest.conan_requester import ConanRequester
+from conans.client.rest.metadata_cache import RemoteMetadataCache
 from conans.client.rest.rest_client import RestApiClientFactory
 from conans.client.runner import ConanRunner
 from conans.client.source import config_source_local
@@ -64,9 +67,12 @@ from conans.search.search import search_recipes
 from conans.tools import set_global_instances
 from conans.unicode import get_cwd
 from conans.util.conan_v2_mode import CONAN_V2_MODE_ENVVAR
+from conans.util.dates import timedelta_from_text
 from conans.util.env_reader import get_env
 from conans.util.files import exception_message_safe, mkdir, save_files, load, save
+from conans.util.hash_cache import stat_key
 from conans.util.log import configure_logger
+from conans.util.misc import size_from_text
 from conans.util.tracer import log_command, log_exception
 
 default_manifest_folder = '.conan_manifests'
@@ -176,26 +182,41 @@ class ConanApp(object):
                                                   self.config.logging_file)
         conans.util.log.logger.debug("INIT: Using config '%s'" % self.cache.conan_conf_path)
 
-        self.hook_manager = HookManager(self.cache.hooks_path, self.config.hooks, self.out)
         # Wraps an http_requester to inject proxies, certs, etc
         self.requester = ConanRequester(self.config, http_requester)
         # To handle remote connections
         artifacts_properties = self.cache.read_artifacts_properties()
+        self.metadata_cache = RemoteMetadataCache(self.cache_folder, self.config.metadata_ttl)
         rest_client_factory = RestApiClientFactory(self.out, self.requester, self.config,
-                                                   artifacts_properties=artifacts_properties)
+                                                   artifacts_properties=artifacts_properties,
+                                                   metadata_cache=self.metadata_cache)
         # Wraps RestApiClient to add authentication support (same interface)
-        auth_manager = ConanApiAuthManager(rest_client_factory, self.user_io, self.cache.localdb)
-        # Handle remote connections
-        self.remote_manager = RemoteManager(self.cache, auth_manager, self.out, self.hook_manager)
-
-        # Adjust global tool variables
-        set_global_instances(self.out, self.requester, self.config)
+        self._auth_manager = ConanApiAuthManager(rest_client_factory, self.user_io,
+                                                 self.cache.localdb)
 
         self.runner = runner or ConanRunner(self.config.print_commands_to_output,
                                             self.config.generate_run_log_file,
                                             self.config.log_run_to_output,
                                             self.out)
 
+        # The classes of the recipes loaded by all the commands of a reused app
+        self._conanfile_classes = {}
+        self._state = self._files_state()
+        self._init_command()
+
+    def _init_command(self):
+        """ the collaborators that keep the state of a single command (the loaded hooks, the
+        resolved ranges, the evaluated binaries...), created again for each command of a
+        reused app
+        """
+        self.hook_manager = HookManager(self.cache.hooks_path, self.config.hooks, self.out)
+        # Handle remote connections
+        self.remote_manager = RemoteManager(self.cache, self._auth_manager, self.out,
+                                            self.hook_manager)
+
+        # Adjust global tool variables
+        set_global_instances(self.out, self.requester, self.config)
+
         self.proxy = ConanProxy(self.cache, self.out, self.remote_manager)
         self.range_resolver = RangeResolver(self.cache, self.remote_manager)
         self.generator_manager = GeneratorManager()
@@ -203,13 +224,49 @@ class ConanApp(object):
                                                   self.generator_manager)
         self.pyreq_loader = PyRequireLoader(self.proxy, self.range_resolver)
         self.loader = ConanFileLoader(self.runner, self.out, self.python_requires,
-                                      self.generator_manager, self.pyreq_loader)
+                                      self.generator_manager, self.pyreq_loader,
+                                      cached_classes=self._conanfile_classes)
 
         self.binaries_analyzer = GraphBinariesAnalyzer(self.cache, self.out, self.remote_manager)
         self.graph_manager = GraphManager(self.out, self.cache, self.remote_manager, self.loader,
                                           self.proxy, self.range_resolver, self.binaries_analyzer)
 
-    def load_remotes(self, remote_name=None, update=False, check_updates=False):
+    def _files_state(self):
+        """ the stat of the files that are only read when the app is created, and the Conan
+        environment variables, that the app cannot be reused if they change
+        """
+        paths = [self.cache.conan_conf_path, self.cache.new_config_path, self.cache.remotes_path,
+                 self.cache.settings_path, self.cache.artifacts_properties_path,
+                 os.path.join(self.cache_folder, EDITABLE_PACKAGES_FILE)]
+        state = []
+        for path in paths:
+            try:
+                state.append(stat_key(path))
+            except OSError:
+                state.append(None)
+        env = sorted((k, v) for k, v in os.environ.items() if k.startswith("CONAN_"))
+        return state, env
+
+    def reuse(self):
+        """ prepares the app to run another command
+        :return: False if the configuration changed, a new app has to be created
+        """
+        if self._files_state() != self._state:
+            return False
+        self.user_io.out = self.out
+        self.metadata_cache.ttl = self.config.metadata_ttl
+        self._init_command()
+        return True
+
+    def load_remotes(self, remote_name=None, update=False, check_updates=False,
+                     metadata_ttl=None):
+        """ :param metadata_ttl: overrides the general.metadata_ttl of the configuration. It is
+                             ignored when checking for updates, that revalidates every response
+        """
+        if update or check_updates:
+            self.metadata_cache.ttl = 0
+        elif metadata_ttl is not None:
+            self.metadata_cache.ttl = metadata_ttl
         remotes = self.cache.registry.load_remotes()
         if remote_name:
             remotes.select(remote_name)
@@ -225,7 +282,10 @@ class ConanAPIV1(object):
         return cls(), None, None
 
     def __init__(self, cache_folder=None, output=None, user_io=None, http_requester=None,
-                 runner=None):
+                 runner=None, persistent=False):
+        """ :param persistent: reuse the ConanApp for all the api calls, while the configuration
+                               doesn't change, instead of creating a new one for each call
+        """
         self.color = colorama_initialize()
         self.out = output or ConanOutput(sys.stdout, sys.stderr, self.color)
         self.user_io = user_io or UserIO(out=self.out)
@@ -233,6 +293,7 @@ class ConanAPIV1(object):
         self.http_requester = http_requester
         self.runner = runner
         self.app = None  # Api calls will create a new one every call
+        self._persistent_app = None if not persistent else False
         # Migration system
         migrator = ClientMigrator(self.cache_folder, Version(client_version), self.out)
         migrator.migrate()
@@ -242,6 +303,12 @@ class ConanAPIV1(object):
             sys.path.append(os.path.join(self.cache_folder, "python"))
 
     def create_app(self, quiet_output=None):
+        if self._persistent_app is not None and quiet_output is None:
+            if not self._persistent_app or not self._persistent_app.reuse():
+                self._persistent_app = ConanApp(self.cache_folder, self.user_io,
+                                                self.http_requester, self.runner)
+            self.app = self._persistent_app
+            return
         self.app = ConanApp(self.cache_folder, self.user_io, self.http_requester,
                             self.runner, quiet_output=quiet_output)
 
@@ -340,7 +407,8 @@ class ConanAPIV1(object):
                keep_source=False, keep_build=False, verify=None,
                manifests=None, manifests_interactive=None,
                remote_name=None, update=False, cwd=None, test_build_folder=None,
-               lockfile=None, lockfile_out=None, ignore_dirty=False, profile_build=None):
+               lockfile=None, lockfile_out=None, ignore_dirty=False, profile_build=None,
+               metadata_ttl=None):
         """
         API method to create a conan package
 
@@ -356,7 +424,8 @@ class ConanAPIV1(object):
         try:
             conanfile_path = _get_conanfile_path(conanfile_path, cwd, py=True)
 
-            remotes = self.app.load_remotes(remote_name=remote_name, update=update)
+            remotes = self.app.load_remotes(remote_name=remote_name, update=update,
+                                            metadata_ttl=metadata_ttl)
             lockfile = _make_abs_path(lockfile, cwd) if lockfile else None
             graph_info = get_graph_info(profile_host, profile_build, cwd, None,
                                         self.app.cache, self.app.out, lockfile=lockfile)
@@ -531,7 +600,7 @@ class ConanAPIV1(object):
                           manifests_interactive=None, build=None, profile_names=None,
                           update=False, generators=None, install_folder=None, cwd=None,
                           lockfile=None, lockfile_out=None, profile_build=None,
-                          lockfile_node_id=None):
+                          lockfile_node_id=None, metadata_ttl=None):
         profile_host = ProfileData(profiles=profile_names, settings=settings, options=options,
                                    env=env)
         recorder = ActionRecorder()
@@ -550,7 +619,8 @@ class ConanAPIV1(object):
             install_folder = _make_abs_path(install_folder, cwd)
 
             mkdir(install_folder)
-            remotes = self.app.load_remotes(remote_name=remote_name, update=update)
+            remotes = self.app.load_remotes(remote_name=remote_name, update=update,
+                                            metadata_ttl=metadata_ttl)
             deps_install(self.app, ref_or_path=reference, install_folder=install_folder,
                          remotes=remotes, graph_info=graph_info, build_modes=build,
                          update=update, manifest_folder=manifest_folder,
@@ -576,7 +646,7 @@ class ConanAPIV1(object):
                 remote_name=None, verify=None, manifests=None,
                 manifests_interactive=None, build=None, profile_names=None,
                 update=False, generators=None, no_imports=False, install_folder=None, cwd=None,
-                lockfile=None, lockfile_out=None, profile_build=None):
+                lockfile=None, lockfile_out=None, profile_build=None, metadata_ttl=None):
         profile_host = ProfileData(profiles=profile_names, settings=settings, options=options,
                                    env=env)
         recorder = ActionRecorder()
@@ -594,7 +664,8 @@ class ConanAPIV1(object):
             install_folder = _make_abs_path(install_folder, cwd)
             conanfile_path = _get_conanfile_path(path, cwd, py=None)
 
-            remotes = self.app.load_remotes(remote_name=remote_name, update=update)
+            remotes = self.app.load_remotes(remote_name=remote_name, update=update,
+                                            metadata_ttl=metadata_ttl)
             deps_install(app=self.app,
                          ref_or_path=conanfile_path,
                          install_folder=install_folder,
@@ -1010,12 +1081,9 @@ class ConanAPIV1(object):
     @api_method
     def remote_list_ref(self, no_remote=False):
         if no_remote:
-            result = {}
-            for ref in self.app.cache.all_refs():
-                metadata = self.app.cache.package_layout(ref).load_metadata()
-                if not metadata.recipe.remote:
-                    result[str(ref)] = None
-            return result
+            return {str(r): None for r, remote_name in
+                    self.app.cache.index.recipe_remotes().items()
+                    if not remote_name}
         else:
             return {str(r): remote_name for r, remote_name in
                     self.app.cache.registry.refs_list.items()
@@ -1110,6 +1178,35 @@ class ConanAPIV1(object):
     def remove_locks(self):
         self.app.cache.remove_locks()
 
+    @api_method
+    def cache_clean(self, max_size=None, max_age=None):
+        """ Evicts files from the download cache. Without limits given or configured, all of them
+        :return: dict with the hits and misses of the cache, the number of removed files and
+                 the reclaimed bytes
+        """
+        config = self.app.config
+        download_cache = config.download_cache
+        if not download_cache:
+            raise ConanException("There is no 'storage.download_cache' defined")
+        max_size = size_from_text(max_size) if max_size else config.download_cache_max_size
+        max_age = timedelta_from_text(max_age) if max_age else config.download_cache_max_age
+        if max_size is None and max_age is None:
+            max_size = 0
+        cached_downloader = CachedFileDownloader(download_cache, None)
+        hits, misses = cached_downloader.stats()
+        if os.path.isdir(download_cache):
+            removed, reclaimed = cached_downloader.evict(max_size, max_age)
+        else:
+            removed, reclaimed = 0, 0
+        return {"hits": hits, "misses": misses, "removed": removed, "reclaimed": reclaimed}
+
+    @api_method
+    def cache_reindex(self):
+        """ Rebuilds the index of the references in the cache from the storage folder
+        :return: the number of indexed references
+        """
+        return self.app.cache.index.reindex()
+
     @api_method
     def profile_list(self):
         return cmd_profile_list(self.app.cache.profiles_path, self.app.out)
@@ -2,7 +2,7 @@ import logging
 import os
 import textwrap
 
-from jinja2 import Template
+import six
 from six.moves.configparser import ConfigParser, NoSectionError
 
 from conans.errors import ConanException
@@ -12,8 +12,9 @@ from conans.util.conan_v2_mode import CONAN_V2_MODE_ENVVAR
 from conans.util.dates import timedelta_from_text
 from conans.util.env_reader import get_env
 from conans.util.files import load
+from conans.util.misc import size_from_text
 
-_t_default_settings_yml = Template(textwrap.dedent("""
+_t_default_settings_yml = textwrap.dedent("""
     # Only for cross building, 'os_build/arch_build' is the system that runs Conan
     os_build: [Windows, WindowsStore, Linux, Macos, FreeBSD, SunOS, AIX]
     arch_build: [x86, x86_64, ppc32be, ppc32, ppc64le, ppc64, armv5el, armv5hf, armv6, armv7, armv7hf, armv7s, armv7k, armv8, armv8_32, armv8.3, sparc, sparcv9, mips, mips64, avr, s390, s390x, sh4le, e2k-v2, e2k-v3, e2k-v4, e2k-v5, e2k-v6, e2k-v7]
@@ -131,15 +132,16 @@ _t_default_settings_yml = Template(textwrap.dedent("""
     {% if not conan_v2 %}
     cppstd: [None, 98, gnu98, 11, gnu11, 14, gnu14, 17, gnu17, 20, gnu20]  # Deprecated, use compiler.cppstd
     {% endif %}
-    """))
+    """)
 
 
 def get_default_settings_yml(force_v1=False):
     conan_v2 = not force_v1 and os.environ.get(CONAN_V2_MODE_ENVVAR, False)
-    return _t_default_settings_yml.render(conan_v2=conan_v2)
+    from jinja2 import Template  # Only needed to initialize the cache, it is slow to import
+    return Template(_t_default_settings_yml).render(conan_v2=conan_v2)
 
 
-_t_default_client_conf = Template(textwrap.dedent("""
+_t_default_client_conf = textwrap.dedent("""
     [log]
     run_to_output = True        # environment CONAN_LOG_RUN_TO_OUTPUT
     run_to_file = False         # environment CONAN_LOG_RUN_TO_FILE
@@ -150,6 +152,10 @@ _t_default_client_conf = Template(textwrap.dedent("""
     [general]
     default_profile = {{default_profile}}
     compression_level = 9                 # environment CONAN_COMPRESSION_LEVEL
+    # compression_threads = 4             # environment CONAN_COMPRESSION_THREADS
+    # compression_format = txz            # environment CONAN_COMPRESSION_FORMAT (tgz/txz)
+    # extract_threads = 4                 # environment CONAN_EXTRACT_THREADS
+    # manifest_hash_cache = /path/to/hashes.sqlite # environment CONAN_MANIFEST_HASH_CACHE
     sysrequires_sudo = True               # environment CONAN_SYSREQUIRES_SUDO
     request_timeout = 60                  # environment CONAN_REQUEST_TIMEOUT (seconds)
     default_package_id_mode = semver_direct_mode # environment CONAN_DEFAULT_PACKAGE_ID_MODE
@@ -162,6 +168,7 @@ _t_default_client_conf = Template(textwrap.dedent("""
     # bash_path = ""                      # environment CONAN_BASH_PATH (only windows)
     # read_only_cache = True              # environment CONAN_READ_ONLY_CACHE
     # cache_no_locks = True               # environment CONAN_CACHE_NO_LOCKS
+    # cache_polled_locks = False          # environment CONAN_CACHE_POLLED_LOCKS (lock files polled by Conan instead of kernel locks, e.g. network filesystems)
     # user_home_short = your_path         # environment CONAN_USER_HOME_SHORT
     # use_always_short_paths = False      # environment CONAN_USE_ALWAYS_SHORT_PATHS
     # skip_vs_projects_upgrade = False    # environment CONAN_SKIP_VS_PROJECTS_UPGRADE
@@ -186,6 +193,7 @@ _t_default_client_conf = Template(textwrap.dedent("""
     # msbuild_verbosity = minimal         # environment CONAN_MSBUILD_VERBOSITY
 
     # cpu_count = 1             # environment CONAN_CPU_COUNT
+    # parallel_build = 4                  # environment CONAN_PARALLEL_BUILD
 
     # Change the default location for building test packages to a temporary folder
     # which is deleted after the test.
@@ -198,6 +206,7 @@ _t_default_client_conf = Template(textwrap.dedent("""
     {% endif %}
 
     # config_install_interval = 1h
+    # metadata_ttl = 600                  # environment CONAN_METADATA_TTL
     # required_conan_version = >=1.26
 
     # keep_python_files = False           # environment CONAN_KEEP_PYTHON_FILES
@@ -207,6 +216,11 @@ _t_default_client_conf = Template(textwrap.dedent("""
     # path beginning with "~" (if the environment var CONAN_USER_HOME is specified, this directory, even
     # with "~/", will be relative to the conan user home, not to the system user home)
     path = ./data
+    # download_cache = /path/to/my/cache
+    # download_cache_max_size = 10GB     # The least recently used files are removed beyond it
+    # download_cache_max_age = 30d       # Files not used for longer than this are removed
+    # download_cache_links = True        # Reflink or hardlink the cached files instead of copying
+    # package_blob_cache = /path/to/my/blobs  # Extracted packages shared by all Conan homes
 
     [proxies]
     # Empty (or missing) section will try to use system proxies.
@@ -227,12 +241,14 @@ _t_default_client_conf = Template(textwrap.dedent("""
     {% endif %}
 
     # Default settings now declared in the default profile
-    """))
+    """)
 
 
 def get_default_client_conf(force_v1=False):
     conan_v2 = not force_v1 and os.environ.get(CONAN_V2_MODE_ENVVAR, False)
-    return _t_default_client_conf.render(conan_v2=conan_v2, default_profile=DEFAULT_PROFILE_NAME)
+    from jinja2 import Template
+    return Template(_t_default_client_conf).render(conan_v2=conan_v2,
+                                                    default_profile=DEFAULT_PROFILE_NAME)
 
 
 class ConanClientConfigParser(ConfigParser, object):
@@ -251,9 +267,13 @@ class ConanClientConfigParser(ConfigParser, object):
         ],
         "general": [
             ("CONAN_COMPRESSION_LEVEL", "compression_level", 9),
+            ("CONAN_COMPRESSION_THREADS", "compression_threads", None),
+            ("CONAN_EXTRACT_THREADS", "extract_threads", None),
+            ("CONAN_MANIFEST_HASH_CACHE", "manifest_hash_cache", None),
             ("CONAN_NON_INTERACTIVE", "non_interactive", False),
             ("CONAN_SKIP_BROKEN_SYMLINKS_CHECK", "skip_broken_symlinks_check", False),
             ("CONAN_CACHE_NO_LOCKS", "cache_no_locks", False),
+            ("CONAN_CACHE_POLLED_LOCKS", "cache_polled_locks", False),
             ("CONAN_SYSREQUIRES_SUDO", "sysrequires_sudo", False),
             ("CONAN_SYSREQUIRES_MODE", "sysrequires_mode", None),
             ("CONAN_REQUEST_TIMEOUT", "request_timeout", None),
@@ -422,6 +442,13 @@ class ConanClientConfigParser(ConfigParser, object):
         except ConanException:
             return False
 
+    @property
+    def cache_polled_locks(self):
+        try:
+            return get_env("CONAN_CACHE_POLLED_LOCKS", False)
+        except ConanException:
+            return False
+
     @property
     def request_timeout(self):
         timeout = os.getenv("CONAN_REQUEST_TIMEOUT")
@@ -458,6 +485,37 @@ class ConanClientConfigParser(ConfigParser, object):
         except ValueError:
             raise ConanException("Specify a numeric parameter for 'parallel_download'")
 
+    @property
+    def parallel_build(self):
+        try:
+            parallel = get_env("CONAN_PARALLEL_BUILD")
+            if parallel is None:
+                parallel = self.get_item("general.parallel_build")
+        except ConanException:
+            return None
+
+        try:
+            return int(parallel) if parallel is not None else None
+        except ValueError:
+            raise ConanException("Specify a numeric parameter for 'parallel_build'")
+
+    @property
+    def compression_format(self):
+        """ format of the package archives uploaded to the remotes that support it
+        """
+        try:
+            compression_format = get_env("CONAN_COMPRESSION_FORMAT")
+            if compression_format is None:
+                compression_format = self.get_item("general.compression_format")
+        except ConanException:
+            return "tgz"
+        if compression_format not in ("tgz", "txz"):
+            raise ConanException("Unsupported compression_format '%s', it can be 'tgz' or 'txz'"
+                                 % compression_format)
+        if compression_format == "txz" and six.PY2:
+            raise ConanException("The 'txz' compression_format requires Python 3")
+        return compression_format
+
     @property
     def download_cache(self):
         try:
@@ -466,6 +524,37 @@ class ConanClientConfigParser(ConfigParser, object):
         except ConanException:
             return None
 
+    @property
+    def package_blob_cache(self):
+        try:
+            return self.get_item("storage.package_blob_cache")
+        except ConanException:
+            return None
+
+    @property
+    def download_cache_links(self):
+        try:
+            links = self.get_item("storage.download_cache_links")
+            return links.lower() in ("1", "true")
+        except ConanException:
+            return False
+
+    @property
+    def download_cache_max_size(self):
+        try:
+            max_size = self.get_item("storage.download_cache_max_size")
+        except ConanException:
+            return None
+        return size_from_text(max_size)
+
+    @property
+    def download_cache_max_age(self):
+        try:
+            max_age = self.get_item("storage.download_cache_max_age")
+        except ConanException:
+            return None
+        return timedelta_from_text(max_age)
+
     @property
     def scm_to_conandata(self):
         try:
@@ -732,6 +821,22 @@ class ConanClientConfigParser(ConfigParser, object):
         }
         return levels.get(str(level_name).lower())
 
+    @property
+    def metadata_ttl(self):
+        """ seconds the metadata responses of the remotes are used without revalidating them
+        """
+        try:
+            ttl = get_env("CONAN_METADATA_TTL")
+            if ttl is None:
+                ttl = self.get_item("general.metadata_ttl")
+        except ConanException:
+            return 0
+
+        try:
+            return int(ttl)
+        except ValueError:
+            raise ConanException("Specify a numeric parameter for 'metadata_ttl'")
+
     @property
     def config_install_interval(self):
         try:
@@ -1,12 +1,12 @@
 import six
 
 from conans.client.cache.cache import ClientCache
-from semver import satisfies
 from conans import __version__ as client_version
 from conans.errors import ConanException
 
 
 def validate_conan_version(required_range):
+    from semver import satisfies
     result = satisfies(client_version, required_range, loose=True, include_prerelease=True)
     if not result:
         raise ConanException("Current Conan version ({}) does not satisfy "
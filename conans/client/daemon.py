@@ -0,0 +1,250 @@
+""" Long-lived Conan process that runs the commands of thin clients, so the ConanApp (the parsed
+configuration, the HTTP connection pools, the loaded recipes and the capabilities of the remotes)
+is reused by all of them instead of being built again for every command.
+
+The daemon listens in a local socket in the Conan home, and serves one command at a time, with
+the arguments, current folder and environment of the client, and its output sent back to it.
+The commands run non-interactively, they cannot request the user credentials. Only the user
+running the daemon can connect to it: the socket is only accessible by that user, and the
+connections of other users are rejected where the platform can tell the user of the peer.
+
+The client side only uses the standard library, the Conan client is imported lazily by the
+daemon, so the commands sent to it don't pay for it.
+"""
+import errno
+import json
+import os
+import socket
+import struct
+import sys
+import traceback
+
+DAEMON_SOCKET = "daemon.sock"
+ERROR_GENERAL = 1  # Same as conans.cli.exit_codes, not imported to keep the client fast
+
+
+def daemon_address(cache_folder):
+    return os.path.join(cache_folder, DAEMON_SOCKET)
+
+
+def _default_cache_folder():
+    user_home = os.path.expanduser(os.getenv("CONAN_USER_HOME", "~"))
+    return os.path.join(os.path.abspath(user_home), ".conan")
+
+
+def _send(connection, message):
+    connection.sendall((json.dumps(message) + "\n").encode("utf-8"))
+
+
+def _connect(address):
+    """ :return: the socket connected to the daemon, or None if it is not running
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        connection.connect(address)
+    except socket.error as e:
+        connection.close()
+        if e.errno in (errno.ENOENT, errno.ECONNREFUSED):
+            return None
+        raise
+    return connection
+
+
+def _peer_uid(connection):
+    """ :return: the uid of the process connected to the socket, or None if the platform cannot
+    tell it
+    """
+    if not hasattr(socket, "SO_PEERCRED"):
+        return None
+    credentials = connection.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED,
+                                        struct.calcsize("3i"))
+    _, uid, _ = struct.unpack("3i", credentials)
+    return uid
+
+
+def run_in_daemon(args, cache_folder=None):
+    """ runs the command in the daemon of the Conan home, printing its output
+    :return: the exit code of the command, or None if the daemon is not running
+    """
+    connection = _connect(daemon_address(cache_folder or _default_cache_folder()))
+    if connection is None:
+        return None
+    try:
+        _send(connection, {"args": args, "cwd": os.getcwd(), "env": dict(os.environ)})
+        for line in connection.makefile("rb"):
+            message = json.loads(line.decode("utf-8"))
+            if "exit" in message:
+                return message["exit"]
+            stream = sys.stdout if "out" in message else sys.stderr
+            stream.write(message.get("out", message.get("err")))
+            stream.flush()
+    except socket.error:  # Rejected by the daemon, or it was killed
+        pass
+    finally:
+        connection.close()
+    sys.stderr.write("The Conan daemon finished before completing the command\n")
+    return ERROR_GENERAL
+
+
+def stop_daemon(cache_folder=None):
+    """ :return: False if the daemon was not running
+    """
+    connection = _connect(daemon_address(cache_folder or _default_cache_folder()))
+    if connection is None:
+        return False
+    try:
+        _send(connection, {"stop": True})
+        connection.makefile("rb").readline()
+    finally:
+        connection.close()
+    return True
+
+
+class _ClientStream(object):
+    """ file-like object that sends what is written to the client being served, the output is
+    discarded if the client went away
+    """
+
+    def __init__(self, key):
+        self._key = key
+        self.connection = None
+
+    def write(self, data):
+        if self.connection is None or not data:
+            return
+        if isinstance(data, bytes):
+            data = data.decode("utf-8", "replace")
+        try:
+            _send(self.connection, {self._key: data})
+        except socket.error:
+            self.connection = None
+
+    def flush(self):
+        pass
+
+    @staticmethod
+    def isatty():
+        return False
+
+
+class ConanDaemon(object):
+
+    def __init__(self, cache_folder=None):
+        from conans.client.conan_api import ConanAPIV1
+        from conans.client.output import ConanOutput, colorama_initialize
+
+        cache_folder = cache_folder or _default_cache_folder()
+        self._address = daemon_address(cache_folder)
+        self._out = _ClientStream("out")
+        self._err = _ClientStream("err")
+        output = ConanOutput(self._out, self._err, color=colorama_initialize())
+        self._api = ConanAPIV1(cache_folder, output=output, persistent=True)
+        self._api.user_io.disable_input()
+
+    def serve(self):
+        from conans.errors import ConanException
+
+        if not hasattr(socket, "AF_UNIX"):
+            raise ConanException("The Conan daemon is not supported in this platform")
+        if os.path.exists(self._address):
+            connection = _connect(self._address)
+            if connection is not None:
+                connection.close()
+                raise ConanException("There is a Conan daemon already running for %s"
+                                     % os.path.dirname(self._address))
+            os.unlink(self._address)  # From a daemon that was killed
+
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            # The socket is created without permissions for the other users, not changed after
+            # binding, so they can never connect
+            old_umask = os.umask(0o177)
+            try:
+                listener.bind(self._address)
+            finally:
+                os.umask(old_umask)
+            os.chmod(self._address, 0o600)
+            listener.listen(32)
+            # The output of the api is sent to the clients, not to the daemon one
+            sys.stdout.write("Conan daemon listening in %s\n" % self._address)
+            sys.stdout.flush()
+            while True:
+                connection, _ = listener.accept()
+                try:
+                    peer_uid = _peer_uid(connection)
+                    if peer_uid is not None and peer_uid != os.getuid():
+                        sys.stderr.write("Rejected a connection of the user %s\n" % peer_uid)
+                        continue
+                    if not self._serve(connection):
+                        break
+                except Exception as exc:
+                    sys.stderr.write("Error serving a command: %s\n" % str(exc))
+                finally:
+                    connection.close()
+        finally:
+            listener.close()
+            if os.path.exists(self._address):
+                os.unlink(self._address)
+
+    def _serve(self, connection):
+        """ :return: False if the client requested the daemon to stop
+        """
+        request = json.loads(connection.makefile("rb").readline().decode("utf-8"))
+        if request.get("stop"):
+            _send(connection, {"exit": 0})
+            return False
+        exit_code = self._run(connection, request["args"], request["cwd"], request["env"])
+        _send(connection, {"exit": exit_code})
+        return True
+
+    def _run(self, connection, args, cwd, env):
+        """ runs the command in this process, as the client would do it
+        """
+        from conans.client.command import Command
+
+        old_env = os.environ.copy()
+        old_cwd = os.getcwd()
+        old_streams = sys.stdout, sys.stderr
+        self._out.connection = self._err.connection = connection
+        try:
+            os.environ.clear()
+            os.environ.update(env)
+            os.chdir(cwd)
+            sys.stdout, sys.stderr = self._out, self._err
+            try:
+                return Command(self._api).run(args)
+            except SystemExit as exc:  # The argument errors and the help
+                return exc.code if isinstance(exc.code, int) else int(exc.code is not None)
+            except Exception:
+                self._err.write(traceback.format_exc())
+                return ERROR_GENERAL
+        finally:
+            sys.stdout, sys.stderr = old_streams
+            os.chdir(old_cwd)
+            os.environ.clear()
+            os.environ.update(old_env)
+            self._out.connection = self._err.connection = None
+
+
+def main(args):
+    """ conan_daemon start: runs the daemon of the Conan home until it is stopped
+        conan_daemon stop: stops it
+        conan_daemon <conan command arguments>: runs the command in the daemon, or in this
+                                                process if the daemon is not running
+    """
+    if args[:1] == ["start"]:
+        ConanDaemon().serve()
+        sys.exit(0)
+    if args[:1] == ["stop"]:
+        if not stop_daemon():
+            sys.stderr.write("The Conan daemon is not running\n")
+            sys.exit(ERROR_GENERAL)
+        sys.exit(0)
+
+    exit_code = run_in_daemon(args)
+    if exit_code is None:
+        from conans.client.command import main as conan_main
+        conan_main(args)
+    sys.exit(exit_code)
@@ -1,24 +1,38 @@
 import os
+import re
 import shutil
+import stat
+import time
 from contextlib import contextmanager
 from threading import Lock
 
 from six.moves.urllib_parse import urlsplit, urlunsplit
 
+from conans.client.downloaders.download_cache_index import DownloadCacheIndex
 from conans.client.downloaders.file_downloader import check_checksum
 from conans.errors import ConanException
-from conans.util.files import mkdir
+from conans.util.files import link_or_copy, make_file_read_only, mkdir, remove
 from conans.util.locks import SimpleLock
+from conans.util.log import logger
 from conans.util.sha import sha256 as sha256_sum
 
+_entry_pattern = re.compile(r"^[0-9a-f]{64}$")
+
 
 class CachedFileDownloader(object):
     _thread_locks = {}  # Needs to be shared among all instances
 
-    def __init__(self, cache_folder, file_downloader, user_download=False):
+    def __init__(self, cache_folder, file_downloader, user_download=False, links=False,
+                 max_size=None, max_age=None):
         self._cache_folder = cache_folder
         self._file_downloader = file_downloader
         self._user_download = user_download
+        # materialize the cached files with reflinks/hardlinks, only reflinks for the
+        # user downloads
+        self._links = links
+        self._max_size = max_size  # in bytes
+        self._max_age = max_age  # datetime.timedelta
+        self._index = DownloadCacheIndex(cache_folder)
 
     @contextmanager
     def _lock(self, lock_id):
@@ -41,9 +55,32 @@ class CachedFileDownloader(object):
         assert (not self._user_download) or (self._user_download and checksum)
         h = self._get_hash(url, checksum)
 
+        hit, result = self._download(h, url, file_path, md5, sha1, sha256, **kwargs)
+        if not hit and self._exceeds_limits():
+            # Not holding the entry lock, _evict() will take the lock of each removed entry
+            self._evict(self._max_size, self._max_age)
+        return result
+
+    def _exceeds_limits(self):
+        """ checks the limits with the totals of the index, without listing the cache folder
+        """
+        if self._max_size is None and self._max_age is None:
+            return False
+        try:
+            total_size, oldest_access = self._index.usage()
+        except ConanException as e:  # The eviction is retried by the next download
+            logger.error(str(e))
+            return False
+        if self._max_size is not None and total_size > self._max_size:
+            return True
+        return (self._max_age is not None and oldest_access is not None and
+                oldest_access < time.time() - self._max_age.total_seconds())
+
+    def _download(self, h, url, file_path, md5, sha1, sha256, **kwargs):
         with self._lock(h):
             cached_path = os.path.join(self._cache_folder, h)
-            if not os.path.exists(cached_path):
+            hit = os.path.exists(cached_path)
+            if not hit:
                 self._file_downloader.download(url=url, file_path=cached_path, md5=md5,
                                                sha1=sha1, sha256=sha256, **kwargs)
             else:
@@ -54,15 +91,68 @@ class CachedFileDownloader(object):
                 except ConanException as e:
                     raise ConanException("%s\nCached downloaded file corrupted: %s"
                                          % (str(e), cached_path))
+            self._index.record_access(h, os.path.getsize(cached_path), hit)
 
             if file_path is not None:
                 file_path = os.path.abspath(file_path)
                 mkdir(os.path.dirname(file_path))
-                shutil.copy2(cached_path, file_path)
+                if self._links and not self._user_download:
+                    # The cached file is shared with the linked ones, protect it from changes
+                    make_file_read_only(cached_path)
+                    link_or_copy(cached_path, file_path)
+                elif self._links:
+                    # The user downloads can be modified, they are never hardlinked
+                    link_or_copy(cached_path, file_path, hardlink=False)
+                else:
+                    shutil.copy2(cached_path, file_path)
+                    # The cached file is read-only if it has been linked
+                    os.chmod(file_path, os.stat(file_path).st_mode | stat.S_IWRITE)
+                return hit, None
             else:
                 with open(cached_path, 'rb') as handle:
                     tmp = handle.read()
-                return tmp
+                return hit, tmp
+
+    def evict(self, max_size=None, max_age=None):
+        """ Removes the least recently used files of the cache until it is not bigger than
+        max_size bytes, and the ones not used for longer than max_age (a timedelta). Each file
+        is removed holding its lock, so concurrent downloads are never reading it
+        :return: (number of removed files, reclaimed bytes)
+        """
+        entries = {}
+        for name in os.listdir(self._cache_folder):
+            if _entry_pattern.match(name):
+                try:
+                    stat = os.stat(os.path.join(self._cache_folder, name))
+                except OSError:  # Removed by a concurrent eviction or cache clean
+                    continue
+                entries[name] = (stat.st_size, stat.st_mtime)
+        self._index.sync(entries)
+        return self._evict(max_size, max_age)
+
+    def _evict(self, max_size, max_age):
+        total_size, _ = self._index.usage()
+        oldest_access = time.time() - max_age.total_seconds() if max_age is not None else None
+        removed, reclaimed = 0, 0
+        for entry_hash, size, last_access in self._index.entries():
+            too_old = oldest_access is not None and last_access < oldest_access
+            too_big = max_size is not None and total_size > max_size
+            if not too_old and not too_big:
+                break
+            with self._lock(entry_hash):
+                cached_path = os.path.join(self._cache_folder, entry_hash)
+                if os.path.exists(cached_path):
+                    remove(cached_path)
+                    removed += 1
+                    reclaimed += size
+                self._index.remove(entry_hash)
+            total_size -= size
+        return removed, reclaimed
+
+    def stats(self):
+        """ :return: (hits, misses) of the download cache
+        """
+        return self._index.stats()
 
     def _get_hash(self, url, checksum=None):
         """ For Api V2, the cached downloads always have recipe and package REVISIONS in the URL,
@@ -6,5 +6,8 @@ def run_downloader(requester, output, verify, config, user_download=False, use_c
     downloader = FileDownloader(requester=requester, output=output, verify=verify, config=config)
     if use_cache and config.download_cache:
         downloader = CachedFileDownloader(config.download_cache, downloader,
-                                          user_download=user_download)
+                                          user_download=user_download,
+                                          links=config.download_cache_links,
+                                          max_size=config.download_cache_max_size,
+                                          max_age=config.download_cache_max_age)
     return downloader.download(**kwargs)
@@ -0,0 +1,108 @@
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+
+from conans.errors import ConanException
+from conans.util.log import logger
+
+INDEX_DB = "index.sqlite"
+ENTRIES_TABLE = "entries"
+STATS_TABLE = "stats"
+
+
+class DownloadCacheIndex(object):
+    """ Keeps next to the download cache the size and last access time of every cached file,
+    so the least recently used ones can be evicted, and the hits/misses counters of the cache.
+    The sqlite database handles the concurrent access of different processes
+    """
+
+    def __init__(self, cache_folder):
+        self._dbfile = os.path.join(cache_folder, INDEX_DB)
+
+    @contextmanager
+    def _connect(self):
+        if not os.path.exists(self._dbfile):
+            folder = os.path.dirname(self._dbfile)
+            if not os.path.exists(folder):
+                os.makedirs(folder)
+        error = "Error accessing the download cache index %s: %s"
+        try:
+            connection = sqlite3.connect(self._dbfile, timeout=60)
+        except sqlite3.Error as e:
+            raise ConanException(error % (self._dbfile, str(e)))
+        connection.text_factory = str
+        try:
+            cursor = connection.cursor()
+            cursor.execute("CREATE TABLE IF NOT EXISTS %s (hash TEXT PRIMARY KEY, size INTEGER, "
+                           "last_access REAL)" % ENTRIES_TABLE)
+            cursor.execute("CREATE TABLE IF NOT EXISTS %s (name TEXT PRIMARY KEY, value INTEGER)"
+                           % STATS_TABLE)
+            yield cursor
+            connection.commit()
+        except sqlite3.Error as e:
+            raise ConanException(error % (self._dbfile, str(e)))
+        finally:
+            connection.close()
+
+    @staticmethod
+    def _count(cursor, name):
+        cursor.execute("INSERT OR IGNORE INTO %s (name, value) VALUES (?, 0)" % STATS_TABLE,
+                       (name, ))
+        cursor.execute("UPDATE %s SET value = value + 1 WHERE name = ?" % STATS_TABLE, (name, ))
+
+    def record_access(self, entry_hash, size, hit):
+        """ best-effort, the errors are logged, they don't fail the download. The entries
+        missing in the index are registered again by sync()
+        """
+        try:
+            with self._connect() as cursor:
+                cursor.execute("INSERT OR REPLACE INTO %s (hash, size, last_access) "
+                               "VALUES (?, ?, ?)" % ENTRIES_TABLE, (entry_hash, size, time.time()))
+                self._count(cursor, "hits" if hit else "misses")
+        except ConanException as e:
+            logger.error(str(e))
+
+    def sync(self, entries):
+        """ register the cached files not in the index yet (created by previous Conan versions),
+        using their modification time as last access, and drop the ones no longer on disk
+        :param entries: {hash: (size, mtime)} of the files in the cache folder
+        """
+        with self._connect() as cursor:
+            cursor.execute("SELECT hash FROM %s" % ENTRIES_TABLE)
+            indexed = set(row[0] for row in cursor.fetchall())
+            for entry_hash, (size, mtime) in entries.items():
+                if entry_hash not in indexed:
+                    cursor.execute("INSERT INTO %s (hash, size, last_access) VALUES (?, ?, ?)"
+                                   % ENTRIES_TABLE, (entry_hash, size, mtime))
+            for entry_hash in indexed.difference(entries):
+                cursor.execute("DELETE FROM %s WHERE hash = ?" % ENTRIES_TABLE, (entry_hash, ))
+
+    def remove(self, entry_hash):
+        with self._connect() as cursor:
+            cursor.execute("DELETE FROM %s WHERE hash = ?" % ENTRIES_TABLE, (entry_hash, ))
+
+    def entries(self):
+        """ all the entries, least recently used first
+        :return: [(hash, size, last_access)]
+        """
+        with self._connect() as cursor:
+            cursor.execute("SELECT hash, size, last_access FROM %s ORDER BY last_access"
+                           % ENTRIES_TABLE)
+            return cursor.fetchall()
+
+    def usage(self):
+        """ :return: (total size, oldest last access or None) of the entries
+        """
+        with self._connect() as cursor:
+            cursor.execute("SELECT SUM(size), MIN(last_access) FROM %s" % ENTRIES_TABLE)
+            total_size, oldest_access = cursor.fetchone()
+        return total_size or 0, oldest_access
+
+    def stats(self):
+        """ :return: (hits, misses)
+        """
+        with self._connect() as cursor:
+            cursor.execute("SELECT name, value FROM %s" % STATS_TABLE)
+            values = dict(cursor.fetchall())
+        return values.get("hits", 0), values.get("misses", 0)
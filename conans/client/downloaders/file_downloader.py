@@ -33,7 +33,10 @@ class FileDownloader(object):
         self._config = config
 
     def download(self, url, file_path=None, auth=None, retry=None, retry_wait=None, overwrite=False,
-                 headers=None, md5=None, sha1=None, sha256=None):
+                 headers=None, md5=None, sha1=None, sha256=None, stream=None):
+        """ downloads the url to file_path, or returns its contents if not provided. The stream
+        can be an object like TgzStreamExtractor, consuming the data while it is downloaded
+        """
         retry = retry if retry is not None else self._config.retry
         retry = retry if retry is not None else 2
         retry_wait = retry_wait if retry_wait is not None else self._config.retry_wait
@@ -53,21 +56,32 @@ class FileDownloader(object):
 
         try:
             r = _call_with_retry(self._output, retry, retry_wait, self._download_file, url, auth,
-                                 headers, file_path)
+                                 headers, file_path, stream=stream)
             if file_path:
                 check_checksum(file_path, md5, sha1, sha256)
+            elif stream is not None:
+                stream.check_checksum(md5, sha1, sha256)
             return r
         except Exception:
             if file_path and os.path.exists(file_path):
                 os.remove(file_path)
             raise
 
-    def _download_file(self, url, auth, headers, file_path, try_resume=False):
+    def _download_file(self, url, auth, headers, file_path, try_resume=False, stream=None,
+                       etag=None):
+        """ :param etag: the ETag of the interrupted download that is being resumed, to get
+                     the rest of the file only if it didn't change (If-Range)
+        """
         t1 = time.time()
         if try_resume and file_path and os.path.exists(file_path):
             range_start = os.path.getsize(file_path)
             headers = headers.copy() if headers else {}
             headers["range"] = "bytes={}-".format(range_start)
+            if etag and not etag.startswith("W/"):  # Only strong validators are allowed
+                headers["If-Range"] = etag
+            else:
+                etag = None
+                headers.pop("If-Range", None)
         else:
             range_start = 0
 
@@ -88,6 +102,9 @@ class FileDownloader(object):
             elif response.status_code == 401:
                 raise AuthenticationException()
             raise ConanException("Error %d downloading file %s" % (response.status_code, url))
+        if range_start and etag and response.status_code == 200:
+            # The file changed since the interrupted download, it is downloaded again
+            range_start = 0
 
         def read_response(size):
             for chunk in response.iter_content(size):
@@ -105,6 +122,16 @@ class FileDownloader(object):
                                 (six.PY2 and isinstance(chunk, str)))
                         file_handler.write(chunk)
                         downloaded_size += len(chunk)
+            elif stream is not None:
+                downloaded = [downloaded_size]
+
+                def counted_chunks():
+                    for chunk in chunks:
+                        downloaded[0] += len(chunk)
+                        yield chunk
+
+                stream.consume(counted_chunks())
+                downloaded_size = downloaded[0]
             else:
                 ret_data = bytearray()
                 for chunk in chunks:
@@ -129,11 +156,16 @@ class FileDownloader(object):
             logger.debug("DOWNLOAD: %s" % url)
             total_length = get_total_length()
             action = "Downloading" if range_start == 0 else "Continuing download of"
-            description = "{} {}".format(action, os.path.basename(file_path)) if file_path else None
+            if file_path:
+                description = "{} {}".format(action, os.path.basename(file_path))
+            elif stream is not None:
+                description = "{} {}".format(action, stream.name)
+            else:
+                description = None
             progress = progress_bar.Progress(total_length, self._output, description)
             progress.initial_value(range_start)
 
-            chunk_size = 1024 if not file_path else 1024 * 100
+            chunk_size = 1024 if not file_path and stream is None else 1024 * 100
             written_chunks, total_downloaded_size = write_chunks(
                 progress.update(read_response(chunk_size)),
                 file_path
@@ -145,7 +177,8 @@ class FileDownloader(object):
                 if (file_path and total_length > total_downloaded_size > range_start
                     and response.headers.get("Accept-Ranges") == "bytes"):
                     written_chunks = self._download_file(url, auth, headers, file_path,
-                                                         try_resume=True)
+                                                         try_resume=True,
+                                                         etag=response.headers.get("ETag"))
                 else:
                     raise ConanException("Transfer interrupted before complete: %s < %s"
                                          % (total_downloaded_size, total_length))
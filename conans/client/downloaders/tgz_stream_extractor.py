@@ -0,0 +1,86 @@
+import hashlib
+import time
+
+from conans.errors import ConanException
+from conans.util.files import rmdir, tar_extract
+from conans.util.tracer import log_uncompressed_file
+
+
+class _ChunksReader(object):
+    """ Minimal file-like object over the chunks of a download, computing the checksums of the
+    data while it is read
+    """
+
+    def __init__(self, chunks, hashers):
+        self._chunks = iter(chunks)
+        self._hashers = hashers
+        self._buffer = b""
+
+    def _next_chunk(self):
+        chunk = next(self._chunks)
+        for hasher in self._hashers.values():
+            hasher.update(chunk)
+        return chunk
+
+    def read(self, size=-1):
+        buffers = [self._buffer]
+        buffered = len(self._buffer)
+        while size < 0 or buffered < size:
+            try:
+                chunk = self._next_chunk()
+            except StopIteration:
+                break
+            buffers.append(chunk)
+            buffered += len(chunk)
+        data = b"".join(buffers)
+        if size < 0:
+            self._buffer = b""
+            return data
+        self._buffer = data[size:]
+        return data[:size]
+
+    def drain(self):
+        """ the tar stream might finish before the end of the data (padding blocks), but all of
+        it has to be downloaded and hashed
+        """
+        while True:
+            try:
+                self._next_chunk()
+            except StopIteration:
+                break
+
+
+class TgzStreamExtractor(object):
+    """ Extracts a .tgz file while it is being downloaded, instead of saving it to disk and
+    reading it back again. The checksums of the file are computed incrementally, so they can be
+    verified and stored in the metadata the same as the ones of a saved file
+    """
+
+    def __init__(self, name, dest_folder):
+        self.name = name
+        self._dest_folder = dest_folder
+        self.checksums = None
+
+    def consume(self, chunks):
+        t1 = time.time()
+        hashers = {"md5": hashlib.md5(), "sha1": hashlib.sha1(), "sha256": hashlib.sha256()}
+        reader = _ChunksReader(chunks, hashers)
+        try:
+            files, size = tar_extract(reader, self._dest_folder, stream=True)
+            reader.drain()
+        except Exception as e:
+            rmdir(self._dest_folder)
+            raise ConanException("Error while downloading/extracting files to %s\n%s\n"
+                                 "Folder removed" % (self._dest_folder, str(e)))
+        self.checksums = {name: hasher.hexdigest() for name, hasher in hashers.items()}
+        log_uncompressed_file(self.name, time.time() - t1, self._dest_folder, files, size)
+
+    def check_checksum(self, md5=None, sha1=None, sha256=None):
+        for algorithm_name, signature in (("md5", md5), ("sha1", sha1), ("sha256", sha256)):
+            if signature and self.checksums[algorithm_name] != signature.lower():
+                rmdir(self._dest_folder)
+                raise ConanException("%s signature failed for '%s' file. \n"
+                                     " Provided signature: %s  \n"
+                                     " Computed signature: %s"
+                                     % (algorithm_name, self.name, signature,
+                                        self.checksums[algorithm_name]))
@@ -1,72 +1,80 @@
+import sys
 import traceback
 import warnings
 from os.path import join
 
-from conan.tools.cmake import CMakeToolchain
-from conans.client.generators.cmake_find_package import CMakeFindPackageGenerator
-from conans.client.generators.cmake_find_package_multi import CMakeFindPackageMultiGenerator
-from conans.client.generators.compiler_args import CompilerArgsGenerator
-from conans.client.generators.pkg_config import PkgConfigGenerator
 from conans.errors import ConanException, conanfile_exception_formatter
 from conans.util.env_reader import get_env
 from conans.util.files import normalize, save, mkdir
-from .b2 import B2Generator
-from .boostbuild import BoostBuildGenerator
-from .cmake import CMakeGenerator
-from .cmake_multi import CMakeMultiGenerator
-from .cmake_paths import CMakePathsGenerator
-from .deploy import DeployGenerator
-from .gcc import GCCGenerator
-from .json_generator import JsonGenerator
-from .make import MakeGenerator
-from .markdown import MarkdownGenerator
-from .premake import PremakeGenerator
-from .qbs import QbsGenerator
-from .qmake import QmakeGenerator
-from .scons import SConsGenerator
-from .text import TXTGenerator
-from .virtualbuildenv import VirtualBuildEnvGenerator
-from .virtualenv import VirtualEnvGenerator
-from .virtualenv_python import VirtualEnvPythonGenerator
-from .virtualrunenv import VirtualRunEnvGenerator
-from .visualstudio import VisualStudioGenerator
-from .visualstudio_multi import VisualStudioMultiGenerator
-from .visualstudiolegacy import VisualStudioLegacyGenerator
-from .xcode import XCodeGenerator
-from .ycm import YouCompleteMeGenerator
+from conans.util.lazy_import import lazy_attributes
 from ..tools import chdir
 
+# The generators are imported on first use, only the ones used by the recipes are needed
+_generator_modules = {
+    "B2Generator": "conans.client.generators.b2",
+    "BoostBuildGenerator": "conans.client.generators.boostbuild",
+    "CMakeGenerator": "conans.client.generators.cmake",
+    "CMakeFindPackageGenerator": "conans.client.generators.cmake_find_package",
+    "CMakeFindPackageMultiGenerator": "conans.client.generators.cmake_find_package_multi",
+    "CMakeMultiGenerator": "conans.client.generators.cmake_multi",
+    "CMakePathsGenerator": "conans.client.generators.cmake_paths",
+    "CompilerArgsGenerator": "conans.client.generators.compiler_args",
+    "DeployGenerator": "conans.client.generators.deploy",
+    "GCCGenerator": "conans.client.generators.gcc",
+    "JsonGenerator": "conans.client.generators.json_generator",
+    "MakeGenerator": "conans.client.generators.make",
+    "MarkdownGenerator": "conans.client.generators.markdown",
+    "PkgConfigGenerator": "conans.client.generators.pkg_config",
+    "PremakeGenerator": "conans.client.generators.premake",
+    "QbsGenerator": "conans.client.generators.qbs",
+    "QmakeGenerator": "conans.client.generators.qmake",
+    "SConsGenerator": "conans.client.generators.scons",
+    "TXTGenerator": "conans.client.generators.text",
+    "VirtualBuildEnvGenerator": "conans.client.generators.virtualbuildenv",
+    "VirtualEnvGenerator": "conans.client.generators.virtualenv",
+    "VirtualEnvPythonGenerator": "conans.client.generators.virtualenv_python",
+    "VirtualRunEnvGenerator": "conans.client.generators.virtualrunenv",
+    "VisualStudioGenerator": "conans.client.generators.visualstudio",
+    "VisualStudioMultiGenerator": "conans.client.generators.visualstudio_multi",
+    "VisualStudioLegacyGenerator": "conans.client.generators.visualstudiolegacy",
+    "XCodeGenerator": "conans.client.generators.xcode",
+    "YouCompleteMeGenerator": "conans.client.generators.ycm"}
+lazy_attributes(globals(), _generator_modules)
+# The lazy generators are not in the module namespace until they are used
+__all__ = ["GeneratorManager", "write_toolchain"] + list(_generator_modules)
+
 
 class GeneratorManager(object):
     def __init__(self):
-        self._generators = {"txt": TXTGenerator,
-                            "gcc": GCCGenerator,
-                            "compiler_args": CompilerArgsGenerator,
-                            "cmake": CMakeGenerator,
-                            "cmake_multi": CMakeMultiGenerator,
-                            "cmake_paths": CMakePathsGenerator,
-                            "cmake_find_package": CMakeFindPackageGenerator,
-                            "cmake_find_package_multi": CMakeFindPackageMultiGenerator,
-                            "qmake": QmakeGenerator,
-                            "qbs": QbsGenerator,
-                            "scons": SConsGenerator,
-                            "visual_studio": VisualStudioGenerator,
-                            "visual_studio_multi": VisualStudioMultiGenerator,
-                            "visual_studio_legacy": VisualStudioLegacyGenerator,
-                            "xcode": XCodeGenerator,
-                            "ycm": YouCompleteMeGenerator,
-                            "virtualenv": VirtualEnvGenerator,
-                            "virtualenv_python": VirtualEnvPythonGenerator,
-                            "virtualbuildenv": VirtualBuildEnvGenerator,
-                            "virtualrunenv": VirtualRunEnvGenerator,
-                            "boost-build": BoostBuildGenerator,
-                            "pkg_config": PkgConfigGenerator,
-                            "json": JsonGenerator,
-                            "b2": B2Generator,
-                            "premake": PremakeGenerator,
-                            "make": MakeGenerator,
-                            "deploy": DeployGenerator,
-                            "markdown": MarkdownGenerator}
+        # The built-in ones by the name of their class, imported when they are used
+        self._generators = {"txt": "TXTGenerator",
+                            "gcc": "GCCGenerator",
+                            "compiler_args": "CompilerArgsGenerator",
+                            "cmake": "CMakeGenerator",
+                            "cmake_multi": "CMakeMultiGenerator",
+                            "cmake_paths": "CMakePathsGenerator",
+                            "cmake_find_package": "CMakeFindPackageGenerator",
+                            "cmake_find_package_multi": "CMakeFindPackageMultiGenerator",
+                            "qmake": "QmakeGenerator",
+                            "qbs": "QbsGenerator",
+                            "scons": "SConsGenerator",
+                            "visual_studio": "VisualStudioGenerator",
+                            "visual_studio_multi": "VisualStudioMultiGenerator",
+                            "visual_studio_legacy": "VisualStudioLegacyGenerator",
+                            "xcode": "XCodeGenerator",
+                            "ycm": "YouCompleteMeGenerator",
+                            "virtualenv": "VirtualEnvGenerator",
+                            "virtualenv_python": "VirtualEnvPythonGenerator",
+                            "virtualbuildenv": "VirtualBuildEnvGenerator",
+                            "virtualrunenv": "VirtualRunEnvGenerator",
+                            "boost-build": "BoostBuildGenerator",
+                            "pkg_config": "PkgConfigGenerator",
+                            "json": "JsonGenerator",
+                            "b2": "B2Generator",
+                            "premake": "PremakeGenerator",
+                            "make": "MakeGenerator",
+                            "deploy": "DeployGenerator",
+                            "markdown": "MarkdownGenerator"}
         self._new_generators = ["CMakeToolchain", "MakeToolchain", "MSBuildToolchain",
                                 "MesonToolchain", "MSBuildDeps", "QbsToolchain", "msbuild"]
 
@@ -78,7 +86,11 @@ class GeneratorManager(object):
         return name in self._generators
 
     def __getitem__(self, key):
-        return self._generators[key]
+        generator_class = self._generators[key]
+        if isinstance(generator_class, str):
+            generator_class = getattr(sys.modules[__name__], generator_class)
+            self._generators[key] = generator_class
+        return generator_class
 
     def _new_generator(self, generator_name, output):
         if generator_name not in self._new_generators:
@@ -140,7 +152,7 @@ class GeneratorManager(object):
                                                                               str(e)))
 
             try:
-                generator_class = self._generators[generator_name]
+                generator_class = self[generator_name]
             except KeyError:
                 available = list(self._generators.keys()) + self._new_generators
                 raise ConanException("Invalid generator '%s'. Available types: %s" %
@@ -195,6 +207,7 @@ def write_toolchain(conanfile, path, output):
                     conanfile.toolchain()
         else:
             try:
+                from conan.tools.cmake import CMakeToolchain
                 toolchain = {"cmake": CMakeToolchain}[conanfile.toolchain]
             except KeyError:
                 raise ConanException("Unknown toolchain '%s'" % conanfile.toolchain)
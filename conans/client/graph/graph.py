@@ -249,8 +249,10 @@ class DepsGraph(object):
         self.root = None
         self.aliased = {}
         self._node_counter = initial_node_id if initial_node_id is not None else -1
+        self._levels = {}  # {direct: levels} cache of _order_levels() for the full graph
 
     def add_node(self, node):
+        self._levels.clear()
         if node.id is None:
             self._node_counter += 1
             node.id = str(self._node_counter)
@@ -260,6 +262,7 @@ class DepsGraph(object):
 
     def add_edge(self, src, dst, require):
         assert src in self.nodes and dst in self.nodes
+        self._levels.clear()
         edge = Edge(src, dst, require)
         src.add_edge(edge)
         dst.add_edge(edge)
@@ -351,21 +354,42 @@ class DepsGraph(object):
         dependencies. Second level will be with nodes that only have dependencies to
         first level nodes, and so on
         return [[node1, node34], [node3], [node23, node8],...]
+        The levels of the full graph are computed once, until the graph is modified
         """
-        result = []
-        opened = nodes_subset if nodes_subset is not None else self.nodes
-        while opened:
-            current_level = []
-            for o in opened:
-                o_neighs = o.neighbors() if direct else o.inverse_neighbors()
-                if not any(n in opened for n in o_neighs):
-                    current_level.append(o)
+        if nodes_subset is None:
+            levels = self._levels.get(direct)
+            if levels is None:
+                levels = self._compute_levels(direct, self.nodes)
+                self._levels[direct] = levels
+            return [list(level) for level in levels]
+        return self._compute_levels(direct, nodes_subset)
+
+    @staticmethod
+    def _compute_levels(direct, nodes):
+        # Kahn algorithm, counting only the edges between nodes of the given set
+        pending = {}  # {node: number of neighbors (in the set) not yet in a level}
+        waiting = {}  # {node: [nodes waiting for it]}
+        current_level = []
+        for node in nodes:
+            neighbors = set(n for n in (node.neighbors() if direct else node.inverse_neighbors())
+                            if n in nodes)
+            for neighbor in neighbors:
+                waiting.setdefault(neighbor, []).append(node)
+            pending[node] = len(neighbors)
+            if not neighbors:
+                current_level.append(node)
 
+        result = []
+        while current_level:
             current_level.sort()
             result.append(current_level)
-            # now initialize new level
-            opened = opened.difference(current_level)
-
+            next_level = []
+            for node in current_level:
+                for waiting_node in waiting.get(node, []):
+                    pending[waiting_node] -= 1
+                    if not pending[waiting_node]:
+                        next_level.append(waiting_node)
+            current_level = next_level
         return result
 
     def mark_private_skippable(self, nodes_subset=None, root=None):
@@ -1,3 +1,6 @@
+from collections import OrderedDict
+from multiprocessing.pool import ThreadPool
+
 from conans.client.graph.build_mode import BuildMode
 from conans.client.graph.graph import (BINARY_BUILD, BINARY_CACHE, BINARY_DOWNLOAD, BINARY_MISSING,
                                        BINARY_UPDATE, RECIPE_EDITABLE, BINARY_EDITABLE,
@@ -20,6 +23,10 @@ class GraphBinariesAnalyzer(object):
         # These are the nodes with pref (not including PREV) that have been evaluated
         self._evaluated = {}  # {pref: [nodes]}
         self._fixed_package_id = cache.config.full_transitive_package_id
+        # Results of the concurrent queries of remote binaries, consumed by _get_package_info()
+        self._remote_infos = {}  # {(remote_name, pref): (info, pref) or NotFoundException}
+        # Same, for the manifests of the binaries in the cache, consumed by _get_package_manifest()
+        self._remote_manifests = {}  # {(remote_name, pref): (manifest, pref) or NotFoundException}
 
     @staticmethod
     def _check_update(upstream_manifest, package_folder, output):
@@ -73,8 +80,7 @@ class GraphBinariesAnalyzer(object):
             output = node.conanfile.output
             if remote:
                 try:
-                    tmp = self._remote_manager.get_package_manifest(pref, remote)
-                    upstream_manifest, pref = tmp
+                    upstream_manifest, pref = self._get_package_manifest(pref, remote)
                 except NotFoundException:
                     output.warn("Can't update, no package in remote")
                 except NoRemoteAvailable:
@@ -95,7 +101,121 @@ class GraphBinariesAnalyzer(object):
             assert node.prev, "PREV for %s is None: %s" % (str(pref), metadata.dumps())
 
     def _get_package_info(self, node, pref, remote):
-        return self._remote_manager.get_package_info(pref, remote, info=node.conanfile.info)
+        result = self._remote_infos.pop((remote.name, pref), None)
+        if result is None:
+            return self._remote_manager.get_package_info(pref, remote, info=node.conanfile.info)
+        if isinstance(result, NotFoundException):
+            raise result
+        return result
+
+    def _get_package_manifest(self, pref, remote):
+        result = self._remote_manifests.pop((remote.name, pref), None)
+        if result is None:
+            return self._remote_manager.get_package_manifest(pref, remote)
+        if isinstance(result, NotFoundException):
+            raise result
+        return result
+
+    def _prefetch_remote_infos(self, nodes, build_mode, update, remotes):
+        """ Query at once the remote binaries of the nodes that are not in the local cache (and
+        the ones in the cache, to check their updates), so their evaluation doesn't need to wait
+        for each HTTP request one after the other. Each remote is asked for all of them with one
+        request if it supports it, or else concurrently, one request per binary.
+        Only the first remote that the evaluation would query is checked, failures other than
+        not found are discarded, the evaluation will repeat those queries
+        """
+        enabled = remotes.values() if remotes else []  # The disabled ones are not queried
+        if build_mode.all or not enabled:
+            return
+
+        queries = OrderedDict()  # {remote_name: [(node, pref, remote, in_cache)]}
+        queried = set()
+        for node in nodes:
+            if node.recipe in (RECIPE_CONSUMER, RECIPE_VIRTUAL, RECIPE_EDITABLE):
+                continue
+            if node.package_id in (PACKAGE_ID_UNKNOWN, PACKAGE_ID_INVALID):
+                continue
+            if node.conanfile.build_policy_always:
+                continue
+            locked = node.graph_lock_node
+            if locked and locked.package_id:
+                pref = PackageReference(locked.ref, node.package_id, locked.prev)
+            else:
+                pref = PackageReference(node.ref, node.package_id)
+            if pref in self._evaluated:
+                continue
+            package_layout = self._cache.package_layout(pref.ref,
+                                                        short_paths=node.conanfile.short_paths)
+            in_cache = package_layout.package_id_exists(pref.id)
+            if in_cache and not update:
+                continue
+            remote = remotes.selected
+            if not remote:
+                metadata = package_layout.load_metadata()
+                remote_name = metadata.packages[pref.id].remote or metadata.recipe.remote
+                remote = remotes.get(remote_name)
+                if not remote or remote.disabled:
+                    if in_cache:  # The evaluation doesn't check the updates without remote
+                        continue
+                    remote = enabled[0]
+            key = (remote.name, pref)
+            if key not in self._remote_infos and key not in queried:
+                queried.add(key)
+                queries.setdefault(remote.name, []).append((node, pref, remote, in_cache))
+
+        missing = []
+        for remote_queries in queries.values():
+            if not self._batch_remote_infos(remote_queries):
+                missing.extend((n, p, r) for n, p, r, in_cache in remote_queries if not in_cache)
+        self._query_remote_infos(missing)
+
+    def _batch_remote_infos(self, queries):
+        """ the infos and manifests of the queries of a remote with one request
+        :return: False if the remote doesn't support it
+        """
+        remote = queries[0][2]
+        try:
+            results = self._remote_manager.get_packages_metadata([q[1] for q in queries], remote)
+        except Exception:
+            return False
+        if results is None:
+            return False
+        for (_, pref, _, _), result in zip(queries, results):
+            key = (remote.name, pref)
+            if isinstance(result, NotFoundException):
+                self._remote_infos[key] = self._remote_manifests[key] = result
+            elif not isinstance(result, Exception):
+                info, manifest, new_pref = result
+                self._remote_infos[key] = info, new_pref
+                self._remote_manifests[key] = manifest, new_pref
+        return True
+
+    def _query_remote_infos(self, queries):
+        """ concurrent get_package_info() of the (node, pref, remote) queries, bounded by the
+        general.parallel_download configuration
+        """
+        parallel = self._cache.config.parallel_download
+        if parallel is None or parallel < 2 or len(queries) < 2:
+            return
+
+        def _query(query):
+            n, p, r = query
+            try:
+                return self._remote_manager.get_package_info(p, r, info=n.conanfile.info)
+            except NotFoundException as e:
+                return e
+            except Exception:
+                return None
+
+        thread_pool = ThreadPool(min(parallel, len(queries)))
+        try:
+            results = thread_pool.map(_query, queries)
+        finally:
+            thread_pool.close()
+            thread_pool.join()
+        for (_, pref, remote), result in zip(queries, results):
+            if result is not None:
+                self._remote_infos[(remote.name, pref)] = result
 
     def _evaluate_remote_pkg(self, node, pref, remote, remotes):
         remote_info = None
@@ -363,29 +483,36 @@ class GraphBinariesAnalyzer(object):
     def evaluate_graph(self, deps_graph, build_mode, update, remotes, nodes_subset=None, root=None):
         default_package_id_mode = self._cache.config.default_package_id_mode
         default_python_requires_id_mode = self._cache.config.default_python_requires_id_mode
-        for node in deps_graph.ordered_iterate(nodes_subset=nodes_subset):
-            self._propagate_options(node)
-
-            # Make sure that locked options match
-            if (node.graph_lock_node is not None and
-                    node.graph_lock_node.options is not None and
-                    node.conanfile.options.values != node.graph_lock_node.options):
-                raise ConanException("{}: Locked options do not match computed options\n"
-                                     "Locked options:\n{}\n"
-                                     "Computed options:\n{}".format(node.ref,
-                                                                    node.graph_lock_node.options,
-                                                                    node.conanfile.options.values))
-
-            self._compute_package_id(node, default_package_id_mode, default_python_requires_id_mode)
-            if node.recipe in (RECIPE_CONSUMER, RECIPE_VIRTUAL):
-                continue
-            if node.package_id == PACKAGE_ID_UNKNOWN:
-                assert node.binary is None, "Node.binary should be None"
-                node.binary = BINARY_UNKNOWN
-                # annotate pattern, so unused patterns in --build are not displayed as errors
-                build_mode.forced(node.conanfile, node.ref)
-                continue
-            self._evaluate_node(node, build_mode, update, remotes)
+        # The nodes of the same level do not depend on each other, their package_ids can be
+        # computed first, and their binaries queried in the remotes at once
+        for level in deps_graph.by_levels(nodes_subset=nodes_subset):
+            for node in level:
+                self._propagate_options(node)
+
+                # Make sure that locked options match
+                if (node.graph_lock_node is not None and
+                        node.graph_lock_node.options is not None and
+                        node.conanfile.options.values != node.graph_lock_node.options):
+                    raise ConanException("{}: Locked options do not match computed options\n"
+                                         "Locked options:\n{}\n"
+                                         "Computed options:\n{}"
+                                         .format(node.ref, node.graph_lock_node.options,
+                                                 node.conanfile.options.values))
+
+                self._compute_package_id(node, default_package_id_mode,
+                                         default_python_requires_id_mode)
+
+            self._prefetch_remote_infos(level, build_mode, update, remotes)
+            for node in level:
+                if node.recipe in (RECIPE_CONSUMER, RECIPE_VIRTUAL):
+                    continue
+                if node.package_id == PACKAGE_ID_UNKNOWN:
+                    assert node.binary is None, "Node.binary should be None"
+                    node.binary = BINARY_UNKNOWN
+                    # annotate pattern, so unused patterns in --build are not displayed as errors
+                    build_mode.forced(node.conanfile, node.ref)
+                    continue
+                self._evaluate_node(node, build_mode, update, remotes)
         deps_graph.mark_private_skippable(nodes_subset=nodes_subset, root=root)
 
     def reevaluate_node(self, node, remotes, build_mode, update):
@@ -63,8 +63,9 @@ class DepsGraphBuilder(object):
 
         # enter recursive computation
         t1 = time.time()
-        self._expand_node(root_node, dep_graph, Requirements(), None, None, check_updates,
-                          update, remotes, profile_host, profile_build, graph_lock)
+        with self._proxy.recipes_prefetch():
+            self._expand_node(root_node, dep_graph, Requirements(), None, None, check_updates,
+                              update, remotes, profile_host, profile_build, graph_lock)
         logger.debug("GRAPH: Time to load deps %s" % (time.time() - t1))
         return dep_graph
 
@@ -120,6 +121,10 @@ class DepsGraphBuilder(object):
         # basic node configuration: calling configure() and requirements() and version-ranges
         new_options, new_reqs = self._get_node_requirements(node, graph, down_ref, down_options,
                                                             down_reqs, graph_lock, update, remotes)
+        # The recipes of all the requirements can be downloaded in the background, while the
+        # depth-first expansion continues
+        self._proxy.prefetch_recipes([r.ref for r in node.conanfile.requires.values()
+                                      if not r.override], remotes, check_updates)
 
         # Expand each one of the current requirements
         for require in node.conanfile.requires.values():
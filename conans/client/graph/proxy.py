@@ -1,14 +1,20 @@
 import os
+from collections import OrderedDict
+from contextlib import contextmanager
+from multiprocessing.pool import ThreadPool
 
 from requests.exceptions import RequestException
+from six import StringIO
 
 from conans.client.graph.graph import (RECIPE_DOWNLOADED, RECIPE_INCACHE, RECIPE_NEWER,
                                        RECIPE_NOT_IN_REMOTE, RECIPE_NO_REMOTE, RECIPE_UPDATEABLE,
                                        RECIPE_UPDATED, RECIPE_EDITABLE)
-from conans.client.output import ScopedOutput
+from conans.client.output import ConanOutput, ScopedOutput
 from conans.client.recorder.action_recorder import INSTALL_ERROR_MISSING, INSTALL_ERROR_NETWORK
 from conans.client.remover import DiskRemover
-from conans.errors import ConanException, NotFoundException, RecipeNotFoundException
+from conans.errors import AuthenticationException, ConanConnectionError, ConanException, \
+    ForbiddenException, InternalErrorException, NotFoundException, RecipeNotFoundException, \
+    RequestErrorException
 from conans.paths.package_layouts.package_editable_layout import PackageEditableLayout
 from conans.util.tracer import log_recipe_got_from_local_cache
 
@@ -19,6 +25,134 @@ class ConanProxy(object):
         self._cache = cache
         self._out = output
         self._remote_manager = remote_manager
+        self._prefetch_pool = None
+        self._prefetched = {}  # {ref: AsyncResult of _prefetch_recipe()}
+        # Remote manifests of the recipes in the cache, None if recipes_prefetch() is not active
+        self._manifests = None  # {(remote_name, ref): (manifest, ref) or NotFoundException}
+
+    @contextmanager
+    def recipes_prefetch(self):
+        """ While active, prefetch_recipes() downloads recipes in background threads, bounded
+        by the general.parallel_download configuration, and checks the updates of the recipes
+        in the cache with one request per remote, if the remote supports it
+        """
+        if self._manifests is not None:
+            yield
+            return
+
+        parallel = self._cache.config.parallel_download
+        if parallel is not None and parallel > 1:
+            self._prefetch_pool = ThreadPool(parallel)
+        self._manifests = {}
+        try:
+            yield
+        finally:
+            if self._prefetch_pool is not None:
+                self._prefetch_pool.close()
+                self._prefetch_pool.join()
+                self._prefetch_pool = None
+            self._prefetched = {}
+            self._manifests = None
+
+    def prefetch_recipes(self, refs, remotes, check_updates=False):
+        """ Start downloading the recipes not in the local cache, the result will be installed
+        later by get_recipe(). It doesn't output anything nor request the user's login, in case
+        of network or authentication failures get_recipe() will retry the download normally
+        """
+        if not remotes:
+            return
+        if check_updates and self._manifests is not None:
+            self._prefetch_manifests(refs, remotes)
+        if self._prefetch_pool is None:
+            return
+        for ref in refs:
+            if ref in self._prefetched:
+                continue
+            layout = self._cache.package_layout(ref)
+            if isinstance(layout, PackageEditableLayout) or os.path.exists(layout.conanfile()):
+                continue
+            self._prefetched[ref] = self._prefetch_pool.apply_async(self._prefetch_recipe,
+                                                                    (layout, ref, remotes))
+
+    def _prefetch_manifests(self, refs, remotes):
+        """ Get the remote manifests of the recipes in the cache, that get_recipe() will need to
+        check their updates, with one request per remote. Nothing is stored for the remotes that
+        don't support it or fail, get_recipe() will request them one by one
+        """
+        queries = OrderedDict()  # {remote_name: (remote, [refs])}
+        for ref in refs:
+            layout = self._cache.package_layout(ref)
+            if isinstance(layout, PackageEditableLayout) or not os.path.exists(layout.conanfile()):
+                continue
+            try:
+                metadata = layout.load_metadata()
+            except (IOError, RecipeNotFoundException):
+                continue
+            if ref.revision is not None and ref.revision != metadata.recipe.revision:
+                continue  # It will be downloaded, not updated
+            remote = remotes.selected or remotes.get(metadata.recipe.remote)
+            if remote is None or (remote.name, ref) in self._manifests:
+                continue
+            queries.setdefault(remote.name, (remote, []))[1].append(ref)
+
+        for remote, remote_refs in queries.values():
+            try:
+                results = self._remote_manager.get_recipes_manifests(remote_refs, remote)
+            except Exception:
+                continue
+            for ref, result in zip(remote_refs, results or []):
+                if isinstance(result, NotFoundException) or not isinstance(result, Exception):
+                    self._manifests[(remote.name, ref)] = result
+
+    def _get_recipe_manifest(self, ref, remote):
+        result = self._manifests.pop((remote.name, ref), None) if self._manifests else None
+        if result is None:
+            return self._remote_manager.get_recipe_manifest(ref, remote)
+        if isinstance(result, NotFoundException):
+            raise result
+        return result
+
+    def _prefetch_recipe(self, layout, ref, remotes):
+        """ Downloads the files of the recipe in a background thread, quietly and without
+        requesting the user's login, get_recipe() installs them in the main thread
+        :return: (remote, fetched) or None if the recipe has to be downloaded normally
+        """
+        quiet_output = ConanOutput(StringIO())
+        with layout.conanfile_write_lock(quiet_output):
+            if os.path.exists(layout.conanfile()):
+                return None
+            remote = remotes.selected
+            if not remote:
+                try:
+                    remote_name = layout.load_metadata().recipe.remote
+                except (IOError, RecipeNotFoundException):
+                    remote_name = None
+                if remote_name:
+                    remote = remotes.get(remote_name)
+                    if remote is None or remote.disabled:
+                        return None  # get_recipe() reports it
+            try:
+                for r in [remote] if remote else remotes.values():
+                    try:
+                        return r, self._remote_manager.fetch_recipe(ref, r)
+                    except NotFoundException:
+                        pass
+            except (AuthenticationException, ForbiddenException, ConanConnectionError,
+                    InternalErrorException, RequestErrorException):
+                pass  # The interactive login, or the error, in the main thread
+        return None
+
+    def _install_prefetched(self, layout, ref, remote, fetched, recorder):
+        with layout.conanfile_write_lock(self._out):
+            # Another process could have installed the recipe, or removed the fetched files
+            if os.path.exists(layout.conanfile()) or \
+                    not all(os.path.exists(path) for path in fetched[1].values()):
+                return None
+            new_ref = self._remote_manager.get_recipe(ref, remote, fetched)
+        output = ScopedOutput(str(ref), self._out)
+        output.info("Downloaded recipe revision %s" % new_ref.revision)
+        recorder.recipe_downloaded(ref, remote.url)
+        return layout.conanfile(), RECIPE_DOWNLOADED, remote, new_ref
 
     def get_recipe(self, ref, check_updates, update, remotes, recorder):
         layout = self._cache.package_layout(ref)
@@ -29,23 +163,45 @@ class ConanProxy(object):
             # TODO: recorder.recipe_fetched_as_editable(reference)
             return conanfile_path, status, None, ref
 
-        with layout.conanfile_write_lock(self._out):
-            result = self._get_recipe(layout, ref, check_updates, update, remotes, recorder)
-            conanfile_path, status, remote, new_ref = result
+        prefetched = self._prefetched.pop(ref, None)
+        if prefetched is not None:
+            result = prefetched.get()
+            if result is not None:
+                remote, fetched = result
+                result = self._install_prefetched(layout, ref, remote, fetched, recorder)
+                if result is not None:
+                    return result
+
+        result = None
+        if os.path.exists(layout.conanfile()):
+            # The recipe in the cache is validated with a shared lock, so the concurrent installs
+            # don't serialize on it, the exclusive one is only taken to download or update it
+            with layout.conanfile_read_lock(self._out):
+                result = self._get_recipe(layout, ref, check_updates, update, remotes, recorder,
+                                          read_only=True)
+        if result is None:
+            with layout.conanfile_write_lock(self._out):
+                result = self._get_recipe(layout, ref, check_updates, update, remotes, recorder)
 
-            if status not in (RECIPE_DOWNLOADED, RECIPE_UPDATED):
-                log_recipe_got_from_local_cache(new_ref)
-                recorder.recipe_fetched_from_cache(new_ref)
+        conanfile_path, status, remote, new_ref = result
+        if status not in (RECIPE_DOWNLOADED, RECIPE_UPDATED):
+            log_recipe_got_from_local_cache(new_ref)
+            recorder.recipe_fetched_from_cache(new_ref)
 
         return conanfile_path, status, remote, new_ref
 
-    def _get_recipe(self, layout, ref, check_updates, update, remotes, recorder):
+    def _get_recipe(self, layout, ref, check_updates, update, remotes, recorder, read_only=False):
+        """ :param read_only: the cache is not modified, None is returned if the recipe has to
+            be downloaded or updated
+        """
         output = ScopedOutput(str(ref), self._out)
         # check if it is in disk
         conanfile_path = layout.conanfile()
 
         # NOT in disk, must be retrieved from remotes
         if not os.path.exists(conanfile_path):
+            if read_only:
+                return None
             remote, new_ref = self._download_recipe(layout, ref, output, remotes, remotes.selected,
                                                     recorder)
             status = RECIPE_DOWNLOADED
@@ -61,6 +217,8 @@ class ConanProxy(object):
         requested_different_revision = (ref.revision is not None) and cur_revision != ref.revision
         if requested_different_revision:
             if check_updates:
+                if read_only:
+                    return None
                 remote, new_ref = self._download_recipe(layout, ref, output, remotes,
                                                         selected_remote, recorder)
                 status = RECIPE_DOWNLOADED
@@ -83,7 +241,7 @@ class ConanProxy(object):
             return conanfile_path, status, None, ref
 
         try:  # get_recipe_manifest can fail, not in server
-            upstream_manifest, ref = self._remote_manager.get_recipe_manifest(ref, selected_remote)
+            upstream_manifest, ref = self._get_recipe_manifest(ref, selected_remote)
         except NotFoundException:
             status = RECIPE_NOT_IN_REMOTE
             ref = ref.copy_with_rev(cur_revision)
@@ -93,6 +251,8 @@ class ConanProxy(object):
         if upstream_manifest != read_manifest:
             if upstream_manifest.time > read_manifest.time:
                 if update:
+                    if read_only:
+                        return None
                     DiskRemover().remove_recipe(layout, output=output)
                     output.info("Retrieving from remote '%s'..." % selected_remote.name)
                     self._download_recipe(layout, ref, output, remotes, selected_remote, recorder)
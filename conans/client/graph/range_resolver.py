@@ -151,7 +151,8 @@ class RangeResolver(object):
         pattern = str(search_ref)
         for remote in remotes.values():
             if not remotes.selected or remote == remotes.selected:
-                result = self._remote_manager.search_recipes(remote, pattern, ignorecase=False)
+                result = self._remote_manager.search_recipes(remote, pattern, ignorecase=False,
+                                                             cached=True)
                 result = [ref for ref in result
                           if ref.user == search_ref.user and ref.channel == search_ref.channel]
                 if result:
@@ -2,8 +2,11 @@ import os
 import shutil
 import textwrap
 import time
+from collections import OrderedDict, defaultdict
 from multiprocessing.pool import ThreadPool
 
+from six.moves import queue
+
 from conans.client import tools
 from conans.client.conanfile.build import run_build_method
 from conans.client.conanfile.package import run_package_method
@@ -15,6 +18,7 @@ from conans.client.importer import remove_imports, run_imports
 from conans.client.packager import update_package_metadata
 from conans.client.recorder.action_recorder import INSTALL_ERROR_BUILDING, INSTALL_ERROR_MISSING, \
     INSTALL_ERROR_MISSING_BUILD_FOLDER
+from conans.client.runner import ScopedRunner
 from conans.client.source import retrieve_exports_sources, config_source
 from conans.client.tools.env import no_op
 from conans.client.tools.env import pythonpath
@@ -35,6 +39,7 @@ from conans.util.conan_v2_mode import CONAN_V2_MODE_ENVVAR
 from conans.util.env_reader import get_env
 from conans.util.files import clean_dirty, is_dirty, make_read_only, mkdir, rmdir, save, set_dirty
 from conans.util.log import logger
+from conans.util.process_state import process_state_lock
 from conans.util.tracer import log_package_built, log_package_got_from_local_cache
 
 
@@ -280,6 +285,93 @@ def call_system_requirements(conanfile, output):
         raise ConanException("Error in system requirements")
 
 
+class _BuildScheduler(object):
+    """ Processes the nodes of the graph with a pool of threads. Every node starts as soon as
+    all its dependencies have been processed, without waiting for the rest of its level.
+    Nodes of the same binary package are processed one after the other.
+
+    Only one thread at a time can run Python code that modifies the process-wide state
+    (current directory, environment), the other builds progress while waiting for the
+    commands they run.
+    """
+
+    def __init__(self, nodes_by_level, parallel):
+        self._nodes = [node for level in nodes_by_level for node in level]
+        self._parallel = parallel
+
+    def _dependencies(self):
+        nodes = set(self._nodes)
+        result = OrderedDict()
+        first_nodes = {}
+        for node in self._nodes:
+            deps = set(n for n in node.neighbors() if n in nodes)
+            first = first_nodes.setdefault((node.ref, node.package_id), node)
+            if first is not node:
+                deps.add(first)
+            result[node] = deps
+        return result
+
+    def _process(self, node, handle_node, done):
+        try:
+            conanfile = node.conanfile
+            runner = conanfile._conan_runner
+            conanfile._conan_runner = ScopedRunner(runner, conanfile.output)
+            try:
+                with process_state_lock.hold():
+                    handle_node(node)
+            finally:
+                conanfile._conan_runner = runner
+        except BaseException as e:
+            done.put((node, e))
+        else:
+            done.put((node, None))
+
+    def run(self, handle_node):
+        dependencies = self._dependencies()
+        dependants = defaultdict(list)
+        for node, deps in dependencies.items():
+            for dep in deps:
+                dependants[dep].append(node)
+
+        done = queue.Queue()
+        thread_pool = ThreadPool(self._parallel)
+        cwd, environ = os.getcwd(), os.environ.copy()
+        running = 0
+        error = None
+
+        def _launch(n):
+            thread_pool.apply_async(self._process, (n, handle_node, done))
+
+        try:
+            for node, deps in dependencies.items():
+                if not deps:
+                    _launch(node)
+                    running += 1
+            while running:
+                node, exc = done.get()
+                running -= 1
+                if exc is not None:
+                    error = error or exc  # Let the running ones finish, do not launch new ones
+                    continue
+                if error is not None:
+                    continue
+                for dependant in dependants[node]:
+                    deps = dependencies[dependant]
+                    deps.discard(node)
+                    if not deps:
+                        _launch(dependant)
+                        running += 1
+        finally:
+            thread_pool.close()
+            thread_pool.join()
+            os.chdir(cwd)
+            os.environ.clear()
+            os.environ.update(environ)
+
+        if error is not None:
+            raise error
+
+
 class BinaryInstaller(object):
     """ main responsible of retrieving binary packages or building them from source
     locally in case they are not found in remotes
@@ -417,31 +509,46 @@ class BinaryInstaller(object):
         processed_package_refs = set()
         self._download(downloads, processed_package_refs)
 
-        for level in nodes_by_level:
-            for node in level:
-                ref, conan_file = node.ref, node.conanfile
-                output = conan_file.output
-
-                self._propagate_info(node, using_build_profile)
-                if node.binary == BINARY_EDITABLE:
-                    self._handle_node_editable(node, graph_info)
-                    # Need a temporary package revision for package_revision_mode
-                    # Cannot be PREV_UNKNOWN otherwise the consumers can't compute their packageID
-                    node.prev = "editable"
-                else:
-                    if node.binary == BINARY_SKIP:  # Privates not necessary
-                        continue
-                    assert ref.revision is not None, "Installer should receive RREV always"
-                    if node.binary == BINARY_UNKNOWN:
-                        self._binaries_analyzer.reevaluate_node(node, remotes, build_mode, update)
-                        if node.binary == BINARY_MISSING:
-                            self._raise_missing([node])
-                    _handle_system_requirements(conan_file, node.pref, self._cache, output)
-                    self._handle_node_cache(node, keep_build, processed_package_refs, remotes)
+        def _handle_node(n):
+            self._handle_node(n, keep_build, graph_info, remotes, build_mode, update,
+                              using_build_profile, processed_package_refs)
+
+        parallel = self._cache.config.parallel_build
+        if parallel is not None and parallel > 1 and any(n.binary == BINARY_BUILD
+                                                         for level in nodes_by_level
+                                                         for n in level):
+            self._out.info("Building binary packages in %s parallel threads" % parallel)
+            _BuildScheduler(nodes_by_level, parallel).run(_handle_node)
+        else:
+            for level in nodes_by_level:
+                for node in level:
+                    _handle_node(node)
 
         # Finally, propagate information to root node (ref=None)
         self._propagate_info(root_node, using_build_profile)
 
+    def _handle_node(self, node, keep_build, graph_info, remotes, build_mode, update,
+                     using_build_profile, processed_package_refs):
+        ref, conan_file = node.ref, node.conanfile
+        output = conan_file.output
+
+        self._propagate_info(node, using_build_profile)
+        if node.binary == BINARY_EDITABLE:
+            self._handle_node_editable(node, graph_info)
+            # Need a temporary package revision for package_revision_mode
+            # Cannot be PREV_UNKNOWN otherwise the consumers can't compute their packageID
+            node.prev = "editable"
+        else:
+            if node.binary == BINARY_SKIP:  # Privates not necessary
+                return
+            assert ref.revision is not None, "Installer should receive RREV always"
+            if node.binary == BINARY_UNKNOWN:
+                self._binaries_analyzer.reevaluate_node(node, remotes, build_mode, update)
+                if node.binary == BINARY_MISSING:
+                    self._raise_missing([node])
+            _handle_system_requirements(conan_file, node.pref, self._cache, output)
+            self._handle_node_cache(node, keep_build, processed_package_refs, remotes)
+
     def _handle_node_editable(self, node, graph_info):
         # Get source of information
         package_layout = self._cache.package_layout(node.ref)
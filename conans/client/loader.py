@@ -17,21 +17,33 @@ from conans.model.conan_generator import Generator
 from conans.model.options import OptionsValues
 from conans.model.ref import ConanFileReference
 from conans.model.settings import Settings
-from conans.paths import DATA_YML
+from conans.paths import CONAN_MANIFEST, DATA_YML
 from conans.util.conan_v2_mode import CONAN_V2_MODE_ENVVAR
 from conans.util.files import load
+from conans.util.hash_cache import stat_key
 
 
 class ConanFileLoader(object):
 
-    def __init__(self, runner, output, python_requires, generator_manager=None, pyreq_loader=None):
+    def __init__(self, runner, output, python_requires, generator_manager=None, pyreq_loader=None,
+                 cached_classes=None):
+        """ :param cached_classes: the recipe classes loaded by a previous loader, to be reused
+                                   while their files don't change
+        """
         self._runner = runner
         self._generator_manager = generator_manager
         self._output = output
         self._pyreq_loader = pyreq_loader
         self._python_requires = python_requires
         sys.modules["conans"].python_requires = python_requires
-        self._cached_conanfile_classes = {}
+        if cached_classes is None:
+            cached_classes = {}
+        else:
+            # The python_requires are resolved again by every command, they could be updated
+            for path, cached in list(cached_classes.items()):
+                if getattr(cached[0], "python_requires", None):
+                    del cached_classes[path]
+        self._cached_conanfile_classes = cached_classes
 
     def load_basic(self, conanfile_path, lock_python_requires=None, user=None, channel=None,
                    display=""):
@@ -45,13 +57,15 @@ class ConanFileLoader(object):
         """ loads a conanfile basic object without evaluating anything, returns the module too
         """
         cached = self._cached_conanfile_classes.get(conanfile_path)
-        if cached and cached[1] == lock_python_requires:
+        if (cached and cached[1] == lock_python_requires and
+                cached[3] == _recipe_state(conanfile_path, cached[4])):
             conanfile = cached[0](self._output, self._runner, display, user, channel)
             if hasattr(conanfile, "init") and callable(conanfile.init):
                 with conanfile_exception_formatter(str(conanfile), "init"):
                     conanfile.init()
             return conanfile, cached[2]
 
+        state = _recipe_state(conanfile_path)
         if lock_python_requires is not None:
             self._python_requires.locked_versions = {r.name: r for r in lock_python_requires}
         try:
@@ -81,8 +95,11 @@ class ConanFileLoader(object):
                 if scm_data:
                     conanfile.scm.update(scm_data)
 
+            # The local modules imported by the recipe, in the recipe folder or its subfolders
+            module_files = _local_module_files(module, conanfile.recipe_folder)
+            state.extend(_recipe_state(conanfile_path, module_files)[len(state):])
             self._cached_conanfile_classes[conanfile_path] = (conanfile, lock_python_requires,
-                                                              module)
+                                                              module, state, module_files)
             result = conanfile(self._output, self._runner, display, user, channel)
             if hasattr(result, "init") and callable(result.init):
                 with conanfile_exception_formatter(str(result), "init"):
@@ -348,6 +365,42 @@ def _parse_module(conanfile_module, module_id, generator_manager):
     return result
 
 
+def _recipe_state(conanfile_path, module_files=()):
+    """ the stat of the files of a recipe, to know if its loaded class is still valid: the
+    conanfile.py, the conandata.yml, the manifest of the exported recipes, the other python
+    files next to the conanfile.py and the given files of the local modules it imported
+    """
+    folder = os.path.dirname(conanfile_path)
+    try:
+        python_files = sorted(f for f in os.listdir(folder) if f.endswith(".py"))
+    except OSError:
+        python_files = []
+    paths = [conanfile_path, os.path.join(folder, DATA_YML), os.path.join(folder, CONAN_MANIFEST)]
+    paths.extend(os.path.join(folder, f) for f in python_files)
+    paths.extend(f for f in module_files if f not in paths)
+    state = []
+    for path in paths:
+        try:
+            state.append((path, stat_key(path)))
+        except OSError:
+            state.append((path, None))
+    return state
+
+
+def _local_module_files(module, folder):
+    """ the files of the modules of the folder imported by a loaded conanfile module, that
+    _parse_conanfile() renamed to "<module_id>.<name>"
+    """
+    prefix = "%s." % module.__name__
+    folder = os.path.join(os.path.abspath(folder), "")
+    result = []
+    for name, imported in list(sys.modules.items()):
+        path = getattr(imported, "__file__", None) if name.startswith(prefix) else None
+        if path and os.path.abspath(path).startswith(folder):
+            result.append(os.path.abspath(path))
+    return sorted(result)
+
+
 def parse_conanfile(conanfile_path, python_requires, generator_manager):
     with python_requires.capture_requires() as py_requires:
         module, filename = _parse_conanfile(conanfile_path)
@@ -1,6 +1,7 @@
 import os
 import six
 import sys
+import threading
 from colorama import Fore, Style
 
 from conans.util.env_reader import get_env
@@ -158,6 +159,10 @@ class ConanOutput(object):
         self._stream.flush()
 
 
+# Concurrent builds write through different ScopedOutput, lines must not be mixed
+_scoped_output_lock = threading.RLock()
+
+
 class ScopedOutput(ConanOutput):
     def __init__(self, scope, output):
         self.scope = scope
@@ -167,7 +172,8 @@ class ScopedOutput(ConanOutput):
 
     def write(self, data, front=None, back=None, newline=False, error=False):
         assert self.scope != "virtual", "printing with scope==virtual"
-        super(ScopedOutput, self).write("%s: " % self.scope, front=front, back=back,
-                                        newline=False, error=error)
-        super(ScopedOutput, self).write("%s" % data, front=Color.BRIGHT_WHITE, back=back,
-                                        newline=newline, error=error)
+        with _scoped_output_lock:
+            super(ScopedOutput, self).write("%s: " % self.scope, front=front, back=back,
+                                            newline=False, error=error)
+            super(ScopedOutput, self).write("%s" % data, front=Color.BRIGHT_WHITE, back=back,
+                                            newline=newline, error=error)
@@ -5,11 +5,14 @@ import traceback
 
 from requests.exceptions import ConnectionError
 
-from conans import DEFAULT_REVISION_V1
+from conans import BATCH_METADATA, DEFAULT_REVISION_V1
+from conans.client.cache.package_blob_cache import PackageBlobCache
 from conans.client.cache.remote_registry import Remote
+from conans.client.downloaders.tgz_stream_extractor import TgzStreamExtractor
 from conans.errors import ConanConnectionError, ConanException, NotFoundException, \
     NoRestV2Available, PackageNotFoundException
-from conans.paths import EXPORT_SOURCES_TGZ_NAME, EXPORT_TGZ_NAME, PACKAGE_TGZ_NAME, rm_conandir
+from conans.paths import EXPORT_SOURCES_TGZ_NAME, EXPORT_TGZ_NAME, PACKAGE_TGZ_NAME, \
+    PACKAGE_TXZ_NAME, rm_conandir
 from conans.search.search import filter_packages
 from conans.util import progress_bar
 from conans.util.env_reader import get_env
@@ -78,6 +81,9 @@ class RemoteManager(object):
         ref = self._resolve_latest_ref(ref, remote)
         return self._call_remote(remote, "get_recipe_manifest", ref), ref
 
+    def server_supports(self, remote, capability):
+        return self._call_remote(remote, "server_supports", capability)
+
     def get_package_manifest(self, pref, remote):
         pref = self._resolve_latest_pref(pref, remote, headers=None)
         return self._call_remote(remote, "get_package_manifest", pref), pref
@@ -90,24 +96,43 @@ class RemoteManager(object):
         # FIXME Conan 2.0: With revisions, it is not needed to pass headers to this second function
         return self._call_remote(remote, "get_package_info", pref, headers=headers), pref
 
-    def get_recipe(self, ref, remote):
+    def get_recipes_manifests(self, refs, remote):
+        """ get_recipe_manifest() of many recipes with one request
+        :return: None if the remote doesn't support it, else for every ref (manifest, ref) or
+                 the exception that get_recipe_manifest() would raise
+        """
+        if not self._supports_batch_metadata(remote):
+            return None
+        return self._call_remote(remote, "get_recipes_manifests", refs)
+
+    def get_packages_metadata(self, prefs, remote):
+        """ get_package_info() and get_package_manifest() of many packages with one request
+        :return: None if the remote doesn't support it, else for every pref
+                 (info, manifest, pref) or the exception that get_package_info() would raise
+        """
+        if not self._supports_batch_metadata(remote):
+            return None
+        return self._call_remote(remote, "get_packages_metadata", prefs)
+
+    def _supports_batch_metadata(self, remote):
+        return (self._cache.config.revisions_enabled and
+                self.server_supports(remote, BATCH_METADATA))
+
+    def get_recipe(self, ref, remote, fetched=None):
         """
         Read the conans from remotes
         Will iterate the remotes to find the conans unless remote was specified
 
-        returns (dict relative_filepath:abs_path , remote_name)"""
+        returns (dict relative_filepath:abs_path , remote_name)
+
+        :param fetched: the result of fetch_recipe(), to install it instead of downloading it"""
 
         self._hook_manager.execute("pre_download_recipe", reference=ref, remote=remote)
         package_layout = self._cache.package_layout(ref)
-        package_layout.export_remove()
-
-        ref = self._resolve_latest_ref(ref, remote)
-
-        t1 = time.time()
-        download_export = package_layout.download_export()
-        zipped_files = self._call_remote(remote, "get_recipe", ref, download_export)
-        duration = time.time() - t1
-        log_recipe_download(ref, duration, remote.name, zipped_files)
+        if fetched is None:
+            ref, zipped_files = self._download_recipe(ref, remote, self._call_remote)
+        else:
+            ref, zipped_files = fetched
 
         recipe_checksums = calc_files_checksum(zipped_files)
 
@@ -135,6 +160,32 @@ class RemoteManager(object):
 
         return ref
 
+    def fetch_recipe(self, ref, remote):
+        """ Downloads the files of the recipe to its download folder, without any output, hooks
+        nor requesting the user's login, so it can run in a background thread. get_recipe()
+        installs them later
+
+        :return: (ref with its revision, {filename: path}), the 'fetched' of get_recipe()
+        """
+        return self._download_recipe(ref, remote, self._call_remote_quietly)
+
+    def _download_recipe(self, ref, remote, call_remote):
+        package_layout = self._cache.package_layout(ref)
+        package_layout.export_remove()
+
+        if ref.revision is None:
+            try:
+                ref = call_remote(remote, "get_latest_recipe_revision", ref)
+            except NoRestV2Available:
+                ref = ref.copy_with_rev(DEFAULT_REVISION_V1)
+
+        t1 = time.time()
+        download_export = package_layout.download_export()
+        zipped_files = call_remote(remote, "get_recipe", ref, download_export)
+        duration = time.time() - t1
+        log_recipe_download(ref, duration, remote.name, zipped_files)
+        return ref, zipped_files
+
     def get_recipe_sources(self, ref, layout, remote):
         assert ref.revision, "get_recipe_sources requires RREV"
         t1 = time.time()
@@ -179,34 +230,57 @@ class RemoteManager(object):
             if not is_package_snapshot_complete(snapshot):
                 raise PackageNotFoundException(pref)
 
-            download_pkg_folder = layout.download_package(pref)
-            # Download files to the pkg_tgz folder, not to the final one
-            zipped_files = self._call_remote(remote, "get_package", pref, download_pkg_folder)
+            package_folder = layout.package(pref)
+            read_only = get_env("CONAN_READ_ONLY_CACHE", False)
+            blob_cache_folder = self._cache.config.package_blob_cache
+            if blob_cache_folder:
+                blob_cache = PackageBlobCache(blob_cache_folder)
+                manifest = self._call_remote(remote, "get_package_manifest", pref)
+                blob_key = blob_cache.key(pref, manifest)
+                package_checksums = blob_cache.restore(blob_key, package_folder, manifest,
+                                                       read_only=read_only)
+            else:
+                package_checksums = None
+
+            if package_checksums is None:
+                download_pkg_folder = layout.download_package(pref)
+                # Download files to the pkg_tgz folder, not to the final one
+                # The package tgz can be extracted while it is downloaded, instead of saved
+                tgz_name = package_tgz_name(snapshot)
+                extractor = TgzStreamExtractor(tgz_name, package_folder)
+                zipped_files = self._call_remote(remote, "get_package", pref, download_pkg_folder,
+                                                 extractor)
+                package_checksums = calc_files_checksum(zipped_files)
+                if extractor.checksums:
+                    package_checksums[tgz_name] = {"md5": extractor.checksums["md5"],
+                                                   "sha1": extractor.checksums["sha1"]}
+
+                duration = time.time() - t1
+                log_package_download(pref, duration, remote, zipped_files)
+
+                tgz_file = zipped_files.pop(tgz_name, None)
+                check_compressed_files(tgz_name, zipped_files)
+                if tgz_file:  # This must happen always, but just in case
+                    # TODO: The output could be changed to the package one, but
+                    uncompress_file(tgz_file, package_folder, output=self._output)
+                mkdir(package_folder)  # Just in case it doesn't exist, uncompress did nothing
+                for file_name, file_path in zipped_files.items():  # copy CONANINFO, CONANMANIFEST
+                    shutil.move(file_path, os.path.join(package_folder, file_name))
+                if blob_cache_folder:
+                    blob_cache.store(blob_key, package_folder, package_checksums)
+            else:
+                output.info("Package %s reused from the package blob cache" % pref.id)
 
             # Compute and update the package metadata
-            package_checksums = calc_files_checksum(zipped_files)
             with layout.update_metadata() as metadata:
                 metadata.packages[pref.id].revision = pref.revision
                 metadata.packages[pref.id].recipe_revision = pref.ref.revision
                 metadata.packages[pref.id].checksums = package_checksums
                 metadata.packages[pref.id].remote = remote.name
 
-            duration = time.time() - t1
-            log_package_download(pref, duration, remote, zipped_files)
-
-            tgz_file = zipped_files.pop(PACKAGE_TGZ_NAME, None)
-            check_compressed_files(PACKAGE_TGZ_NAME, zipped_files)
-            package_folder = layout.package(pref)
-            if tgz_file:  # This must happen always, but just in case
-                # TODO: The output could be changed to the package one, but
-                uncompress_file(tgz_file, package_folder, output=self._output)
-            mkdir(package_folder)  # Just in case it doesn't exist, because uncompress did nothing
-            for file_name, file_path in zipped_files.items():  # copy CONANINFO and CONANMANIFEST
-                shutil.move(file_path, os.path.join(package_folder, file_name))
-
             # Issue #214 https://github.com/conan-io/conan/issues/214
             touch_folder(package_folder)
-            if get_env("CONAN_READ_ONLY_CACHE", False):
+            if read_only:
                 make_read_only(package_folder)
             recorder.package_downloaded(pref, remote.url)
             output.success('Package installed %s' % pref.id)
@@ -218,11 +292,12 @@ class RemoteManager(object):
             output.error("Exception: %s %s" % (type(e), str(e)))
             raise
 
-    def search_recipes(self, remote, pattern=None, ignorecase=True):
+    def search_recipes(self, remote, pattern=None, ignorecase=True, cached=False):
         """
         returns (dict str(ref): {packages_info}
+        :param cached: the result can come from the metadata cache
         """
-        return self._call_remote(remote, "search", pattern, ignorecase)
+        return self._call_remote(remote, "search", pattern, ignorecase, cached)
 
     def search_packages(self, remote, ref, query):
         packages = self._call_remote(remote, "search_packages", ref, query)
@@ -276,9 +351,18 @@ class RemoteManager(object):
         return pref
 
     def _call_remote(self, remote, method, *args, **kwargs):
+        return self._call(self._auth_manager.call_rest_api_method,
+                          remote, method, *args, **kwargs)
+
+    def _call_remote_quietly(self, remote, method, *args, **kwargs):
+        return self._call(self._auth_manager.call_rest_api_method_quietly,
+                          remote, method, *args, **kwargs)
+
+    @staticmethod
+    def _call(call_rest_api_method, remote, method, *args, **kwargs):
         assert (isinstance(remote, Remote))
         try:
-            return self._auth_manager.call_rest_api_method(remote, method, *args, **kwargs)
+            return call_rest_api_method(remote, method, *args, **kwargs)
         except ConnectionError as exc:
             raise ConanConnectionError(("%s\n\nUnable to connect to %s=%s\n" +
                                         "1. Make sure the remote is reachable or,\n" +
@@ -305,6 +389,12 @@ def is_package_snapshot_complete(snapshot):
     return True
 
 
+def package_tgz_name(files):
+    """ the name of the compressed file of a package, it can be a tgz or a txz
+    """
+    return PACKAGE_TXZ_NAME if PACKAGE_TXZ_NAME in files else PACKAGE_TGZ_NAME
+
+
 def check_compressed_files(tgz_name, files):
     bare_name = os.path.splitext(tgz_name)[0]
     for f in files:
@@ -320,7 +410,7 @@ def uncompress_file(src_path, dest_folder, output):
     try:
         with progress_bar.open_binary(src_path, output, "Decompressing %s" % os.path.basename(
             src_path)) as file_handler:
-            tar_extract(file_handler, dest_folder)
+            files, size = tar_extract(file_handler, dest_folder)
     except Exception as e:
         error_msg = "Error while downloading/extracting files to %s\n%s\n" % (dest_folder, str(e))
         # try to remove the files
@@ -333,4 +423,4 @@ def uncompress_file(src_path, dest_folder, output):
         raise ConanException(error_msg)
 
     duration = time.time() - t1
-    log_uncompressed_file(src_path, duration, dest_folder)
+    log_uncompressed_file(src_path, duration, dest_folder, files, size)
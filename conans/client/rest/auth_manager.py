@@ -14,7 +14,10 @@ Flow:
 import hashlib
 from uuid import getnode as get_mac
 
+from six import StringIO
+
 from conans.client.cmd.user import update_localdb
+from conans.client.output import ConanOutput
 from conans.errors import AuthenticationException, ConanException, ForbiddenException
 from conans.util.log import logger
 
@@ -67,6 +70,17 @@ class ConanApiAuthManager(object):
                 self._clear_user_tokens_in_db(user, remote)
                 return self._retry_with_new_token(user, remote, method_name, *args, **kwargs)
 
+    def call_rest_api_method_quietly(self, remote, method_name, *args, **kwargs):
+        """Calls the method with the stored credentials, without any output nor requesting the
+        user's login, so it can be used from background threads. AuthenticationException is
+        raised if the remote requires other credentials"""
+        user = self._localdb.get_username(remote.url)
+        rest_client = self._get_rest_client(remote, output=ConanOutput(StringIO()))
+        try:
+            return getattr(rest_client, method_name)(*args, **kwargs)
+        except ForbiddenException:
+            raise ForbiddenException("Permission denied for user: '%s'" % user)
+
     def _retry_with_new_token(self, user, remote, method_name, *args, **kwargs):
         """Try LOGIN_RETRIES to obtain a password from user input for which
         we can get a valid token from api_client. If a token is returned,
@@ -86,11 +100,12 @@ class ConanApiAuthManager(object):
 
         raise AuthenticationException("Too many failed login attempts, bye!")
 
-    def _get_rest_client(self, remote):
+    def _get_rest_client(self, remote, output=None):
         username, token, refresh_token = self._localdb.get_login(remote.url)
         custom_headers = {'X-Client-Anonymous-Id': self._get_mac_digest(),
                           'X-Client-Id': str(username or "")}
-        return self._rest_client_factory.new(remote, token, refresh_token, custom_headers)
+        return self._rest_client_factory.new(remote, token, refresh_token, custom_headers,
+                                             output=output)
 
     def _clear_user_tokens_in_db(self, user, remote):
         try:
@@ -45,16 +45,20 @@ class ClientCommonRouter(object):
     def ping(self):
         return self.base_url + self.routes.ping
 
-    def search(self, pattern, ignorecase):
-        """URL search recipes"""
-        query = ''
+    def search(self, pattern, ignorecase, after=None, limit=None):
+        """URL search recipes, 'after' and 'limit' paginate the results"""
+        params = {}
         if pattern:
             if isinstance(pattern, ConanFileReference):
                 pattern = repr(pattern)
-            params = {"q": pattern}
+            params["q"] = pattern
             if not ignorecase:
                 params["ignorecase"] = "False"
-            query = "?%s" % urlencode(params)
+        if after:
+            params["after"] = after
+        if limit:
+            params["limit"] = limit
+        query = "?%s" % urlencode(params) if params else ""
         return self.base_url + "%s%s" % (self.routes.common_search, query)
 
     def search_packages(self, ref, query=None):
@@ -222,6 +226,10 @@ class ClientV2Router(ClientCommonRouter):
         assert ref.revision is None, "for_recipe_latest shouldn't receive RREV"
         return self.base_url + _format_ref(self.routes.recipe_latest, ref)
 
+    def batch_metadata(self):
+        """Post the references to get the metadata of all of them"""
+        return self.base_url + self.routes.batch_metadata
+
     def _for_package_file(self, pref, path, matrix_params):
         """url for getting a file from a package, with revisions"""
         assert pref.ref.revision is not None, "_for_package_file needs RREV"
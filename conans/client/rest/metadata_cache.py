@@ -0,0 +1,96 @@
+import json
+import os
+import sqlite3
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+
+from conans.util.log import logger
+
+METADATA_CACHE = "metadata_cache.sqlite"
+RESPONSES_TABLE = "responses"
+
+CachedResponse = namedtuple("CachedResponse", "result etag last_modified fresh")
+
+
+class RemoteMetadataCache(object):
+    """ Persistent cache, in the Conan home, of the metadata responses of the remotes (server
+    capabilities, latest revisions, recipe searches), keyed by their URL and the authenticated
+    user, so consecutive Conan processes don't request them again.
+
+    The responses stored less than 'ttl' seconds ago are used without contacting the remote.
+    The older ones are revalidated with their ETag or Last-Modified (If-None-Match,
+    If-Modified-Since), so an unchanged response costs a 304 without body. With ttl = 0 (the
+    default) every response is revalidated. The entries of a remote are dropped every time this
+    client uploads or removes something in it.
+
+    It is only an optimization, any error accessing the database is logged and the responses
+    are requested as if they were not cached
+    """
+
+    def __init__(self, cache_folder, ttl=0):
+        self._dbfile = os.path.join(cache_folder, METADATA_CACHE)
+        self.ttl = ttl
+
+    @contextmanager
+    def _connect(self):
+        folder = os.path.dirname(self._dbfile)
+        if not os.path.exists(folder):
+            os.makedirs(folder)
+        connection = sqlite3.connect(self._dbfile, timeout=60)
+        connection.text_factory = str
+        try:
+            cursor = connection.cursor()
+            cursor.execute("CREATE TABLE IF NOT EXISTS %s (url TEXT PRIMARY KEY, result TEXT, "
+                           "etag TEXT, last_modified TEXT, timestamp REAL)" % RESPONSES_TABLE)
+            yield cursor
+            connection.commit()
+        finally:
+            connection.close()
+
+    def get(self, url):
+        """ :return: the CachedResponse stored for the url, or None
+        """
+        try:
+            with self._connect() as cursor:
+                cursor.execute("SELECT result, etag, last_modified, timestamp FROM %s "
+                               "WHERE url = ?" % RESPONSES_TABLE, (url, ))
+                row = cursor.fetchone()
+        except Exception as e:
+            logger.error("Error reading the metadata cache %s: %s" % (self._dbfile, str(e)))
+            return None
+        if row is None:
+            return None
+        result, etag, last_modified, timestamp = row
+        fresh = 0 <= time.time() - timestamp < (self.ttl or 0)
+        return CachedResponse(json.loads(result), etag, last_modified, fresh)
+
+    def store(self, url, result, etag=None, last_modified=None):
+        try:
+            with self._connect() as cursor:
+                cursor.execute("INSERT OR REPLACE INTO %s (url, result, etag, last_modified, "
+                               "timestamp) VALUES (?, ?, ?, ?, ?)" % RESPONSES_TABLE,
+                               (url, json.dumps(result), etag, last_modified, time.time()))
+        except Exception as e:
+            logger.error("Error writing the metadata cache %s: %s" % (self._dbfile, str(e)))
+
+    def revalidated(self, url):
+        """ the remote confirmed (304) that the stored response is still valid
+        """
+        try:
+            with self._connect() as cursor:
+                cursor.execute("UPDATE %s SET timestamp = ? WHERE url = ?" % RESPONSES_TABLE,
+                               (time.time(), url))
+        except Exception as e:
+            logger.error("Error writing the metadata cache %s: %s" % (self._dbfile, str(e)))
+
+    def invalidate(self, remote_url):
+        """ drops the responses of a remote, after this client modified it
+        """
+        prefix = remote_url.rstrip("/") + "/"
+        try:
+            with self._connect() as cursor:
+                cursor.execute("DELETE FROM %s WHERE url >= ? AND url < ?" % RESPONSES_TABLE,
+                               (prefix, prefix[:-1] + chr(ord("/") + 1)))
+        except Exception as e:
+            logger.error("Error writing the metadata cache %s: %s" % (self._dbfile, str(e)))
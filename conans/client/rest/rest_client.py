@@ -8,18 +8,20 @@ from conans.util.log import logger
 
 class RestApiClientFactory(object):
 
-    def __init__(self, output, requester, config, artifacts_properties=None):
+    def __init__(self, output, requester, config, artifacts_properties=None,
+                 metadata_cache=None):
         self._output = output
         self._requester = requester
         self._config = config
         self._artifacts_properties = artifacts_properties
+        self._metadata_cache = metadata_cache
         self._cached_capabilities = {}
 
-    def new(self, remote, token, refresh_token, custom_headers):
+    def new(self, remote, token, refresh_token, custom_headers, output=None):
         tmp = RestApiClient(remote, token, refresh_token, custom_headers,
-                            self._output, self._requester, self._config,
+                            output or self._output, self._requester, self._config,
                             self._cached_capabilities,
-                            self._artifacts_properties)
+                            self._artifacts_properties, self._metadata_cache)
         return tmp
 
 
@@ -29,7 +31,7 @@ class RestApiClient(object):
     """
 
     def __init__(self, remote, token, refresh_token, custom_headers, output, requester,
-                 config, cached_capabilities, artifacts_properties=None):
+                 config, cached_capabilities, artifacts_properties=None, metadata_cache=None):
 
         # Set to instance
         self._token = token
@@ -46,13 +48,15 @@ class RestApiClient(object):
 
         # This dict is shared for all the instances of RestApiClient
         self._cached_capabilities = cached_capabilities
+        # Persistent cache of the metadata responses, shared by the Conan processes
+        self._metadata_cache = metadata_cache
 
     def _capable(self, capability, user=None, password=None):
         capabilities = self._cached_capabilities.get(self._remote_url)
         if capabilities is None:
             tmp = RestV1Methods(self._remote_url, self._token, self._custom_headers, self._output,
                                 self._requester, self._config, self._verify_ssl,
-                                self._artifacts_properties)
+                                self._artifacts_properties, metadata_cache=self._metadata_cache)
             capabilities = tmp.server_capabilities(user, password)
             self._cached_capabilities[self._remote_url] = capabilities
             logger.debug("REST: Cached capabilities for the remote: %s" % capabilities)
@@ -67,11 +71,17 @@ class RestApiClient(object):
             checksum_deploy = self._capable(CHECKSUM_DEPLOY)
             return RestV2Methods(self._remote_url, self._token, self._custom_headers, self._output,
                                  self._requester, self._config, self._verify_ssl,
-                                 self._artifacts_properties, checksum_deploy, matrix_params)
+                                 self._artifacts_properties, checksum_deploy, matrix_params,
+                                 self._metadata_cache)
         else:
             return RestV1Methods(self._remote_url, self._token, self._custom_headers, self._output,
                                  self._requester, self._config, self._verify_ssl,
-                                 self._artifacts_properties, matrix_params)
+                                 self._artifacts_properties, matrix_params, self._metadata_cache)
+
+    def _modified_remote(self):
+        """ the cached metadata of the remote is no longer valid after modifying it """
+        if self._metadata_cache is not None:
+            self._metadata_cache.invalidate(self._remote_url)
 
     def get_recipe_manifest(self, ref):
         return self._get_api().get_recipe_manifest(ref)
@@ -91,8 +101,8 @@ class RestApiClient(object):
     def get_recipe_sources(self, ref, dest_folder):
         return self._get_api().get_recipe_sources(ref, dest_folder)
 
-    def get_package(self, pref, dest_folder):
-        return self._get_api().get_package(pref, dest_folder)
+    def get_package(self, pref, dest_folder, extractor=None):
+        return self._get_api().get_package(pref, dest_folder, extractor)
 
     def get_package_snapshot(self, ref):
         return self._get_api().get_package_snapshot(ref)
@@ -104,10 +114,17 @@ class RestApiClient(object):
         return self._get_api().get_package_path(pref, path)
 
     def upload_recipe(self, ref, files_to_upload, deleted, retry, retry_wait):
-        return self._get_api().upload_recipe(ref, files_to_upload, deleted, retry, retry_wait)
+        try:
+            return self._get_api().upload_recipe(ref, files_to_upload, deleted, retry, retry_wait)
+        finally:
+            self._modified_remote()
 
     def upload_package(self, pref, files_to_upload, deleted, retry, retry_wait):
-        return self._get_api().upload_package(pref, files_to_upload, deleted, retry, retry_wait)
+        try:
+            return self._get_api().upload_package(pref, files_to_upload, deleted, retry,
+                                                  retry_wait)
+        finally:
+            self._modified_remote()
 
     def authenticate(self, user, password):
         api_v1 = RestV1Methods(self._remote_url, self._token, self._custom_headers, self._output,
@@ -134,8 +151,8 @@ class RestApiClient(object):
     def check_credentials(self):
         return self._get_api().check_credentials()
 
-    def search(self, pattern=None, ignorecase=True):
-        return self._get_api().search(pattern, ignorecase)
+    def search(self, pattern=None, ignorecase=True, cached=False):
+        return self._get_api().search(pattern, ignorecase, cached)
 
     def search_packages(self, reference, query):
         # Do not send the query to the server, as it will fail
@@ -144,14 +161,23 @@ class RestApiClient(object):
         return filter_packages(query, package_infos)
 
     def remove_recipe(self, ref):
-        return self._get_api().remove_conanfile(ref)
+        try:
+            return self._get_api().remove_conanfile(ref)
+        finally:
+            self._modified_remote()
 
     def remove_packages(self, ref, package_ids=None):
-        return self._get_api().remove_packages(ref, package_ids)
+        try:
+            return self._get_api().remove_packages(ref, package_ids)
+        finally:
+            self._modified_remote()
 
     def server_capabilities(self):
         return self._get_api().server_capabilities()
 
+    def server_supports(self, capability):
+        return self._capable(capability)
+
     def get_recipe_revisions(self, ref):
         return self._get_api().get_recipe_revisions(ref)
 
@@ -163,3 +189,9 @@ class RestApiClient(object):
 
     def get_latest_package_revision(self, pref, headers):
         return self._get_api().get_latest_package_revision(pref, headers=headers)
+
+    def get_recipes_manifests(self, refs):
+        return self._get_api().get_recipes_manifests(refs)
+
+    def get_packages_metadata(self, prefs):
+        return self._get_api().get_packages_metadata(prefs)
@@ -1,4 +1,5 @@
 import json
+from hashlib import sha1
 
 from requests.auth import AuthBase, HTTPBasicAuth
 
@@ -10,6 +11,9 @@ from conans.model.ref import ConanFileReference
 from conans.util.files import decode_text
 from conans.util.log import logger
 
+# Maximum number of references of each page of the remote recipe searches
+SEARCH_PAGE_SIZE = 1000
+
 
 class JWTAuth(AuthBase):
     """Attaches JWT Authentication to the given Request object."""
@@ -61,7 +65,7 @@ def handle_return_deserializer(deserializer=None):
 class RestCommonMethods(object):
 
     def __init__(self, remote_url, token, custom_headers, output, requester, config, verify_ssl,
-                 artifacts_properties=None, matrix_params=False):
+                 artifacts_properties=None, matrix_params=False, metadata_cache=None):
         self.token = token
         self.remote_url = remote_url
         self.custom_headers = custom_headers
@@ -71,6 +75,7 @@ class RestCommonMethods(object):
         self.verify_ssl = verify_ssl
         self._artifacts_properties = artifacts_properties
         self._matrix_params = matrix_params
+        self._metadata_cache = metadata_cache
 
     @property
     def auth(self):
@@ -157,6 +162,12 @@ class RestCommonMethods(object):
     def server_capabilities(self, user=None, password=None):
         """Get information about the server: status, version, type and capabilities"""
         url = self.router.ping()
+        # The capabilities are cached for the metadata_ttl, the ping cannot be revalidated
+        cached = self._metadata_cache is not None and not (user and password)
+        if cached:
+            entry = self._metadata_cache.get(url)
+            if entry is not None and entry.fresh:
+                return entry.result
         logger.debug("REST: ping: %s" % url)
         if user and password:
             # This can happen in "conan user" cmd. Instead of empty token, use HttpBasic
@@ -171,11 +182,50 @@ class RestCommonMethods(object):
             # to cache them #5687, so raise the exception and force authentication
             raise get_exception_from_error(ret.status_code)(response_to_str(ret))
 
-        return [cap.strip() for cap in server_capabilities.split(",") if cap]
+        capabilities = [cap.strip() for cap in server_capabilities.split(",") if cap]
+        if cached:
+            self._metadata_cache.store(url, capabilities)
+        return capabilities
+
+    def _cache_key(self, url):
+        """ the key of the metadata cache of the responses of the url, that depend on the
+        authenticated user, so the ones of other users or anonymous are not reused
+        """
+        user = self.custom_headers.get("X-Client-Id") if self.token else None
+        return "%s#user=%s" % (url, user) if user else url
 
-    def get_json(self, url, data=None, headers=None):
+    def get_json(self, url, data=None, headers=None, cached=False):
+        """ :param cached: the GET response can be served from the metadata cache, or
+                       revalidated with the ETag or Last-Modified of the cached one. The POST
+                       ones can only be served while they are fresh, they are not revalidated
+        """
         req_headers = self.custom_headers.copy()
         req_headers.update(headers or {})
+        entry = None
+        cache_key = self._cache_key(url)
+        if cached and self._metadata_cache is not None and data:
+            if self._metadata_cache.ttl:
+                body = json.dumps(data, sort_keys=True).encode()
+                cache_key = "%s#%s" % (cache_key, sha1(body).hexdigest())
+                entry = self._metadata_cache.get(cache_key)
+                if entry is not None and entry.fresh:
+                    logger.debug("REST: cached: %s" % url)
+                    return entry.result
+                entry = None
+            else:
+                cached = False
+        elif cached and self._metadata_cache is not None:
+            entry = self._metadata_cache.get(cache_key)
+            if entry is not None:
+                if entry.fresh:
+                    logger.debug("REST: cached: %s" % url)
+                    return entry.result
+                if entry.etag:
+                    req_headers["If-None-Match"] = entry.etag
+                if entry.last_modified:
+                    req_headers["If-Modified-Since"] = entry.last_modified
+        else:
+            cached = False
         if data:  # POST request
             req_headers.update({'Content-type': 'application/json',
                                 'Accept': 'application/json'})
@@ -190,6 +240,9 @@ class RestCommonMethods(object):
                                           verify=self.verify_ssl,
                                           stream=True)
 
+        if entry is not None and response.status_code == 304:
+            self._metadata_cache.revalidated(cache_key)
+            return entry.result
         if response.status_code != 200:  # Error message is text
             response.charset = "utf-8"  # To be able to access ret.text (ret.content are bytes)
             raise get_exception_from_error(response.status_code)(response_to_str(response))
@@ -206,6 +259,9 @@ class RestCommonMethods(object):
             raise ConanException("Remote responded with broken json: %s" % content)
         if not isinstance(result, dict):
             raise ConanException("Unexpected server response %s" % result)
+        if cached:
+            self._metadata_cache.store(cache_key, result, response.headers.get("ETag"),
+                                       response.headers.get("Last-Modified"))
         return result
 
     def upload_recipe(self, ref, files_to_upload, deleted, retry, retry_wait):
@@ -236,13 +292,21 @@ class RestCommonMethods(object):
                             "in local package present in remote: %s.\n Please, report it at "
                             "https://github.com/conan-io/conan/issues " % str(deleted))
 
-    def search(self, pattern=None, ignorecase=True):
+    def search(self, pattern=None, ignorecase=True, cached=False):
         """
         the_files: dict with relative_path: content
         """
-        url = self.router.search(pattern, ignorecase)
-        response = self.get_json(url)["results"]
-        return [ConanFileReference.loads(reference) for reference in response]
+        references = []
+        after = None
+        while True:
+            # The servers without pagination ignore the limit and don't return a 'next' page
+            url = self.router.search(pattern, ignorecase, after, SEARCH_PAGE_SIZE)
+            response = self.get_json(url, cached=cached)
+            references.extend(response["results"])
+            after = response.get("next")
+            if not after:
+                break
+        return [ConanFileReference.loads(reference) for reference in references]
 
     def search_packages(self, ref, query):
         """Client is filtering by the query"""
@@ -7,7 +7,7 @@ from six.moves.urllib.parse import parse_qs, urljoin, urlparse, urlsplit
 
 from conans.client.downloaders.download import run_downloader
 from conans.client.downloaders.file_downloader import FileDownloader
-from conans.client.remote_manager import check_compressed_files
+from conans.client.remote_manager import check_compressed_files, package_tgz_name
 from conans.client.rest.client_routes import ClientV1Router
 from conans.client.rest.file_uploader import FileUploader
 from conans.client.rest.rest_client_common import RestCommonMethods, handle_return_deserializer
@@ -15,8 +15,7 @@ from conans.errors import ConanException, NotFoundException, NoRestV2Available,
     PackageNotFoundException
 from conans.model.info import ConanInfo
 from conans.model.manifest import FileTreeManifest
-from conans.paths import CONANINFO, CONAN_MANIFEST, EXPORT_SOURCES_TGZ_NAME, EXPORT_TGZ_NAME, \
-    PACKAGE_TGZ_NAME
+from conans.paths import CONANINFO, CONAN_MANIFEST, EXPORT_SOURCES_TGZ_NAME, EXPORT_TGZ_NAME
 from conans.util.files import decode_text
 from conans.util.log import logger
 
@@ -224,9 +223,9 @@ class RestV1Methods(RestCommonMethods):
         urls = self._get_file_to_url_dict(url)
         return urls
 
-    def get_package(self, pref, dest_folder):
+    def get_package(self, pref, dest_folder, extractor=None):  # extractor not supported in v1
         urls = self._get_package_urls(pref)
-        check_compressed_files(PACKAGE_TGZ_NAME, urls)
+        check_compressed_files(package_tgz_name(urls), urls)
         md5s = self.get_package_snapshot(pref) if self._config.download_cache else None
         zipped_files = self._download_files_to_folder(urls, dest_folder, md5s)
         return zipped_files
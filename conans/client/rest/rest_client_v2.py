@@ -1,10 +1,11 @@
 import os
 import time
 import traceback
+from collections import OrderedDict
 
 from conans import DEFAULT_REVISION_V1
 from conans.client.downloaders.download import run_downloader
-from conans.client.remote_manager import check_compressed_files
+from conans.client.remote_manager import check_compressed_files, package_tgz_name
 from conans.client.rest.client_routes import ClientV2Router
 from conans.client.rest.file_uploader import FileUploader
 from conans.client.rest.rest_client_common import RestCommonMethods, get_exception_from_error
@@ -12,8 +13,8 @@ from conans.errors import ConanException, NotFoundException, PackageNotFoundExce
     RecipeNotFoundException, AuthenticationException, ForbiddenException
 from conans.model.info import ConanInfo
 from conans.model.manifest import FileTreeManifest
-from conans.model.ref import PackageReference
-from conans.paths import EXPORT_SOURCES_TGZ_NAME, EXPORT_TGZ_NAME, PACKAGE_TGZ_NAME
+from conans.model.ref import ConanFileReference, PackageReference
+from conans.paths import EXPORT_SOURCES_TGZ_NAME, EXPORT_TGZ_NAME
 from conans.util.files import decode_text
 from conans.util.log import logger
 
@@ -21,10 +22,12 @@ from conans.util.log import logger
 class RestV2Methods(RestCommonMethods):
 
     def __init__(self, remote_url, token, custom_headers, output, requester, config, verify_ssl,
-                 artifacts_properties=None, checksum_deploy=False, matrix_params=False):
+                 artifacts_properties=None, checksum_deploy=False, matrix_params=False,
+                 metadata_cache=None):
 
         super(RestV2Methods, self).__init__(remote_url, token, custom_headers, output, requester,
-                                            config, verify_ssl, artifacts_properties, matrix_params)
+                                            config, verify_ssl, artifacts_properties, matrix_params,
+                                            metadata_cache)
         self._checksum_deploy = checksum_deploy
 
     @property
@@ -115,16 +118,17 @@ class RestV2Methods(RestCommonMethods):
         ret = {fn: os.path.join(dest_folder, fn) for fn in files}
         return ret
 
-    def get_package(self, pref, dest_folder):
+    def get_package(self, pref, dest_folder, extractor=None):
         url = self.router.package_snapshot(pref)
         data = self._get_file_list_json(url)
         files = data["files"]
-        check_compressed_files(PACKAGE_TGZ_NAME, files)
+        check_compressed_files(package_tgz_name(files), files)
         # If we didn't indicated reference, server got the latest, use absolute now, it's safer
         urls = {fn: self.router.package_file(pref, fn) for fn in files}
         cache = (pref.revision != DEFAULT_REVISION_V1)
-        self._download_and_save_files(urls, dest_folder, files, use_cache=cache)
-        ret = {fn: os.path.join(dest_folder, fn) for fn in files}
+        streamed = self._download_and_save_files(urls, dest_folder, files, use_cache=cache,
+                                                 extractor=extractor)
+        ret = {fn: os.path.join(dest_folder, fn) for fn in files if fn not in streamed}
         return ret
 
     def get_recipe_path(self, ref, path):
@@ -213,17 +217,29 @@ class RestV2Methods(RestCommonMethods):
         else:
             logger.debug("\nUPLOAD: All uploaded! Total time: %s\n" % str(time.time() - t1))
 
-    def _download_and_save_files(self, urls, dest_folder, files, use_cache):
+    def _download_and_save_files(self, urls, dest_folder, files, use_cache, extractor=None):
+        """ The file of the extractor, if any, is extracted while it is downloaded instead of
+        being saved in dest_folder, unless the download cache needs it
+        :return: the names of the files that were extracted instead of saved
+        """
+        streamed = []
         # Take advantage of filenames ordering, so that conan_package.tgz and conan_export.tgz
         # can be < conanfile, conaninfo, and sent always the last, so smaller files go first
         for filename in sorted(files, reverse=True):
             if self._output and not self._output.is_terminal:
                 self._output.writeln("Downloading %s" % filename)
             resource_url = urls[filename]
+            if (extractor is not None and filename == extractor.name and
+                    not (use_cache and self._config.download_cache)):
+                run_downloader(self.requester, self._output, self.verify_ssl, self._config,
+                               use_cache=False, url=resource_url, stream=extractor, auth=self.auth)
+                streamed.append(filename)
+                continue
             abs_path = os.path.join(dest_folder, filename)
             run_downloader(self.requester, self._output, self.verify_ssl, self._config,
                            use_cache=use_cache,
                            url=resource_url, file_path=abs_path, auth=self.auth)
+        return streamed
 
     def _remove_conanfile_files(self, ref, files):
         # V2 === revisions, do not remove files, it will create a new revision if the files changed
@@ -321,14 +337,68 @@ class RestV2Methods(RestCommonMethods):
 
     def get_latest_recipe_revision(self, ref):
         url = self.router.recipe_latest(ref)
-        data = self.get_json(url)
+        data = self.get_json(url, cached=True)
         rev = data["revision"]
         # Ignored data["time"]
         return ref.copy_with_rev(rev)
 
     def get_latest_package_revision(self, pref, headers):
         url = self.router.package_latest(pref)
-        data = self.get_json(url, headers=headers)
+        data = self.get_json(url, headers=headers, cached=True)
         prev = data["revision"]
         # Ignored data["time"]
         return pref.copy_with_revs(pref.ref.revision, prev)
+
+    def _get_batch_metadata(self, queries, cached):
+        url = self.router.batch_metadata()
+        return self.get_json(url, data={"references": queries}, cached=cached)["references"]
+
+    def get_recipes_manifests(self, refs):
+        """ get_recipe_manifest() of many recipes in one request
+        :return: for every ref, (manifest, ref with revision) or the exception of its error
+        """
+        queries = [{"ref": ref.full_str()} for ref in refs]
+        ret = []
+        # They are only requested to check the updates, a cached response could be outdated
+        for data in self._get_batch_metadata(queries, cached=False):
+            if "error" in data:
+                ret.append(_batch_error(data["error"]))
+            else:
+                ret.append((FileTreeManifest.loads(data["manifest"]),
+                            ConanFileReference.loads(data["ref"])))
+        return ret
+
+    def get_packages_metadata(self, prefs):
+        """ get_package_info() and get_package_manifest() of many packages in one request
+        :return: for every pref, (info, manifest, pref with revisions) or the exception of its
+                 error
+        """
+        queries = OrderedDict()
+        for pref in prefs:
+            package = "%s#%s" % (pref.id, pref.revision) if pref.revision else pref.id
+            queries.setdefault(pref.ref, []).append(package)
+        results = self._get_batch_metadata([{"ref": ref.full_str(), "packages": packages}
+                                            for ref, packages in queries.items()], cached=True)
+        results = dict(zip(queries.keys(), results))
+        ret = []
+        for pref in prefs:
+            data = results[pref.ref]
+            if "error" in data:
+                ret.append(_batch_error(data["error"]))
+                continue
+            package = "%s#%s" % (pref.id, pref.revision) if pref.revision else pref.id
+            data = data["packages"][package]
+            if "error" in data:
+                ret.append(_batch_error(data["error"]))
+            else:
+                ret.append((ConanInfo.loads(data["conaninfo"]),
+                            FileTreeManifest.loads(data["manifest"]),
+                            pref.copy_with_revs(pref.ref.revision, data["revision"])))
+        return ret
+
+
+def _batch_error(error):
+    """ the exception that the single request would have raised
+    """
+    exc_class = get_exception_from_error(error["status"]) or ConanException
+    return exc_class(error["message"])
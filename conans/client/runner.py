@@ -8,6 +8,7 @@ import six
 from conans.client.tools import environment_append
 from conans.errors import ConanException
 from conans.util.files import decode_text
+from conans.util.process_state import process_state_lock
 from conans.util.runners import pyinstaller_bundle_env_cleaned
 
 
@@ -108,16 +109,51 @@ class ConanRunner(object):
                     # tried to open the log_handler binary but same result.
                     log_handler.write(line if six.PY2 else decoded_line)
 
-        if capture_output:
-            get_stream_lines(proc.stdout)
+        # While the subprocess runs, other concurrent package builds can progress
+        with process_state_lock.released():
+            if capture_output:
+                get_stream_lines(proc.stdout)
 
-        proc.communicate()
+            proc.communicate()
         ret = proc.returncode
         return ret
 
     @staticmethod
     def _simple_os_call(command, cwd):
         try:
-            return subprocess.call(command, cwd=cwd, shell=isinstance(command, six.string_types))
+            proc = subprocess.Popen(command, cwd=cwd, shell=isinstance(command, six.string_types))
         except Exception as e:
             raise ConanException("Error while executing '%s'\n\t%s" % (command, str(e)))
+        with process_state_lock.released():
+            try:
+                return proc.wait()
+            except BaseException:
+                proc.kill()
+                proc.wait()
+                raise
+
+
+class _ScopedStream(object):
+    """ Writes every line of a command output through the (scoped) output of a package,
+    so the logs of concurrent builds can be told apart
+    """
+    def __init__(self, output):
+        self._output = output
+
+    def write(self, data):
+        for line in data.splitlines():
+            self._output.writeln(line)
+
+
+class ScopedRunner(object):
+    """ Runner for a package being built concurrently with others, it captures the output
+    of the commands and prefixes it with the package name
+    """
+    def __init__(self, runner, output):
+        self._runner = runner
+        self._output = output
+
+    def __call__(self, command, output=True, log_filepath=None, cwd=None, subprocess=False):
+        if output is True:
+            output = _ScopedStream(self._output)
+        return self._runner(command, output, log_filepath, cwd, subprocess)
@@ -9,7 +9,6 @@ from contextlib import contextmanager
 from fnmatch import fnmatch
 
 import six
-from patch_ng import fromfile, fromstring
 
 from conans.client.output import ConanOutput
 from conans.errors import ConanException
@@ -214,6 +213,7 @@ def patch(base_path=None, patch_file=None, patch_string=None, strip=0, output=No
     :param output: Stream object.
     :param fuzz: Should accept fuzzy patches.
     """
+    from patch_ng import fromfile, fromstring
 
     class PatchLogHandler(logging.Handler):
         def __init__(self):
@@ -2,8 +2,6 @@
 
 from functools import total_ordering
 
-from semver import SemVer
-
 from conans.errors import ConanException
 
 
@@ -13,6 +11,7 @@ class Version(object):
     loose = True  # Allow incomplete version strings like '1.2' or '1-dev0'
 
     def __init__(self, value):
+        from semver import SemVer
         v = str(value).strip()
         try:
             self._semver = SemVer(v, loose=self.loose)
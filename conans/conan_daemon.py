@@ -0,0 +1,11 @@
+import sys
+
+from conans.client.daemon import main
+
+
+def run():
+    main(sys.argv[1:])
+
+
+if __name__ == '__main__':
+    run()
@@ -1,10 +1,16 @@
+import multiprocessing
 import os
+from multiprocessing.pool import ThreadPool
 
 from conans.errors import ConanException
 from conans.paths import CONAN_MANIFEST, EXPORT_SOURCES_TGZ_NAME, EXPORT_TGZ_NAME, PACKAGE_TGZ_NAME
 from conans.util.dates import timestamp_now, timestamp_to_str
 from conans.util.env_reader import get_env
 from conans.util.files import load, md5, md5sum, save, walk
+from conans.util.hash_cache import FileHashCache, stat_key
+
+# The files are hashed in parallel only when there is enough data to compensate the pool
+PARALLEL_HASH_MIN_BYTES = 4 * 1024 * 1024
 
 
 def discarded_file(filename, keep_python):
@@ -49,6 +55,53 @@ def gather_files(folder):
     return file_dict, symlinks
 
 
+def _hash_cache():
+    dbfile = get_env("CONAN_MANIFEST_HASH_CACHE", None)
+    return FileHashCache(dbfile) if dbfile else None
+
+
+def forget_hashes(*folders):
+    """ drops the stored hashes of the files of removed folders, if the hash cache is enabled
+    """
+    hash_cache = _hash_cache()
+    if hash_cache is not None:
+        hash_cache.remove(folders)
+
+
+def _md5sums(folder, files, hash_cache):
+    """ computes the md5 of the given files {name: abs_path} of the folder, reusing the ones
+    stored in the hash cache for the unchanged files, and hashing the rest, in parallel if
+    they are big enough
+    :return: {name: md5}
+    """
+    if hash_cache is None:
+        to_hash = files
+        cached = {}
+    else:
+        folder = os.path.abspath(folder)
+        files = {name: os.path.join(folder, os.path.relpath(path, folder))
+                 for name, path in files.items()}
+        keys = {path: stat_key(path) for path in files.values()}
+        cached = hash_cache.folder_hashes(folder, keys)
+        to_hash = {name: path for name, path in files.items() if path not in cached}
+
+    paths = list(to_hash.values())
+    if len(paths) > 1 and sum(os.path.getsize(p) for p in paths) >= PARALLEL_HASH_MIN_BYTES:
+        pool = ThreadPool(min(len(paths), multiprocessing.cpu_count()))
+        try:
+            hashed = dict(zip(paths, pool.map(md5sum, paths)))
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        hashed = {path: md5sum(path) for path in paths}
+
+    if hash_cache is not None:
+        hash_cache.update_folder(folder, keys, hashed)
+    cached.update(hashed)
+    return {name: cached[path] for name, path in files.items()}
+
+
 class FileTreeManifest(object):
 
     def __init__(self, the_time, file_sums):
@@ -118,20 +171,21 @@ class FileTreeManifest(object):
     @classmethod
     def create(cls, folder, exports_sources_folder=None):
         """ Walks a folder and create a FileTreeManifest for it, reading file contents
-        from disk, and capturing current time
+        from disk (only the ones modified since they were hashed the last time, if the
+        CONAN_MANIFEST_HASH_CACHE is defined), and capturing current time
         """
+        hash_cache = _hash_cache()
         files, _ = gather_files(folder)
         for f in (PACKAGE_TGZ_NAME, EXPORT_TGZ_NAME, CONAN_MANIFEST, EXPORT_SOURCES_TGZ_NAME):
             files.pop(f, None)
 
-        file_dict = {}
-        for name, filepath in files.items():
-            file_dict[name] = md5sum(filepath)
+        file_dict = _md5sums(folder, files, hash_cache)
 
         if exports_sources_folder:
             export_files, _ = gather_files(exports_sources_folder)
-            for name, filepath in export_files.items():
-                file_dict["export_source/%s" % name] = md5sum(filepath)
+            export_sums = _md5sums(exports_sources_folder, export_files, hash_cache)
+            for name, file_md5 in export_sums.items():
+                file_dict["export_source/%s" % name] = file_md5
 
         date = timestamp_now()
 
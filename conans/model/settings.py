@@ -31,6 +31,9 @@ class SettingsItem(object):
     - "ANY", as string to accept any value
     - List ["None", "ANY"] to accept None or any value
     - A dict {subsetting: definition}, e.g. {version: [], runtime: []} for VS
+
+    The copies share the children Settings (copy-on-write), a child is copied the first time it
+    is accessed through the copy that could modify it
     """
     def __init__(self, definition, name):
         self._name = name  # settings.compiler
@@ -44,23 +47,36 @@ class SettingsItem(object):
         elif definition == "ANY":
             self._definition = "ANY"
         else:
-            # list or tuple of possible values
+            # list or tuple of possible values, never modified in place, it can be shared
             self._definition = sorted(str(v) for v in definition)
+        self._owned = set(self._definition) if isinstance(self._definition, dict) else None
 
     def __contains__(self, value):
         return value in (self._value or "")
 
     def copy(self):
-        """ deepcopy, recursive
+        """ copy-on-write, the children are shared until they are accessed
         """
         result = SettingsItem({}, name=self._name)
         result._value = self._value
         if self.is_final:
-            result._definition = self._definition[:]
+            result._definition = self._definition
+            result._owned = None
         else:
-            result._definition = {k: v.copy() for k, v in self._definition.items()}
+            result._definition = self._definition.copy()
+            self._owned = set()  # Now shared by both
         return result
 
+    def _child(self, key):
+        """ the child Settings of a subsetting value, that can be modified
+        """
+        child = self._definition[key]
+        if key not in self._owned:
+            child = child.copy()
+            self._definition[key] = child
+            self._owned.add(key)
+        return child
+
     def copy_values(self):
         if self._value is None and "None" not in self._definition:
             return None
@@ -118,11 +134,12 @@ class SettingsItem(object):
             v = str(v)
             if isinstance(self._definition, dict):
                 self._definition.pop(v, None)
+                self._owned.discard(v)
             elif self._definition == "ANY":
                 if v == "ANY":
                     self._definition = []
             elif v in self._definition:
-                self._definition.remove(v)
+                self._definition = [d for d in self._definition if d != v]
 
         if self._value is not None and self._value not in self._definition and self._not_any():
             raise ConanException(bad_value_msg(self._name, self._value, self.values_range))
@@ -132,7 +149,7 @@ class SettingsItem(object):
             raise undefined_field(self._name, item, None, self._value)
         if self._value is None:
             raise undefined_value(self._name)
-        return self._definition[self._value]
+        return self._child(self._value)
 
     def __getattr__(self, item):
         item = str(item)
@@ -150,7 +167,7 @@ class SettingsItem(object):
     def __getitem__(self, value):
         value = str(value)
         try:
-            return self._definition[value]
+            return self._child(value)
         except Exception:
             raise ConanException(bad_value_msg(self._name, value, self.values_range))
 
@@ -193,6 +210,9 @@ class SettingsItem(object):
 
 
 class Settings(object):
+    """ the settings definition and values, the copies share the SettingsItem (copy-on-write),
+    an item is copied the first time it is accessed through the copy that could modify it
+    """
     def __init__(self, definition=None, name="settings", parent_value=None):
         if parent_value == "None" and definition:
             raise ConanException("settings.yml: None setting can't have subsettings")
@@ -201,6 +221,7 @@ class Settings(object):
         self._parent_value = parent_value  # gcc, x86
         self._data = {str(k): SettingsItem(v, "%s.%s" % (name, k))
                       for k, v in definition.items()}
+        self._owned = set(self._data)
 
     def get_safe(self, name, default=None):
         try:
@@ -214,13 +235,23 @@ class Settings(object):
         return default
 
     def copy(self):
-        """ deepcopy, recursive
+        """ copy-on-write, the items are shared until they are accessed
         """
         result = Settings({}, name=self._name, parent_value=self._parent_value)
-        for k, v in self._data.items():
-            result._data[k] = v.copy()
+        result._data = self._data.copy()
+        self._owned = set()  # Now shared by both
         return result
 
+    def _item(self, field):
+        """ the SettingsItem of a field, that can be modified
+        """
+        item = self._data[field]
+        if field not in self._owned:
+            item = item.copy()
+            self._data[field] = item
+            self._owned.add(field)
+        return item
+
     def copy_values(self):
         """ deepcopy, recursive
         """
@@ -253,9 +284,11 @@ class Settings(object):
         for it in item:
             it = str(it)
             self._data.pop(it, None)
+            self._owned.discard(it)
 
     def clear(self):
         self._data = {}
+        self._owned = set()
 
     def _check_field(self, field):
         if field not in self._data:
@@ -264,19 +297,20 @@ class Settings(object):
     def __getattr__(self, field):
         assert field[0] != "_", "ERROR %s" % field
         self._check_field(field)
-        return self._data[field]
+        return self._item(field)
 
     def __delattr__(self, field):
         assert field[0] != "_", "ERROR %s" % field
         self._check_field(field)
         del self._data[field]
+        self._owned.discard(field)
 
     def __setattr__(self, field, value):
         if field[0] == "_" or field.startswith("values"):
             return super(Settings, self).__setattr__(field, value)
 
         self._check_field(field)
-        self._data[field].value = value
+        self._item(field).value = value
 
     @property
     def values(self):
@@ -325,10 +359,11 @@ class Settings(object):
             constraint_def = {str(k): v for k, v in constraint_def.items()}
 
         fields_to_remove = []
-        for field, config_item in self._data.items():
+        for field in list(self._data):
             if field not in constraint_def:
                 fields_to_remove.append(field)
                 continue
+            config_item = self._item(field)
 
             other_field_def = constraint_def[field]
             if other_field_def is None:  # Means leave it as is
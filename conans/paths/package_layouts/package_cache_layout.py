@@ -10,7 +10,7 @@ import fasteners
 from conans.client.tools.oss import OSInfo
 from conans.errors import NotFoundException, ConanException
 from conans.errors import RecipeNotFoundException, PackageNotFoundException
-from conans.model.manifest import FileTreeManifest
+from conans.model.manifest import FileTreeManifest, forget_hashes
 from conans.model.manifest import discarded_file
 from conans.model.package_metadata import PackageMetadata
 from conans.model.ref import ConanFileReference
@@ -19,7 +19,8 @@ from conans.paths import CONANFILE, SYSTEM_REQS, EXPORT_FOLDER, EXPORT_SRC_FOLDE
     BUILD_FOLDER, PACKAGES_FOLDER, SYSTEM_REQS_FOLDER, PACKAGE_METADATA, SCM_SRC_FOLDER, rm_conandir
 from conans.util.env_reader import get_env
 from conans.util.files import load, save, rmdir, set_dirty, clean_dirty, is_dirty
-from conans.util.locks import Lock, NoLock, ReadLock, SimpleLock, WriteLock
+from conans.util.locks import KERNEL_LOCKS, KernelReadLock, KernelWriteLock, Lock, NoLock, \
+    ReadLock, SimpleLock, WriteLock
 from conans.util.log import logger
 
 
@@ -39,17 +40,26 @@ def short_path(func):
 class PackageCacheLayout(object):
     """ This is the package layout for Conan cache """
 
-    def __init__(self, base_folder, ref, short_paths, no_lock):
+    def __init__(self, base_folder, ref, short_paths, no_lock, index=None, polled_locks=False):
         assert isinstance(ref, ConanFileReference)
         self._ref = ref
         self._base_folder = os.path.normpath(base_folder)
         self._short_paths = short_paths
         self._no_lock = no_lock
+        # The kernel locks, if available, unless the cache is in a filesystem that doesn't
+        # support them (network filesystems)
+        self._kernel_locks = KERNEL_LOCKS and not polled_locks
+        self._index = index
 
     @property
     def ref(self):
         return self._ref
 
+    @property
+    def index(self):
+        """ the CacheIndex of the cache this layout belongs to, if any """
+        return self._index
+
     def base_folder(self):
         """ Returns the base folder for this package reference """
         return self._base_folder
@@ -148,6 +158,7 @@ class PackageCacheLayout(object):
             raise ConanException("%s\n\nFolder: %s\n"
                                  "Couldn't remove folder, might be busy or open\n"
                                  "Close any app using it, and retry" % (pkg_folder, str(e)))
+        forget_hashes(pkg_folder)
         if is_dirty(pkg_folder):
             clean_dirty(pkg_folder)
         # FIXME: This fails at the moment, but should be fixed
@@ -179,6 +190,7 @@ class PackageCacheLayout(object):
         rmdir(download_export)
         scm_folder = os.path.join(self._base_folder, SCM_SRC_FOLDER)
         rm_conandir(scm_folder)
+        forget_hashes(export_folder, export_src_folder)
 
     def package_metadata(self):
         return os.path.join(self._base_folder, PACKAGE_METADATA)
@@ -261,6 +273,8 @@ class PackageCacheLayout(object):
                     metadata = PackageMetadata()
                 yield metadata
                 save(metadata_path, metadata.dumps())
+                if self._index is not None:
+                    self._index.update(self._ref, metadata)
             finally:
                 thread_lock.release()
 
@@ -268,23 +282,31 @@ class PackageCacheLayout(object):
     def conanfile_read_lock(self, output):
         if self._no_lock:
             return NoLock()
+        if self._kernel_locks:
+            return KernelReadLock(self._base_folder, self._ref, output)
         return ReadLock(self._base_folder, self._ref, output)
 
     def conanfile_write_lock(self, output):
         if self._no_lock:
             return NoLock()
+        if self._kernel_locks:
+            return KernelWriteLock(self._base_folder, self._ref, output)
         return WriteLock(self._base_folder, self._ref, output)
 
     def conanfile_lock_files(self, output):
         if self._no_lock:
             return ()
-        return WriteLock(self._base_folder, self._ref, output).files
+        return self.conanfile_write_lock(output).files
 
     def package_lock(self, pref):
         if self._no_lock:
             return NoLock()
         return SimpleLock(os.path.join(self._base_folder, "locks", pref.id))
 
+    def remove_from_index(self):
+        if self._index is not None:
+            self._index.remove(self._ref)
+
     def remove_package_locks(self):
         conan_folder = self._base_folder
         Lock.clean(conan_folder)
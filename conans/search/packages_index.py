@@ -0,0 +1,137 @@
+import json
+
+from conans.model.info import ConanInfo
+from conans.search.query_parse import is_operator
+from conans.util.files import load
+from conans.util.hash_cache import stat_key
+from conans.util.log import logger
+
+INFOS_TABLE = "package_infos"
+VALUES_TABLE = "package_values"
+SETTINGS = "settings"
+OPTIONS = "options"
+
+
+def _value_kind(name):
+    """ the same rule of search._evaluate: the well known settings and their subsettings are
+    looked up in the settings, everything else in the options
+    """
+    properties = ["os", "os_build", "compiler", "arch", "arch_build", "build_type"]
+    if name in properties or any(name.startswith(p + ".") for p in properties):
+        return SETTINGS
+    return OPTIONS
+
+
+def _expression_sql(expression):
+    """ translates an expression like compiler.version="12" to a SQL condition over the
+    package row "i", with the same semantics as search._evaluate()
+    :return: (sql, params)
+    """
+    name, value = expression.split("=", 1)
+    value = value.replace("\"", "")
+    kind = _value_kind(name)
+    exists = ("EXISTS (SELECT 1 FROM %s v WHERE v.ref = i.ref AND v.package_id = i.package_id "
+              "AND v.kind = ? AND v.name = ?%%s)" % VALUES_TABLE)
+    if value == "None":  # Also matches the packages without that setting or option
+        return ("(%s OR NOT %s)" % (exists % " AND v.value = ?", exists % ""),
+                [kind, name, value, kind, name])
+    return exists % " AND v.value = ?", [kind, name, value]
+
+
+def postfix_to_sql(postfix):
+    """ compiles a postfix query, as returned by infix_to_postfix(), to a SQL condition, the
+    same way evaluate_postfix() evaluates it
+    :return: (sql, params)
+    """
+    if not postfix:
+        return "1", []
+
+    stack = []
+    for el in postfix:
+        if not is_operator(el):
+            stack.append(_expression_sql(el))
+        else:
+            sql1, params1 = stack.pop()
+            sql2, params2 = stack.pop()
+            operator = "OR" if el == "|" else "AND"
+            stack.append(("(%s %s %s)" % (sql1, operator, sql2), params1 + params2))
+    if len(stack) != 1:
+        raise Exception("Bad stack: %s" % str(stack))
+    return stack[0]
+
+
+def create_tables(cursor):
+    cursor.execute("CREATE TABLE IF NOT EXISTS %s (ref TEXT, package_id TEXT, stat TEXT, "
+                   "info TEXT, PRIMARY KEY (ref, package_id))" % INFOS_TABLE)
+    cursor.execute("CREATE TABLE IF NOT EXISTS %s (ref TEXT, package_id TEXT, kind TEXT, "
+                   "name TEXT, value TEXT)" % VALUES_TABLE)
+    cursor.execute("CREATE INDEX IF NOT EXISTS %s_lookup ON %s (ref, kind, name, value)"
+                   % (VALUES_TABLE, VALUES_TABLE))
+    cursor.execute("CREATE INDEX IF NOT EXISTS %s_package ON %s (ref, package_id)"
+                   % (VALUES_TABLE, VALUES_TABLE))
+
+
+def remove_package_infos(cursor, key=None, package_ids=None):
+    """ removes the stored information of the given packages of a reference, of all its
+    packages if package_ids is None, or everything if the reference key is None too
+    """
+    for table in (INFOS_TABLE, VALUES_TABLE):
+        if key is None:
+            cursor.execute("DELETE FROM %s" % table)
+        elif package_ids is None:
+            cursor.execute("DELETE FROM %s WHERE ref = ?" % table, (key, ))
+        else:
+            cursor.executemany("DELETE FROM %s WHERE ref = ? AND package_id = ?" % table,
+                               [(key, package_id) for package_id in package_ids])
+
+
+def update_package_infos(cursor, key, conaninfo_paths):
+    """ updates the stored information of the given packages of a reference, parsing again
+    only the conaninfo.txt files that changed since they were stored
+    :param conaninfo_paths: {package_id: conaninfo.txt path, or None if it has no package}
+    """
+    cursor.execute("SELECT package_id, stat FROM %s WHERE ref = ?" % INFOS_TABLE, (key, ))
+    stored = dict(cursor.fetchall())
+
+    for package_id, conaninfo_path in conaninfo_paths.items():
+        try:
+            stat = json.dumps(stat_key(conaninfo_path)) if conaninfo_path else None
+        except OSError:
+            stat = None
+        if stat is None:
+            logger.error("There is no ConanInfo: %s" % str(conaninfo_path or package_id))
+        if stat == stored.get(package_id):
+            continue
+        remove_package_infos(cursor, key, [package_id])
+        if stat is None:
+            continue
+        info = ConanInfo.loads(load(conaninfo_path)).serialize_min()
+        cursor.execute("INSERT INTO %s (ref, package_id, stat, info) VALUES (?, ?, ?, ?)"
+                       % INFOS_TABLE, (key, package_id, stat, json.dumps(info)))
+        cursor.executemany("INSERT INTO %s (ref, package_id, kind, name, value) "
+                           "VALUES (?, ?, ?, ?, ?)" % VALUES_TABLE,
+                           [(key, package_id, kind, name, str(value))
+                            for kind in (SETTINGS, OPTIONS)
+                            for name, value in info[kind].items() if value is not None])
+
+
+def sync_package_infos(cursor, key, conaninfo_paths):
+    """ same as update_package_infos(), also removing the stored information of the packages
+    of the reference that no longer exist
+    :param conaninfo_paths: {package_id: conaninfo.txt path} of all the current packages
+    """
+    cursor.execute("SELECT package_id FROM %s WHERE ref = ?" % INFOS_TABLE, (key, ))
+    remove_package_infos(cursor, key, [package_id for package_id, in cursor.fetchall()
+                                       if package_id not in conaninfo_paths])
+    update_package_infos(cursor, key, conaninfo_paths)
+
+
+def query_package_infos(cursor, key, condition):
+    """ :param condition: (sql, params) compiled by postfix_to_sql()
+    :return: {package_id: serialize_min() dict} of the stored packages of the reference
+             matching the condition
+    """
+    condition, params = condition
+    cursor.execute("SELECT package_id, info FROM %s i WHERE ref = ? AND %s"
+                   % (INFOS_TABLE, condition), [key] + params)
+    return {package_id: json.loads(info) for package_id, info in cursor.fetchall()}
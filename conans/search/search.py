@@ -7,6 +7,7 @@ from conans.errors import ConanException, RecipeNotFoundException
 from conans.model.info import ConanInfo
 from conans.model.ref import ConanFileReference, PackageReference
 from conans.paths import CONANINFO
+from conans.search.packages_index import postfix_to_sql
 from conans.search.query_parse import evaluate_postfix, infix_to_postfix
 from conans.util.files import load
 from conans.util.log import logger
@@ -38,15 +39,19 @@ def filter_by_revision(metadata, packages_infos):
     return ok
 
 
+def _query_postfix(query):
+    if "!" in query:
+        raise ConanException("'!' character is not allowed")
+    if " not " in query or query.startswith("not "):
+        raise ConanException("'not' operator is not allowed")
+    return infix_to_postfix(query) if query else []
+
+
 def filter_packages(query, package_infos):
     if query is None:
         return package_infos
     try:
-        if "!" in query:
-            raise ConanException("'!' character is not allowed")
-        if " not " in query or query.startswith("not "):
-            raise ConanException("'not' operator is not allowed")
-        postfix = infix_to_postfix(query) if query else []
+        postfix = _query_postfix(query)
         result = OrderedDict()
         for package_id, info in package_infos.items():
             if _evaluate_postfix_with_info(postfix, info):
@@ -56,6 +61,15 @@ def filter_packages(query, package_infos):
         raise ConanException("Invalid package query: %s. %s" % (query, exc))
 
 
+def compile_query(query):
+    """ :return: the (sql, params) condition of the query for the packages indexes
+    """
+    try:
+        return postfix_to_sql(_query_postfix(query or ""))
+    except Exception as exc:
+        raise ConanException("Invalid package query: %s. %s" % (query, exc))
+
+
 def _evaluate_postfix_with_info(postfix, conan_vars_info):
 
     # Evaluate conaninfo with the expression
@@ -135,8 +149,34 @@ def search_packages(package_layout, query):
             package_layout.ref.revision and
             package_layout.recipe_revision() != package_layout.ref.revision):
         raise RecipeNotFoundException(package_layout.ref, print_rev=True)
-    infos = _get_local_infos_min(package_layout)
-    return filter_packages(query, infos)
+    index = package_layout.index
+    if index is None:
+        infos = _get_local_infos_min(package_layout)
+        return filter_packages(query, infos)
+
+    condition = compile_query(query)
+    conaninfo_paths = OrderedDict()
+    for package_id in package_layout.package_ids():
+        pref = PackageReference(package_layout.ref, package_id)
+        conaninfo_paths[package_id] = os.path.join(package_layout.package(pref), CONANINFO)
+    infos = index.search_packages(package_layout.ref, conaninfo_paths, condition)
+    result = OrderedDict((package_id, infos[package_id]) for package_id in conaninfo_paths
+                         if package_id in infos)
+    return _filter_recipe_revision(package_layout, result)
+
+
+def _filter_recipe_revision(package_layout, infos):
+    """ when the reference has a revision, removes the packages of other recipe revisions """
+    if not package_layout.ref.revision:
+        return infos
+    metadata = package_layout.load_metadata()
+    result = OrderedDict()
+    for package_id, info in infos.items():
+        recipe_revision = metadata.packages[package_id].recipe_revision
+        if recipe_revision and recipe_revision != package_layout.ref.revision:
+            continue
+        result[package_id] = info
+    return result
 
 
 def _get_local_infos_min(package_layout):
@@ -153,12 +193,7 @@ def _get_local_infos_min(package_layout):
         conan_info_content = load(info_path)
 
         info = ConanInfo.loads(conan_info_content)
-        if package_layout.ref.revision:
-            metadata = package_layout.load_metadata()
-            recipe_revision = metadata.packages[package_id].recipe_revision
-            if recipe_revision and recipe_revision != package_layout.ref.revision:
-                continue
         conan_vars_info = info.serialize_min()
         result[package_id] = conan_vars_info
 
-    return result
+    return _filter_recipe_revision(package_layout, result)
@@ -47,6 +47,7 @@ class ConanServerConfigParser(ConfigParser):
                            "ssl_enabled": get_env("CONAN_SSL_ENABLED", None, environment),
                            "port": get_env("CONAN_SERVER_PORT", None, environment),
                            "public_port": get_env("CONAN_SERVER_PUBLIC_PORT", None, environment),
+                           "threads": get_env("CONAN_SERVER_THREADS", None, environment),
                            "host_name": get_env("CONAN_HOST_NAME", None, environment),
                            "custom_authenticator": get_env("CONAN_CUSTOM_AUTHENTICATOR", None, environment),
                            # "user:pass,user2:pass2"
@@ -96,6 +97,15 @@ class ConanServerConfigParser(ConfigParser):
     def port(self):
         return int(self._get_conf_server_string("port"))
 
+    @property
+    def threads(self):
+        """ number of threads serving the requests, 1 if not defined
+        """
+        try:
+            return int(self._get_conf_server_string("threads"))
+        except ConanException:
+            return 1
+
     @property
     def public_port(self):
         try:
@@ -220,9 +230,9 @@ class ConanServerConfigParser(ConfigParser):
         return timedelta(minutes=float(self._get_conf_server_string("jwt_expire_minutes")))
 
 
-def get_server_store(disk_storage_path, public_url, updown_auth_manager):
+def get_server_store(disk_storage_path, public_url, updown_auth_manager, server_folder=None):
     disk_controller_url = "%s/%s" % (public_url, "files")
     if not updown_auth_manager:
         raise Exception("Updown auth manager needed for disk controller (not s3)")
     adapter = ServerDiskAdapter(disk_controller_url, disk_storage_path, updown_auth_manager)
-    return ServerStore(adapter)
+    return ServerStore(adapter, server_folder)
@@ -9,6 +9,8 @@ ssl_enabled: False
 port: 9300
 # Public port where files will be served. If empty will be used "port"
 public_port:
+# Number of threads serving the requests concurrently, a single thread if not defined
+threads: 8
 host_name: localhost
 
 # Authorize timeout are seconds the client has to upload/download files until authorization expires
@@ -37,11 +37,13 @@ class ServerLauncher(object):
 
         server_store = get_server_store(server_config.disk_storage_path,
                                         server_config.public_url,
-                                        updown_auth_manager=updown_auth_manager)
+                                        updown_auth_manager=updown_auth_manager,
+                                        server_folder=server_config.conan_folder)
 
         server_capabilities = SERVER_CAPABILITIES
         server_capabilities.append(REVISIONS)
 
+        self.threads = server_config.threads
         self.server = ConanServer(server_config.port, credentials_manager, updown_auth_manager,
                                   authorizer, authenticator, server_store,
                                   server_capabilities)
@@ -51,8 +53,9 @@ class ServerLauncher(object):
             print("Storage: %s" % server_config.disk_storage_path)
             print("Public URL: %s" % server_config.public_url)
             print("PORT: %s" % server_config.port)
+            print("Threads: %s" % server_config.threads)
             print("***********************")
 
     def launch(self):
         if not self.force_migration:
-            self.server.run(host="0.0.0.0")
+            self.server.run(host="0.0.0.0", threads=self.threads)
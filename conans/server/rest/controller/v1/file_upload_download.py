@@ -2,10 +2,10 @@ import os
 from unicodedata import normalize
 
 import six
-from bottle import FileUpload, cached_property, request, static_file
+from bottle import FileUpload, cached_property, request
 
 from conans.server.rest.bottle_routes import BottleRoutes
-from conans.server.service.mime import get_mime_type
+from conans.server.service.common.conditional import file_response
 from conans.server.service.v1.upload_download_service import FileUploadDownloadService
 
 
@@ -24,9 +24,7 @@ class FileUploadDownloadController(object):
             token = request.query.get("signature", None)
             file_path = service.get_file_path(the_path, token)
             # https://github.com/kennethreitz/requests/issues/1586
-            return static_file(os.path.basename(file_path),
-                               root=os.path.dirname(file_path),
-                               mimetype=get_mime_type(file_path))
+            return file_response(file_path, app.server_store.get_file_checksum(file_path))
 
         @app.route(r.v1_updown_file, method=["PUT"])
         def put(the_path):
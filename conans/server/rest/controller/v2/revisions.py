@@ -1,6 +1,7 @@
 from conans.model.ref import ConanFileReference
 from conans.server.rest.bottle_routes import BottleRoutes
 from conans.server.rest.controller.v2 import get_package_ref
+from conans.server.service.common.conditional import etag_response
 from conans.server.service.v2.service_v2 import ConanServiceV2
 
 
@@ -20,7 +21,7 @@ class RevisionsController(object):
             conan_reference = ConanFileReference(name, version, username, channel)
             conan_service = ConanServiceV2(app.authorizer, app.server_store)
             revs = conan_service.get_recipe_revisions(conan_reference, auth_user)
-            return _format_revs_return(revs)
+            return etag_response(_format_revs_return(revs))
 
         @app.route(r.recipe_latest, method="GET")
         def get_latest_recipe_revision(name, version, username, channel, auth_user):
@@ -29,7 +30,7 @@ class RevisionsController(object):
             conan_reference = ConanFileReference(name, version, username, channel)
             conan_service = ConanServiceV2(app.authorizer, app.server_store)
             rev = conan_service.get_latest_revision(conan_reference, auth_user)
-            return _format_rev_return(rev)
+            return etag_response(_format_rev_return(rev))
 
         @app.route(r.package_revisions, method="GET")
         def get_package_revisions(name, version, username, channel, package_id, auth_user,
@@ -39,7 +40,7 @@ class RevisionsController(object):
                                                 revision, p_revision=None)
             conan_service = ConanServiceV2(app.authorizer, app.server_store)
             revs = conan_service.get_package_revisions(package_reference, auth_user)
-            return _format_revs_return(revs)
+            return etag_response(_format_revs_return(revs))
 
         @app.route(r.package_revision_latest, method="GET")
         def get_latest_package_revision(name, version, username, channel, package_id, auth_user,
@@ -50,7 +51,7 @@ class RevisionsController(object):
                                                 revision, p_revision=None)
             conan_service = ConanServiceV2(app.authorizer, app.server_store)
             rev = conan_service.get_latest_package_revision(package_reference, auth_user)
-            return _format_rev_return(rev)
+            return etag_response(_format_rev_return(rev))
 
 
 def _format_rev_return(rev):
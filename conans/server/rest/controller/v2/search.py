@@ -2,6 +2,7 @@ from bottle import request
 
 from conans.model.ref import ConanFileReference
 from conans.server.rest.bottle_routes import BottleRoutes
+from conans.server.service.common.conditional import etag_response
 from conans.server.service.common.search import SearchService
 
 
@@ -20,9 +21,15 @@ class SearchControllerV2(object):
             ignore_case = request.params.get("ignorecase", True)
             if isinstance(ignore_case, str):
                 ignore_case = False if 'false' == ignore_case.lower() else True
+            after = request.params.get("after", None)
+            limit = request.params.get("limit", None)
+            limit = int(limit) if limit else None
             search_service = SearchService(app.authorizer, app.server_store, auth_user)
-            references = [repr(ref) for ref in search_service.search(pattern, ignore_case)]
-            return {"results": references}
+            refs, next_page = search_service.search_page(pattern, ignore_case, after, limit)
+            ret = {"results": [repr(ref) for ref in refs]}
+            if next_page:
+                ret["next"] = next_page
+            return etag_response(ret)
 
         @app.route(r.common_search_packages, method=["GET"])
         @app.route(r.common_search_packages_revision, method=["GET"])
@@ -31,4 +38,4 @@ class SearchControllerV2(object):
             search_service = SearchService(app.authorizer, app.server_store, auth_user)
             ref = ConanFileReference(name, version, username, channel, revision)
             info = search_service.search_packages(ref, query)
-            return info
+            return etag_response(info)
@@ -2,6 +2,7 @@ import bottle
 
 from conans.server.rest.api_v1 import ApiV1
 from conans.server.rest.api_v2 import ApiV2
+from conans.server.rest.wsgi_server import ConanWSGIServer
 
 
 class ConanServer(object):
@@ -42,5 +43,6 @@ class ConanServer(object):
         port = kwargs.pop("port", self.run_port)
         debug_set = kwargs.pop("debug", False)
         host = kwargs.pop("host", "localhost")
-        bottle.Bottle.run(self.root_app, host=host,
-                          port=port, debug=debug_set, reloader=False)
+        threads = kwargs.pop("threads", 1)
+        server = ConanWSGIServer(host=host, port=port, threads=threads)
+        bottle.Bottle.run(self.root_app, server=server, debug=debug_set, reloader=False)
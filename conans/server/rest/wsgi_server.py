@@ -0,0 +1,115 @@
+import os
+from multiprocessing.pool import ThreadPool
+from wsgiref.simple_server import ServerHandler, WSGIRequestHandler, WSGIServer
+
+import bottle
+
+from conans.util.log import logger
+
+
+class _SendfileServerHandler(ServerHandler):
+    """ sends the files returned by the application with os.sendfile(), copying them from the
+    file to the socket in the kernel, instead of reading and writing them in chunks
+    """
+
+    def sendfile(self):
+        filelike = getattr(self.result, "filelike", None)
+        if not hasattr(os, "sendfile") or filelike is None:  # Python 2
+            return False
+        try:
+            in_fd = filelike.fileno()
+            offset = filelike.tell()
+        except (AttributeError, IOError, OSError):
+            return False
+        if not self.headers_sent:
+            self.send_headers()
+        self._flush()
+        out_fd = self.request_handler.connection.fileno()
+        while True:
+            sent = os.sendfile(out_fd, in_fd, offset, 1024 * 1024)
+            if sent == 0:
+                break
+            offset += sent
+            self.bytes_sent += sent
+        self.finish_content()
+        return True
+
+
+class _RequestHandler(WSGIRequestHandler):
+
+    def address_string(self):  # Prevent reverse DNS lookups
+        return self.client_address[0]
+
+    def log_request(self, *args, **kwargs):
+        pass
+
+    def handle(self):
+        """ the same as WSGIRequestHandler.handle(), with the handler sending the files with
+        sendfile()
+        """
+        self.raw_requestline = self.rfile.readline(65537)
+        if len(self.raw_requestline) > 65536:
+            self.requestline = ''
+            self.request_version = ''
+            self.command = ''
+            self.send_error(414)
+            return
+
+        if not self.parse_request():  # An error code has been sent, just exit
+            return
+
+        handler = _SendfileServerHandler(self.rfile, self.wfile, self.get_stderr(),
+                                         self.get_environ())
+        handler.request_handler = self
+        handler.run(self.server.get_app())
+
+
+class _WSGIServer(WSGIServer):
+    request_queue_size = 128
+    pool = None
+
+
+class _ThreadPoolWSGIServer(_WSGIServer):
+    """ WSGIServer processing the requests in a pool of threads, so a slow request doesn't
+    block the others
+    """
+
+    def process_request(self, request, client_address):
+        self.pool.apply_async(self._process_request_thread, (request, client_address))
+
+    def _process_request_thread(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+
+class ConanWSGIServer(bottle.ServerAdapter):
+    """ bottle server adapter with a WSGI server of the standard library, serving the requests
+    with a pool of 'threads' threads
+    """
+    _server = None
+
+    def run(self, handler):
+        threads = int(self.options.get("threads") or 1)
+        server_class = _ThreadPoolWSGIServer if threads > 1 else _WSGIServer
+        server = server_class((self.host, self.port), _RequestHandler)
+        server.set_app(handler)
+        if threads > 1:
+            server.pool = ThreadPool(threads)
+        logger.debug("Serving with %s threads" % threads)
+        self._server = server
+        try:
+            server.serve_forever()
+        finally:
+            server.server_close()
+            if server.pool is not None:
+                server.pool.terminate()
+
+    def shutdown(self):
+        """ stops serving, it has to be called from a thread different from the run() one
+        """
+        if self._server is not None:
+            self._server.shutdown()
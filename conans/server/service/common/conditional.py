@@ -0,0 +1,50 @@
+import json
+import os
+from hashlib import sha1
+
+from bottle import HTTPResponse, request, response, static_file
+
+from conans.server.service.mime import get_mime_type
+
+
+def _not_modified(etag):
+    """ raises a 304 response without body if the client already has the resource with that
+    ETag (If-None-Match)
+    """
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match is None:
+        return
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    if etag in tags or "*" in tags:
+        raise HTTPResponse(status=304, headers={"ETag": etag})
+    # If-None-Match takes precedence over If-Modified-Since (RFC 7232, 6)
+    request.environ.pop("HTTP_IF_MODIFIED_SINCE", None)
+
+
+def etag_response(body):
+    """ returns a JSON response with its ETag, or a 304 response without body if the client
+    already has it (If-None-Match), so the clients can revalidate them cheaply
+    """
+    etag = '"%s"' % sha1(json.dumps(body, sort_keys=True).encode()).hexdigest()
+    _not_modified(etag)
+    response.set_header("ETag", etag)
+    return body
+
+
+def file_response(path, checksum):
+    """ the static_file() response of a file of the store, with its checksum as strong ETag,
+    a 304 response if the client already has it (If-None-Match), and the requested Range only
+    if the file is still the one the client started downloading (If-Range)
+    """
+    if checksum is not None:
+        etag = '"%s"' % checksum
+        _not_modified(etag)
+        if_range = request.headers.get("If-Range")
+        if if_range is not None and if_range.strip() != etag:
+            # The file changed (or a date validator, that cannot be strong), the whole file
+            request.environ.pop("HTTP_RANGE", None)
+    ret = static_file(os.path.basename(path), root=os.path.dirname(path),
+                      mimetype=get_mime_type(path))
+    if checksum is not None and ret.status_code in (200, 206):
+        ret.set_header("ETag", etag)
+    return ret
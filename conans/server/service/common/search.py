@@ -1,46 +1,19 @@
 import os
-import re
-from fnmatch import translate
 
-from conans import load
-from conans.errors import NotFoundException, ForbiddenException, RecipeNotFoundException
-from conans.model.info import ConanInfo
-from conans.model.ref import PackageReference, ConanFileReference
-from conans.paths import CONANINFO
-from conans.search.search import filter_packages, _partial_match
-from conans.util.files import list_folder_subdirs
-from conans.util.log import logger
+from conans.errors import ForbiddenException, RecipeNotFoundException
+from conans.search.search import compile_query, filter_packages
 
 
-def _get_local_infos_min(server_store, ref, look_in_all_rrevs):
-
+def _get_local_infos_min(server_store, ref):
+    """ the packages of all the recipe revisions, the one of the latest revision for each
+    package_id
+    """
     result = {}
-    rrevs = server_store.get_recipe_revisions(ref) if look_in_all_rrevs else [None]
-
-    for rrev in rrevs:
-        new_ref = ref.copy_with_rev(rrev.revision) if rrev else ref
-        subdirs = list_folder_subdirs(server_store.packages(new_ref), level=1)
-        for package_id in subdirs:
-            if package_id in result:
-                continue
-            # Read conaninfo
-            try:
-                pref = PackageReference(new_ref, package_id)
-                revision_entry = server_store.get_last_package_revision(pref)
-                if not revision_entry:
-                    raise NotFoundException("")
-                pref = PackageReference(new_ref, package_id, revision_entry.revision)
-                info_path = os.path.join(server_store.package(pref), CONANINFO)
-                if not os.path.exists(info_path):
-                    raise NotFoundException("")
-                conan_info_content = load(info_path)
-                info = ConanInfo.loads(conan_info_content)
-                conan_vars_info = info.serialize_min()
-                result[package_id] = conan_vars_info
-            except Exception as exc:  # FIXME: Too wide
-                logger.error("Package %s has no ConanInfo file" % str(pref))
-                if str(exc):
-                    logger.error(str(exc))
+    for rrev in server_store.get_recipe_revisions(ref):
+        new_ref = ref.copy_with_rev(rrev.revision)
+        infos = server_store.search_index.search_packages(new_ref, compile_query(None))
+        for package_id, info in infos.items():
+            result.setdefault(package_id, info)
     return result
 
 
@@ -61,8 +34,11 @@ def search_packages(server_store, ref, query, look_in_all_rrevs):
 
     if not os.path.exists(server_store.conan_revisions_root(ref.copy_clear_rev())):
         raise RecipeNotFoundException(ref)
-    infos = _get_local_infos_min(server_store, ref, look_in_all_rrevs)
-    return filter_packages(query, infos)
+    if look_in_all_rrevs:
+        # The query applies to the resulting package of each package_id
+        infos = _get_local_infos_min(server_store, ref)
+        return filter_packages(query, infos)
+    return server_store.search_index.search_packages(ref, compile_query(query))
 
 
 class SearchService(object):
@@ -78,30 +54,23 @@ class SearchService(object):
         info = search_packages(self._server_store, reference, query, look_in_all_rrevs)
         return info
 
-    def _search_recipes(self, pattern=None, ignorecase=True):
-        subdirs = list_folder_subdirs(basedir=self._server_store.store, level=5)
-        if not pattern:
-            return sorted([ConanFileReference(*folder.split("/")).copy_clear_rev()
-                           for folder in subdirs])
-        else:
-            # Conan references in main storage
-            pattern = str(pattern)
-            b_pattern = translate(pattern)
-            b_pattern = re.compile(b_pattern, re.IGNORECASE) if ignorecase else re.compile(b_pattern)
-            ret = set()
-            for subdir in subdirs:
-                new_ref = ConanFileReference(*subdir.split("/"))
-                if _partial_match(b_pattern, repr(new_ref)):
-                    ret.add(new_ref.copy_clear_rev())
-
-            return sorted(ret)
-
     def search(self, pattern=None, ignorecase=True):
         """ Get all the info about any package
             Attributes:
                 pattern = wildcards like opencv/*
         """
-        refs = self._search_recipes(pattern, ignorecase)
+        return self.search_page(pattern, ignorecase)[0]
+
+    def search_page(self, pattern=None, ignorecase=True, after=None, limit=None):
+        """ Same as search(), paginated
+            Attributes:
+                after = the 'next' returned by the previous page
+                limit = maximum number of references of the page
+            Returns: (references, next), 'next' is None in the last page
+        """
+        pattern = str(pattern) if pattern else None
+        refs, next_page = self._server_store.search_index.search_recipes(pattern, ignorecase,
+                                                                         after, limit)
         filtered = []
         # Filter out restricted items
         for ref in refs:
@@ -110,4 +79,4 @@ class SearchService(object):
                 filtered.append(ref)
             except ForbiddenException:
                 pass
-        return filtered
+        return filtered, next_page
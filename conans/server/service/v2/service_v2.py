@@ -1,12 +1,16 @@
 import os
+import platform
 
-from bottle import FileUpload, static_file
+from bottle import FileUpload
 
-from conans.errors import RecipeNotFoundException, PackageNotFoundException, NotFoundException
+from conans.errors import RecipeNotFoundException, PackageNotFoundException, NotFoundException, \
+    EXCEPTION_CODE_MAPPING
+from conans.model.ref import ConanFileReference, PackageReference
+from conans.paths import CONANINFO, CONAN_MANIFEST
 from conans.server.service.common.common import CommonService
-from conans.server.service.mime import get_mime_type
+from conans.server.service.common.conditional import file_response
 from conans.server.store.server_store import ServerStore
-from conans.util.files import mkdir
+from conans.util.files import load, mkdir
 
 
 class ConanServiceV2(CommonService):
@@ -32,8 +36,7 @@ class ConanServiceV2(CommonService):
     def get_conanfile_file(self, reference, filename, auth_user):
         self._authorizer.check_read_conan(auth_user, reference)
         path = self._server_store.get_conanfile_file_path(reference, filename)
-        return static_file(os.path.basename(path), root=os.path.dirname(path),
-                           mimetype=get_mime_type(path))
+        return file_response(path, self._server_store.get_file_checksum(path))
 
     def upload_recipe_file(self, body, headers, reference, filename, auth_user):
         self._authorizer.check_write_conan(auth_user, reference)
@@ -44,6 +47,14 @@ class ConanServiceV2(CommonService):
         # If the upload was ok, update the pointer to the latest
         self._server_store.update_last_revision(reference)
 
+    def deploy_recipe_file(self, headers, reference, filename, auth_user):
+        """ same as upload_recipe_file(), with a file already in the server, by its checksum
+        """
+        self._authorizer.check_write_conan(auth_user, reference)
+        path = self._server_store.get_conanfile_file_path(reference, filename)
+        self._deploy_to_path(headers, path)
+        self._server_store.update_last_revision(reference)
+
     def get_recipe_revisions(self, ref, auth_user):
         self._authorizer.check_read_conan(auth_user, ref)
         root = self._server_store.conan_revisions_root(ref.copy_clear_rev())
@@ -86,8 +97,7 @@ class ConanServiceV2(CommonService):
     def get_package_file(self, pref, filename, auth_user):
         self._authorizer.check_read_conan(auth_user, pref.ref)
         path = self._server_store.get_package_file_path(pref, filename)
-        return static_file(os.path.basename(path), root=os.path.dirname(path),
-                           mimetype=get_mime_type(path))
+        return file_response(path, self._server_store.get_file_checksum(path))
 
     def upload_package_file(self, body, headers, pref, filename, auth_user):
         self._authorizer.check_write_conan(auth_user, pref.ref)
@@ -101,16 +111,113 @@ class ConanServiceV2(CommonService):
         self._upload_to_path(body, headers, path)
 
         # If the upload was ok, update the pointer to the latest
+        self._package_file_uploaded(pref, filename)
+
+    def deploy_package_file(self, headers, pref, filename, auth_user):
+        """ same as upload_package_file(), with a file already in the server, by its checksum
+        """
+        self._authorizer.check_write_conan(auth_user, pref.ref)
+        recipe_path = self._server_store.export(pref.ref)
+        if not os.path.exists(recipe_path):
+            raise RecipeNotFoundException(pref.ref)
+        path = self._server_store.get_package_file_path(pref, filename)
+        self._deploy_to_path(headers, path)
+        self._package_file_uploaded(pref, filename)
+
+    def _package_file_uploaded(self, pref, filename):
         self._server_store.update_last_package_revision(pref)
+        if filename == CONANINFO:
+            self._server_store.search_index.update_package(pref)
+
+    # BATCH METHODS
+    def get_batch_metadata(self, queries, auth_user):
+        """ The metadata of many recipes and packages in one request. For every query
+        {"ref": "name/version@user/channel[#rrev]", "packages": ["package_id[#prev]", ...]} returns
+        the revision of the recipe (the latest one if not given), its time and conanmanifest.txt,
+        and for its packages the revision, time, conanmanifest.txt and conaninfo.txt. The missing
+        or forbidden ones are reported in their "error", instead of failing the whole request
+        """
+        return [self._recipe_metadata(query, auth_user) for query in queries]
+
+    def _recipe_metadata(self, query, auth_user):
+        ret = {"ref": query.get("ref")}
+        try:
+            ref = ConanFileReference.loads(query["ref"])
+            self._authorizer.check_read_conan(auth_user, ref)
+            if ref.revision is None:
+                ref, rev_time = self._latest_ref(ref)
+            else:
+                rev_time = self._server_store.get_revision_time(ref)
+            manifest = self._server_store.get_conanfile_file_path(ref, CONAN_MANIFEST)
+            if rev_time is None or not os.path.exists(manifest):
+                raise RecipeNotFoundException(ref, print_rev=True)
+            ret.update({"ref": ref.full_str(), "time": rev_time, "manifest": load(manifest)})
+        except Exception as exc:
+            ret["error"] = _batch_error(exc)
+            return ret
+        ret["packages"] = {package: self._package_metadata(ref, package)
+                           for package in query.get("packages") or []}
+        return ret
+
+    def _latest_ref(self, ref):
+        latest = self._server_store.get_last_revision(ref)
+        if not latest:
+            raise RecipeNotFoundException(ref, print_rev=True)
+        return ref.copy_with_rev(latest.revision), latest.time
+
+    def _package_metadata(self, ref, package):
+        try:
+            package_id, _, prev = package.partition("#")
+            pref = PackageReference(ref, package_id, prev or None)
+            if pref.revision is None:
+                latest = self._server_store.get_last_package_revision(pref)
+                if not latest:
+                    raise PackageNotFoundException(pref, print_rev=True)
+                pref = pref.copy_with_revs(ref.revision, latest.revision)
+                prev_time = latest.time
+            else:
+                prev_time = self._server_store.get_package_revision_time(pref)
+            info = self._server_store.get_package_file_path(pref, CONANINFO)
+            manifest = self._server_store.get_package_file_path(pref, CONAN_MANIFEST)
+            if prev_time is None or not os.path.exists(info) or not os.path.exists(manifest):
+                raise PackageNotFoundException(pref, print_rev=True)
+            return {"revision": pref.revision, "time": prev_time,
+                    "conaninfo": load(info), "manifest": load(manifest)}
+        except Exception as exc:
+            return {"error": _batch_error(exc)}
 
     # Misc
-    @staticmethod
-    def _upload_to_path(body, headers, path):
+    def _deploy_to_path(self, headers, path):
+        sha1 = headers.get("X-Checksum-Sha1")
+        replaced = self._server_store.linked_checksums([path])
+        if not self._server_store.blobs.deploy(sha1, path):
+            raise NotFoundException("There is no file with checksum %s" % sha1)
+        self._server_store.blobs.remove_unreferenced(replaced)
+
+    def _upload_to_path(self, body, headers, path):
         file_saver = FileUpload(body, None,
                                 filename=os.path.basename(path),
                                 headers=headers)
-        if os.path.exists(path):
-            os.unlink(path)
         if not os.path.exists(os.path.dirname(path)):
             mkdir(os.path.dirname(path))
-        file_saver.save(os.path.dirname(path))
+        # Written to a temporary file and renamed, so the concurrent downloads never get an
+        # incomplete file, and a failed upload doesn't leave one
+        tmp_path = "%s.upload" % self._server_store.temp_path()
+        try:
+            file_saver.save(tmp_path)
+            # The blob of a replaced file (a retried or forced upload) can be unreferenced
+            replaced = self._server_store.linked_checksums([path])
+            if os.path.exists(path) and platform.system() == "Windows":
+                os.unlink(path)  # Windows rename doesn't replace
+            os.rename(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+        self._server_store.blobs.store(path)
+        self._server_store.blobs.remove_unreferenced(replaced)
+
+
+def _batch_error(exc):
+    """ the status and message of the response that the single request would have returned
+    """
+    return {"status": EXCEPTION_CODE_MAPPING.get(exc.__class__, 500), "message": str(exc)}
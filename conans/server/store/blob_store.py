@@ -0,0 +1,92 @@
+import errno
+import os
+import re
+import uuid
+
+from conans.util.files import mkdir, sha1sum
+from conans.util.log import logger
+
+BLOBS_FOLDER = "blobs"
+_SHA1_PATTERN = re.compile("^[0-9a-f]{40}$")
+
+
+class BlobStore(object):
+    """ Content addressed storage of the files uploaded to the server, by their sha1. The files
+    of the revision folders are hard links to their blob, so identical files uploaded to
+    different revisions, packages or references are stored once, and they can be deployed to
+    another revision by checksum, without uploading them again.
+
+    The files of the store are never modified in place (uploads replace them), so the blobs
+    are never modified through their links. The blobs of the removed files are removed by
+    remove_unreferenced() when no revision folder links them anymore. If hard links cannot be
+    created (e.g. the store and the blobs folder are in different filesystems), the files are
+    kept only in the revision folders, and they cannot be deployed by checksum
+    """
+
+    def __init__(self, folder, staging_folder):
+        """ :param staging_folder: folder of the temporary links, in the same filesystem as the
+                                   store, so they are never listed as files of a revision
+        """
+        self._folder = folder
+        self._staging_folder = staging_folder
+
+    def _blob_path(self, sha1):
+        return os.path.join(self._folder, sha1[:2], sha1)
+
+    def store(self, path):
+        """ adds the file to the blob store, replacing it with a link to the blob if there was
+        already one with the same contents
+        """
+        sha1 = sha1sum(path)
+        blob_path = self._blob_path(sha1)
+        try:
+            mkdir(os.path.dirname(blob_path))
+            os.link(path, blob_path)
+            return
+        except OSError as e:
+            if e.errno != errno.EEXIST:
+                logger.error("Cannot add %s to the blob store: %s" % (path, str(e)))
+                return
+        self._link(blob_path, path)
+
+    def deploy(self, sha1, path):
+        """ creates the file as a link to the blob with that sha1
+        :return: True if the blob exists, False otherwise
+        """
+        if not sha1 or not _SHA1_PATTERN.match(sha1):
+            return False
+        blob_path = self._blob_path(sha1)
+        if not os.path.exists(blob_path):
+            return False
+        mkdir(os.path.dirname(path))
+        try:
+            self._link(blob_path, path)
+        except OSError as e:  # Removed meanwhile as unreferenced
+            logger.error("Cannot deploy %s from the blob store: %s" % (path, str(e)))
+            return False
+        return True
+
+    def _link(self, blob_path, path):
+        # Linked with a temporary name and renamed, so path is never missing or incomplete
+        mkdir(self._staging_folder)
+        tmp_path = os.path.join(self._staging_folder, "%s.blob" % uuid.uuid4().hex)
+        os.link(blob_path, tmp_path)
+        try:
+            if os.path.exists(path) and os.name == "nt":  # Windows rename doesn't replace
+                os.unlink(path)
+            os.rename(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+
+    def remove_unreferenced(self, sha1s):
+        """ removes the blobs with those sha1s that are no longer linked from any revision
+        folder. Only the blobs of the removed files need to be checked
+        """
+        for sha1 in sha1s:
+            blob_path = self._blob_path(sha1)
+            try:
+                if os.stat(blob_path).st_nlink == 1:
+                    os.unlink(blob_path)
+            except OSError:  # Never stored, or removed meanwhile by another request
+                pass
@@ -1,4 +1,5 @@
 import os
+import threading
 
 import fasteners
 
@@ -18,6 +19,8 @@ class ServerDiskAdapter(object):
         # URLs are generated removing this base path
         self.updown_auth_manager = updown_auth_manager
         self._store_folder = base_storage_path
+        # The interprocess locks don't exclude the threads of the same process
+        self._lock = threading.RLock()
 
     # ONLY USED BY APIV1
     def get_download_urls(self, paths, user=None):
@@ -90,14 +93,23 @@ class ServerDiskAdapter(object):
         return os.path.exists(path)
 
     def read_file(self, path, lock_file):
-        with fasteners.InterProcessLock(lock_file) if lock_file else no_op():
-            with open(path) as f:
-                return f.read()
+        with self._lock:
+            with fasteners.InterProcessLock(lock_file) if lock_file else no_op():
+                with open(path) as f:
+                    return f.read()
 
     def write_file(self, path, contents, lock_file):
-        with fasteners.InterProcessLock(lock_file) if lock_file else no_op():
-            with open(path, "w") as f:
-                f.write(contents)
+        with self._lock:
+            with fasteners.InterProcessLock(lock_file) if lock_file else no_op():
+                with open(path, "w") as f:
+                    f.write(contents)
+
+    @property
+    def lock(self):
+        """ lock of the threads reading and writing files, to hold it across a read and a
+        write of the same file
+        """
+        return self._lock
 
     def base_storage_folder(self):
         return self._store_folder
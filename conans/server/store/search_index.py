@@ -0,0 +1,344 @@
+import os
+import re
+import sqlite3
+import time
+from contextlib import contextmanager
+from fnmatch import translate
+
+from conans.errors import ConanException
+from conans.model.ref import ConanFileReference, PackageReference
+from conans.paths import CONANINFO, PACKAGES_FOLDER
+from conans.search.packages_index import INFOS_TABLE, create_tables, query_package_infos, \
+    remove_package_infos, sync_package_infos, update_package_infos
+from conans.search.search import _partial_match
+from conans.util.files import list_folder_subdirs
+from conans.util.hash_cache import RACY_SECONDS, stat_key
+from conans.util.log import logger
+
+SEARCH_INDEX = "search_index.sqlite"
+RECIPES_TABLE = "recipes"
+REVISIONS_TABLE = "package_revisions"
+FOLDERS_TABLE = "folders"
+INFO_TABLE = "info"
+REF_LEVEL = 4  # The recipe folders are <name>/<version>/<user>/<channel>
+# Greater than any character of a reference, to look up the keys starting with a prefix
+_MAX_CHAR = "\x7f"
+
+
+class ServerSearchIndex(object):
+    """ Index of the settings and options of the latest revision of the binary packages of
+    every recipe revision in the server store, to answer the package searches without parsing
+    the conaninfo.txt of every package, and catalogue of the recipes in the store, sorted and
+    indexed by name, to answer the recipe searches without walking the store.
+
+    It is updated when a conaninfo.txt is uploaded and when packages or recipes are removed.
+    The entries are validated with the stat of the conaninfo.txt files, so the packages
+    modified in other ways (APIv1 uploads, manual changes of the store) are parsed again.
+    The latest revision of every package is stored too, updated when the revisions of a
+    package change, so the searches don't walk the packages folder nor read revisions.txt.
+    The catalogue and the package revisions are built from the store folder the first time
+    they are used, and updated when a recipe or a package revision is uploaded or removed.
+    The recipes added or removed in other ways (restored backups, copies of the store...) are
+    detected before searching with the stat of the folders above the recipe folders: only the
+    folders that changed are listed again
+    """
+
+    def __init__(self, server_store, folder):
+        self._server_store = server_store
+        self._dbfile = os.path.join(folder, SEARCH_INDEX)
+
+    @contextmanager
+    def _connect(self, sync=False):
+        folder = os.path.dirname(self._dbfile)
+        if not os.path.exists(folder):
+            os.makedirs(folder)
+        connection = sqlite3.connect(self._dbfile, timeout=60)
+        connection.text_factory = str
+        try:
+            cursor = connection.cursor()
+            create_tables(cursor)
+            # The key of the recipes is their fields joined by "\0", that sorts like the
+            # references, and the lowercase key is indexed too for the case insensitive searches
+            cursor.execute("CREATE TABLE IF NOT EXISTS %s (key TEXT PRIMARY KEY, lower_key TEXT)"
+                           % RECIPES_TABLE)
+            cursor.execute("CREATE INDEX IF NOT EXISTS %s_lower ON %s (lower_key)"
+                           % (RECIPES_TABLE, RECIPES_TABLE))
+            cursor.execute("CREATE TABLE IF NOT EXISTS %s (name TEXT PRIMARY KEY, value TEXT)"
+                           % INFO_TABLE)
+            cursor.execute("CREATE TABLE IF NOT EXISTS %s (ref TEXT, package_id TEXT, "
+                           "revision TEXT, PRIMARY KEY (ref, package_id))" % REVISIONS_TABLE)
+            cursor.execute("CREATE TABLE IF NOT EXISTS %s (path TEXT PRIMARY KEY, stat TEXT)"
+                           % FOLDERS_TABLE)
+            cursor.execute("SELECT name FROM %s" % INFO_TABLE)
+            built = set(name for name, in cursor.fetchall())
+            if "built" not in built:  # New catalogue, or a previous build didn't finish
+                self._build_recipes(cursor)
+            elif sync:
+                self._sync_recipes(cursor)
+            if "packages_built" not in built:
+                self._build_package_revisions(cursor)
+            yield cursor
+            connection.commit()
+        except sqlite3.Error as e:
+            raise ConanException("Error accessing the search index %s: %s"
+                                 % (self._dbfile, str(e)))
+        finally:
+            connection.close()
+
+    @staticmethod
+    def _key(ref):
+        assert ref.revision is not None, "BUG: server search index needs RREV"
+        return "%s#%s" % (ref.dir_repr(), ref.revision)
+
+    def _conaninfo_paths(self, cursor, ref, package_ids=None):
+        """ :return: {package_id: conaninfo.txt of its latest revision, None if it has none}
+        of the given packages, or of all the packages of the recipe revision if None
+        """
+        key = self._key(ref)
+        if package_ids is None:
+            cursor.execute("SELECT package_id, revision FROM %s WHERE ref = ?"
+                           % REVISIONS_TABLE, (key, ))
+            revisions = dict(cursor.fetchall())
+        else:
+            revisions = {}
+            for package_id in package_ids:
+                cursor.execute("SELECT revision FROM %s WHERE ref = ? AND package_id = ?"
+                               % REVISIONS_TABLE, (key, package_id))
+                row = cursor.fetchone()
+                revisions[package_id] = row[0] if row else None
+        result = {}
+        for package_id, revision in revisions.items():
+            if revision:
+                pref = PackageReference(ref, package_id, revision)
+                result[package_id] = os.path.join(self._server_store.package(pref), CONANINFO)
+            else:
+                result[package_id] = None
+        return result
+
+    def search_packages(self, ref, condition):
+        """ :param condition: the query compiled by compile_query()
+        :return: {package_id: serialize_min() dict} of the packages of the recipe revision
+                 matching the condition
+        """
+        key = self._key(ref)
+        with self._connect() as cursor:
+            conaninfo_paths = self._conaninfo_paths(cursor, ref)
+            sync_package_infos(cursor, key, conaninfo_paths)
+            return query_package_infos(cursor, key, condition)
+
+    def update_package(self, pref):
+        """ stores the information of the latest revision of the package, or removes it if
+        the package has no revisions left
+        """
+        with self._connect() as cursor:
+            conaninfo_paths = self._conaninfo_paths(cursor, pref.ref, [pref.id])
+            update_package_infos(cursor, self._key(pref.ref), conaninfo_paths)
+
+    def set_package_revision(self, pref):
+        """ stores the revision of the package reference as its latest one, or forgets the
+        package if the reference has no revision
+        """
+        key = self._key(pref.ref)
+        with self._connect() as cursor:
+            if pref.revision:
+                cursor.execute("INSERT OR REPLACE INTO %s (ref, package_id, revision) "
+                               "VALUES (?, ?, ?)" % REVISIONS_TABLE, (key, pref.id, pref.revision))
+            else:
+                cursor.execute("DELETE FROM %s WHERE ref = ? AND package_id = ?"
+                               % REVISIONS_TABLE, (key, pref.id))
+
+    def remove(self, ref, package_ids=None):
+        """ removes the information of the given packages of the recipe revision, of all of
+        them if package_ids is None, or of all the recipe revisions if the reference has none
+        """
+        with self._connect() as cursor:
+            if ref.revision:
+                key = self._key(ref)
+                remove_package_infos(cursor, key, package_ids)
+                if package_ids is None:
+                    cursor.execute("DELETE FROM %s WHERE ref = ?" % REVISIONS_TABLE, (key, ))
+                else:
+                    cursor.executemany("DELETE FROM %s WHERE ref = ? AND package_id = ?"
+                                       % REVISIONS_TABLE,
+                                       [(key, package_id) for package_id in package_ids])
+                return
+            # The keys of all the revisions sort between "<ref>#" and "<ref>$"
+            prefix = "%s#" % ref.dir_repr()
+            cursor.execute("SELECT DISTINCT ref FROM %s WHERE ref >= ? AND ref < ?"
+                           % INFOS_TABLE, (prefix, prefix[:-1] + "$"))
+            for key, in cursor.fetchall():
+                remove_package_infos(cursor, key)
+            cursor.execute("DELETE FROM %s WHERE ref >= ? AND ref < ?" % REVISIONS_TABLE,
+                           (prefix, prefix[:-1] + "$"))
+
+    @staticmethod
+    def _recipe_key(dir_repr):
+        return "\0".join(dir_repr.split("/"))
+
+    def _stat(self, path):
+        """ :return: the stat key of a folder of the store, as stored in the catalogue, None if
+                 it doesn't exist or it was modified too recently to trust it
+        """
+        try:
+            key = stat_key(os.path.join(self._server_store.store, path))
+        except OSError:
+            return None
+        if key[1] > (time.time() - RACY_SECONDS) * 1000000000:
+            return None
+        return ",".join(str(v) for v in key)
+
+    @staticmethod
+    def _folders_under(cursor, path):
+        """ :return: the catalogued folders under a relative folder of the store, all of them
+                 for the store folder ("")
+        """
+        if not path:
+            cursor.execute("SELECT path FROM %s" % FOLDERS_TABLE)
+        else:  # The paths inside "path/" sort between "path/" and "path0"
+            cursor.execute("SELECT path FROM %s WHERE path >= ? AND path < ?" % FOLDERS_TABLE,
+                           (path + "/", path + "0"))
+        return [row[0] for row in cursor.fetchall()]
+
+    def _recipes_under(self, cursor, path):
+        """ :return: the keys of the recipes under a relative folder of the store
+        """
+        # The keys inside sort between "path\0" and "path\x01"
+        prefix = self._recipe_key(path) + "\0"
+        cursor.execute("SELECT key FROM %s WHERE key >= ? AND key < ?" % RECIPES_TABLE,
+                       (prefix, prefix[:-1] + "\x01"))
+        return [row[0] for row in cursor.fetchall()]
+
+    def _sync_folder(self, cursor, path):
+        """ lists again a folder above the recipe folders, cataloguing the recipes with some
+        revision under its new subfolders and removing the ones under its missing subfolders
+        :param path: relative path of the folder, "" for the store folder
+        """
+        level = path.count("/") + 1 if path else 0
+        abs_path = os.path.join(self._server_store.store, path)
+        try:
+            current = set(name for name in os.listdir(abs_path)
+                          if os.path.isdir(os.path.join(abs_path, name)))
+        except OSError:  # Removed, it will be removed from its parent
+            current = set()
+        prefix = path + "/" if path else ""
+        if level + 1 == REF_LEVEL:
+            known = set(key.rsplit("\0", 1)[1] for key in self._recipes_under(cursor, path))
+        else:
+            known = set(p[len(prefix):] for p in self._folders_under(cursor, path)
+                        if p and p.count("/") == level)
+
+        for name in known - current:
+            removed = prefix + name
+            keys = [self._recipe_key(removed)] if level + 1 == REF_LEVEL else \
+                self._recipes_under(cursor, removed)
+            cursor.executemany("DELETE FROM %s WHERE key = ?" % RECIPES_TABLE,
+                               [(key, ) for key in keys])
+            for folder in self._folders_under(cursor, removed) + [removed]:
+                cursor.execute("DELETE FROM %s WHERE path = ?" % FOLDERS_TABLE, (folder, ))
+        for name in current - known:
+            added = prefix + name
+            if level + 1 != REF_LEVEL:
+                self._sync_folder(cursor, added)
+            elif list_folder_subdirs(basedir=os.path.join(abs_path, name), level=1):
+                key = self._recipe_key(added)
+                cursor.execute("INSERT OR IGNORE INTO %s (key, lower_key) VALUES (?, ?)"
+                               % RECIPES_TABLE, (key, key.lower()))
+
+        cursor.execute("INSERT OR REPLACE INTO %s (path, stat) VALUES (?, ?)" % FOLDERS_TABLE,
+                       (path, self._stat(path)))
+
+    def _sync_recipes(self, cursor):
+        """ updates the catalogue with the recipes added or removed from the store folder in
+        other ways: the folders whose stat changed are listed again
+        """
+        cursor.execute("SELECT path, stat FROM %s" % FOLDERS_TABLE)
+        folders = dict(cursor.fetchall())
+        folders.setdefault("", None)  # The store folder itself
+        changed = [path for path, stat in folders.items()
+                   if stat is None or self._stat(path) != stat]
+        # The parents first, the folders removed from them don't need to be listed
+        for path in sorted(changed, key=lambda p: p.count("/") + 1 if p else 0):
+            cursor.execute("SELECT 1 FROM %s WHERE path = ?" % FOLDERS_TABLE, (path, ))
+            if not path or cursor.fetchone():
+                self._sync_folder(cursor, path)
+
+    def _build_recipes(self, cursor):
+        """ catalogues all the recipes with some revision in the store folder, in the same
+        transaction, so concurrent processes never see a partial catalogue
+        """
+        cursor.execute("DELETE FROM %s" % RECIPES_TABLE)
+        cursor.execute("DELETE FROM %s" % FOLDERS_TABLE)
+        self._sync_recipes(cursor)
+        cursor.execute("INSERT OR REPLACE INTO %s (name, value) VALUES ('built', ?)"
+                       % INFO_TABLE, (str(time.time()), ))
+
+    def _build_package_revisions(self, cursor):
+        """ stores the latest revision of every package in the store folder, read from their
+        revisions.txt, only the first time the index is used
+        """
+        cursor.execute("DELETE FROM %s" % REVISIONS_TABLE)
+        rows = []
+        for folder in list_folder_subdirs(basedir=self._server_store.store, level=7):
+            parts = folder.split("/")
+            if parts[5] != PACKAGES_FOLDER:
+                continue
+            ref = ConanFileReference.load_dir_repr("/".join(parts[:4])).copy_with_rev(parts[4])
+            pref = PackageReference(ref, parts[6])
+            try:
+                revision_entry = self._server_store.get_last_package_revision(pref)
+            except Exception as exc:
+                logger.error("Package %s has no valid revisions: %s" % (str(pref), str(exc)))
+                continue
+            if revision_entry:
+                rows.append((self._key(ref), pref.id, revision_entry.revision))
+        cursor.executemany("INSERT INTO %s (ref, package_id, revision) VALUES (?, ?, ?)"
+                           % REVISIONS_TABLE, rows)
+        cursor.execute("INSERT OR REPLACE INTO %s (name, value) VALUES ('packages_built', ?)"
+                       % INFO_TABLE, (str(time.time()), ))
+
+    def add_recipe(self, ref):
+        key = self._recipe_key(ref.dir_repr())
+        with self._connect() as cursor:
+            cursor.execute("INSERT OR IGNORE INTO %s (key, lower_key) VALUES (?, ?)"
+                           % RECIPES_TABLE, (key, key.lower()))
+
+    def remove_recipe(self, ref):
+        with self._connect() as cursor:
+            cursor.execute("DELETE FROM %s WHERE key = ?" % RECIPES_TABLE,
+                           (self._recipe_key(ref.dir_repr()), ))
+
+    def search_recipes(self, pattern=None, ignorecase=True, after=None, limit=None):
+        """ the recipes matching a fnmatch pattern, sorted. Only the recipes starting with the
+        literal prefix of the pattern are evaluated, using the index
+        :param after: returns only the recipes after this one, the 'next' of a previous page
+        :param limit: maximum number of recipes to return
+        :return: ([ConanFileReference], next) where 'next' is None if there are no more recipes
+        """
+        conditions, params = [], []
+        column = "key"
+        if pattern:
+            prefix = re.split(r"[*?\[]", pattern, 1)[0]
+            # The separators of the reference are the ones of the key
+            prefix = self._recipe_key(prefix.replace("@", "/"))
+            if ignorecase:
+                column, prefix = "lower_key", prefix.lower()
+            if prefix:
+                conditions.append("%s >= ? AND %s < ?" % (column, column))
+                params.extend([prefix, prefix + _MAX_CHAR])
+            regex = re.compile(translate(pattern), re.IGNORECASE if ignorecase else 0)
+        if after:
+            conditions.append("key > ?")
+            params.append(self._recipe_key(after))
+        where = "WHERE %s" % " AND ".join(conditions) if conditions else ""
+
+        result = []
+        with self._connect(sync=True) as cursor:
+            cursor.execute("SELECT key FROM %s %s ORDER BY key" % (RECIPES_TABLE, where), params)
+            for key, in cursor:
+                ref = ConanFileReference(*key.split("\0"))
+                if pattern and not _partial_match(regex, repr(ref)):
+                    continue
+                if limit is not None and len(result) == limit:
+                    return result, result[-1].dir_repr()
+                result.append(ref)
+        return result, None
@@ -1,4 +1,5 @@
 import os
+import uuid
 from os.path import join, normpath, relpath
 
 from conans import DEFAULT_REVISION_V1
@@ -6,15 +7,30 @@ from conans.errors import ConanException, PackageNotFoundException, RecipeNotFou
 from conans.model.ref import ConanFileReference, PackageReference
 from conans.paths import EXPORT_FOLDER, PACKAGES_FOLDER
 from conans.server.revision_list import RevisionList
+from conans.server.store.blob_store import BLOBS_FOLDER, BlobStore
+from conans.server.store.search_index import ServerSearchIndex
+from conans.util.files import list_folder_subdirs, mkdir, sha1sum
+from conans.util.hash_cache import FileHashCache, stat_key
 
 REVISIONS_FILE = "revisions.txt"
+FILE_HASHES = "file_hashes.sqlite"
+STAGING_FOLDER = ".staging"  # Next to the store folder, "data.staging"
 
 
 class ServerStore(object):
 
-    def __init__(self, storage_adapter):
+    def __init__(self, storage_adapter, server_folder=None):
+        """ :param server_folder: folder of the search index, the blob store and the checksums
+                                  of the files, the store folder by default
+        """
         self._storage_adapter = storage_adapter
         self._store_folder = storage_adapter._store_folder
+        server_folder = server_folder or self._store_folder
+        # The temporary files are renamed into the store, so they must be in its filesystem
+        self._staging_folder = normpath(self._store_folder) + STAGING_FOLDER
+        self.search_index = ServerSearchIndex(self, server_folder)
+        self.blobs = BlobStore(join(server_folder, BLOBS_FOLDER), self._staging_folder)
+        self._file_hashes = FileHashCache(join(server_folder, FILE_HASHES))
 
     @property
     def store(self):
@@ -61,6 +77,38 @@ class ServerStore(object):
     def path_exists(self, path):
         return self._storage_adapter.path_exists(path)
 
+    def temp_path(self):
+        """ a new path to write a file before renaming it to its path in the store, outside the
+        revision folders, so the incomplete files are never listed
+        """
+        mkdir(self._staging_folder)
+        return join(self._staging_folder, uuid.uuid4().hex)
+
+    def get_file_checksum(self, path):
+        """ the sha1 of a file of the store, stored with the ones of the other files of its
+        folder, so it is computed only once while the file doesn't change
+        :return: the sha1, or None if the file doesn't exist
+        """
+        if not os.path.isfile(path):
+            return None
+        folder = os.path.dirname(path)
+        keys = {}
+        for filename in os.listdir(folder):
+            file_path = join(folder, filename)
+            try:
+                if os.path.isfile(file_path):
+                    keys[file_path] = stat_key(file_path)
+            except OSError:  # Removed meanwhile
+                pass
+        if path not in keys:
+            return None
+        checksum = self._file_hashes.folder_hashes(folder, keys).get(path)
+        if checksum is None:
+            checksum = sha1sum(path)
+            if stat_key(path) == keys[path]:  # Not replaced while it was being hashed
+                self._file_hashes.update_folder(folder, keys, {path: checksum})
+        return checksum
+
     # ############ SNAPSHOTS (APIv1)
     def get_recipe_snapshot(self, ref):
         """Returns a {filepath: md5} """
@@ -111,56 +159,115 @@ class ServerStore(object):
                     break  # not empty
             ref_path = os.path.dirname(ref_path)
 
+    def linked_checksums(self, paths):
+        """ the sha1 of the files, or of the files inside the folders, that are linked from the
+        blob store, computed before removing or replacing them, so only their blobs are checked
+        afterwards
+        """
+        result = set()
+        for path in paths:
+            if os.path.isfile(path):
+                folder, walk = os.path.dirname(path), [(os.path.dirname(path), [path])]
+            else:
+                folder, walk = path, ((root, [join(root, f) for f in files])
+                                      for root, _, files in os.walk(path))
+            keys = {}
+            for _, file_paths in walk:
+                for file_path in file_paths:
+                    try:
+                        if os.stat(file_path).st_nlink > 1:
+                            keys[file_path] = stat_key(file_path)
+                    except OSError:  # Removed meanwhile
+                        pass
+            checksums = self._file_hashes.folder_hashes(folder, keys)
+            for file_path in keys:
+                checksum = checksums.get(file_path)
+                if checksum is None:
+                    try:
+                        checksum = sha1sum(file_path)
+                    except (IOError, OSError):
+                        continue
+                result.add(checksum)
+        return result
+
     # ######### DELETE (APIv1 and APIv2)
     def remove_conanfile(self, ref):
         assert isinstance(ref, ConanFileReference)
         if not ref.revision:
-            self._storage_adapter.delete_folder(self.conan_revisions_root(ref))
+            removed_folder = self.conan_revisions_root(ref)
+            checksums = self.linked_checksums([removed_folder])
+            self._storage_adapter.delete_folder(removed_folder)
         else:
-            self._storage_adapter.delete_folder(self.base_folder(ref))
+            removed_folder = self.base_folder(ref)
+            checksums = self.linked_checksums([removed_folder])
+            self._storage_adapter.delete_folder(removed_folder)
             self._remove_revision_from_index(ref)
+        self._file_hashes.remove([removed_folder])
+        self.search_index.remove(ref)
         self._delete_empty_dirs(ref)
+        if not list_folder_subdirs(self.conan_revisions_root(ref.copy_clear_rev()), level=1):
+            self.search_index.remove_recipe(ref)
+        self.blobs.remove_unreferenced(checksums)
 
     def remove_packages(self, ref, package_ids_filter):
         assert isinstance(ref, ConanFileReference)
         assert isinstance(package_ids_filter, list)
 
         if not package_ids_filter:  # Remove all packages
-            packages_folder = self.packages(ref)
-            self._storage_adapter.delete_folder(packages_folder)
+            removed_folders = [self.packages(ref)]
         else:
-            for package_id in package_ids_filter:
-                pref = PackageReference(ref, package_id)
-                # Remove all package revisions
-                package_folder = self.package_revisions_root(pref)
-                self._storage_adapter.delete_folder(package_folder)
+            # Remove all package revisions
+            removed_folders = [self.package_revisions_root(PackageReference(ref, package_id))
+                               for package_id in package_ids_filter]
+        checksums = self.linked_checksums(removed_folders)
+        for folder in removed_folders:
+            self._storage_adapter.delete_folder(folder)
+        self._file_hashes.remove(removed_folders)
+        self.search_index.remove(ref, package_ids_filter or None)
         self._delete_empty_dirs(ref)
+        self.blobs.remove_unreferenced(checksums)
 
     def remove_package(self, pref):
         assert isinstance(pref, PackageReference)
         assert pref.revision is not None, "BUG: server store needs PREV remove_package"
         assert pref.ref.revision is not None, "BUG: server store needs RREV remove_package"
         package_folder = self.package(pref)
+        checksums = self.linked_checksums([package_folder])
         self._storage_adapter.delete_folder(package_folder)
-        self._remove_package_revision_from_index(pref)
+        self._file_hashes.remove([package_folder])
+        latest = self._remove_package_revision_from_index(pref)
+        latest_pref = pref.copy_with_revs(pref.ref.revision, latest.revision if latest else None)
+        self.search_index.set_package_revision(latest_pref)
+        self.search_index.update_package(latest_pref)
+        self.blobs.remove_unreferenced(checksums)
 
     def remove_all_packages(self, ref):
         assert ref.revision is not None, "BUG: server store needs RREV remove_all_packages"
         assert isinstance(ref, ConanFileReference)
         packages_folder = self.packages(ref)
+        checksums = self.linked_checksums([packages_folder])
         self._storage_adapter.delete_folder(packages_folder)
+        self._file_hashes.remove([packages_folder])
+        self.search_index.remove(ref)
+        self.blobs.remove_unreferenced(checksums)
 
     def remove_conanfile_files(self, ref, files):
         subpath = self.export(ref)
-        for filepath in files:
-            path = join(subpath, filepath)
+        paths = [join(subpath, filepath) for filepath in files]
+        checksums = self.linked_checksums(paths)
+        for path in paths:
             self._storage_adapter.delete_file(path)
+        self._file_hashes.remove(paths)
+        self.blobs.remove_unreferenced(checksums)
 
     def remove_package_files(self, pref, files):
         subpath = self.package(pref)
-        for filepath in files:
-            path = join(subpath, filepath)
+        paths = [join(subpath, filepath) for filepath in files]
+        checksums = self.linked_checksums(paths)
+        for path in paths:
             self._storage_adapter.delete_file(path)
+        self._file_hashes.remove(paths)
+        self.blobs.remove_unreferenced(checksums)
 
     # ONLY APIv1 URLS
     # ############ DOWNLOAD URLS
@@ -247,24 +354,27 @@ class ServerStore(object):
         assert(isinstance(ref, ConanFileReference))
         rev_file_path = self._recipe_revisions_file(ref)
         self._update_last_revision(rev_file_path, ref)
+        self.search_index.add_recipe(ref)
 
     def update_last_package_revision(self, pref):
         assert(isinstance(pref, PackageReference))
         rev_file_path = self._package_revisions_file(pref)
         self._update_last_revision(rev_file_path, pref)
+        self.search_index.set_package_revision(pref)
 
     def _update_last_revision(self, rev_file_path, ref):
-        if self._storage_adapter.path_exists(rev_file_path):
-            rev_file = self._storage_adapter.read_file(rev_file_path,
-                                                       lock_file=rev_file_path + ".lock")
-            rev_list = RevisionList.loads(rev_file)
-        else:
-            rev_list = RevisionList()
-        if ref.revision is None:
-            raise ConanException("Invalid revision for: %s" % ref.full_str())
-        rev_list.add_revision(ref.revision)
-        self._storage_adapter.write_file(rev_file_path, rev_list.dumps(),
-                                         lock_file=rev_file_path + ".lock")
+        with self._storage_adapter.lock:
+            if self._storage_adapter.path_exists(rev_file_path):
+                rev_file = self._storage_adapter.read_file(rev_file_path,
+                                                           lock_file=rev_file_path + ".lock")
+                rev_list = RevisionList.loads(rev_file)
+            else:
+                rev_list = RevisionList()
+            if ref.revision is None:
+                raise ConanException("Invalid revision for: %s" % ref.full_str())
+            rev_list.add_revision(ref.revision)
+            self._storage_adapter.write_file(rev_file_path, rev_list.dumps(),
+                                             lock_file=rev_file_path + ".lock")
 
     def get_package_revisions(self, pref):
         """Returns a RevisionList"""
@@ -330,14 +440,17 @@ class ServerStore(object):
         return rev_list.get_time(pref.revision)
 
     def _remove_revision_from_index(self, ref):
-        rev_list = self._load_revision_list(ref)
-        rev_list.remove_revision(ref.revision)
-        self._save_revision_list(rev_list, ref)
+        with self._storage_adapter.lock:
+            rev_list = self._load_revision_list(ref)
+            rev_list.remove_revision(ref.revision)
+            self._save_revision_list(rev_list, ref)
 
     def _remove_package_revision_from_index(self, pref):
-        rev_list = self._load_package_revision_list(pref)
-        rev_list.remove_revision(pref.revision)
-        self._save_package_revision_list(rev_list, pref)
+        with self._storage_adapter.lock:
+            rev_list = self._load_package_revision_list(pref)
+            rev_list.remove_revision(pref.revision)
+            self._save_package_revision_list(rev_list, pref)
+            return rev_list.latest_revision()
 
     def _load_revision_list(self, ref):
         path = self._recipe_revisions_file(ref)
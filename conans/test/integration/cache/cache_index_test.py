@@ -0,0 +1,96 @@
+import os
+import sqlite3
+import time
+import unittest
+
+from mock import patch
+
+from conans.client.cache.cache_index import CACHE_INDEX, CacheIndex
+from conans.model.package_metadata import PackageMetadata
+from conans.model.ref import ConanFileReference, PackageReference
+from conans.test.assets.genconanfile import GenConanfile
+from conans.test.utils.tools import NO_SETTINGS_PACKAGE_ID, TestClient
+from conans.util.files import rmdir, save
+
+
+class CacheIndexTest(unittest.TestCase):
+
+    def test_index_updated(self):
+        client = TestClient(default_server_user=True)
+        client.save({"conanfile.py": GenConanfile()})
+        client.run("create . pkg/0.1@user/testing")
+        client.run("export . pkg/0.2@")
+        ref = ConanFileReference.loads("pkg/0.1@user/testing")
+        self.assertEqual(["pkg/0.1@user/testing", "pkg/0.2"],
+                         sorted(str(r) for r in client.cache.all_refs()))
+
+        client.run("upload pkg/0.1@user/testing --all")
+        self.assertEqual({ref: "default"}, client.cache.registry.refs_list)
+        self.assertEqual({PackageReference(ref, NO_SETTINGS_PACKAGE_ID): "default"},
+                         client.cache.registry.prefs_list)
+
+        client.run("remove pkg/0.1@user/testing -p %s -f" % NO_SETTINGS_PACKAGE_ID)
+        self.assertEqual({}, client.cache.registry.prefs_list)
+        client.run("remove pkg/0.1@user/testing -f")
+        self.assertEqual({}, client.cache.registry.refs_list)
+        client.run("search")
+        self.assertNotIn("pkg/0.1@user/testing", client.out)
+        self.assertIn("pkg/0.2", client.out)
+
+        # The changes of other tools, Conan versions or homes sharing the storage are detected
+        client.run("install pkg/0.1@user/testing")
+        save(os.path.join(client.cache.store, "other", "1.0", "_", "_", "metadata.json"),
+             PackageMetadata().dumps())
+        rmdir(client.cache.package_layout(ConanFileReference.loads("pkg/0.2")).base_folder())
+        client.run("search")
+        self.assertIn("pkg/0.1@user/testing", client.out)
+        self.assertIn("other/1.0", client.out)
+        self.assertNotIn("pkg/0.2", client.out)
+        self.assertEqual({ref: "default"}, client.cache.registry.refs_list)
+        client.run("cache reindex")
+        self.assertIn("Indexed 2 references", client.out)
+
+    def test_storage_changes_detected(self):
+        # The stat of the folders and metadata files are trusted right after writing them
+        with patch("conans.client.cache.cache_index.RACY_SECONDS", -1):
+            client = TestClient()
+            client.save({"conanfile.py": GenConanfile()})
+            client.run("export . pkg/0.1@user/testing")
+            client.run("export . pkg/0.2@")
+            self.assertEqual(2, len(client.cache.all_refs()))
+            self.assertTrue(os.path.exists(os.path.join(client.cache.cache_folder, CACHE_INDEX)))
+
+            time.sleep(0.1)  # The resolution of the folder timestamps
+            ref = ConanFileReference.loads("pkg/0.1@user/testing")
+            layout = client.cache.package_layout(ref)
+            metadata = layout.load_metadata()
+            metadata.recipe.remote = "myremote"
+            save(layout.package_metadata(), metadata.dumps())
+            # Only the parent folder of the new reference changes
+            save(os.path.join(client.cache.store, "pkg", "0.1", "user", "stable",
+                              "metadata.json"), PackageMetadata().dumps())
+            self.assertEqual({ref: "myremote"}, client.cache.registry.refs_list)
+            self.assertEqual(["pkg/0.1@user/stable", "pkg/0.1@user/testing", "pkg/0.2"],
+                             sorted(str(r) for r in client.cache.all_refs()))
+
+            time.sleep(0.1)
+            rmdir(os.path.join(client.cache.store, "pkg", "0.1"))
+            self.assertEqual(["pkg/0.2"], [str(r) for r in client.cache.all_refs()])
+
+    def test_update_errors(self):
+        client = TestClient()
+        client.save({"conanfile.py": GenConanfile()})
+        client.run("export . pkg/0.1@")
+        client.run("export . pkg/0.2@")
+        self.assertEqual(2, len(client.cache.all_refs()))
+        # The index is only an optimization, the errors updating it don't fail the commands
+        error = sqlite3.OperationalError("database is locked")
+        ref = ConanFileReference.loads("pkg/0.2")
+        with patch.object(CacheIndex, "_save", side_effect=error):
+            with client.cache.package_layout(ref).update_metadata() as metadata:
+                metadata.recipe.remote = "myremote"
+        with patch.object(CacheIndex, "_remove", side_effect=error):
+            client.run("remove pkg/0.1@ -f")
+        # It is built again
+        self.assertEqual([ref], client.cache.all_refs())
+        self.assertEqual({ref: "myremote"}, client.cache.registry.refs_list)
@@ -1,16 +1,23 @@
+import hashlib
 import os
+import sqlite3
+import stat
 import textwrap
 import time
 import unittest
 from collections import Counter
+from datetime import timedelta
 from threading import Thread
 
 from bottle import static_file, request
+from mock import patch
 import pytest
 
 from conans.client.downloaders.cached_file_downloader import CachedFileDownloader
+from conans.model.ref import ConanFileReference, PackageReference
+from conans.test.assets.genconanfile import GenConanfile
 from conans.test.utils.test_files import temp_folder
-from conans.test.utils.tools import TestClient, StoppableThreadBottle
+from conans.test.utils.tools import NO_SETTINGS_PACKAGE_ID, TestClient, StoppableThreadBottle
 from conans.util.env_reader import get_env
 from conans.util.files import load, save
 
@@ -38,8 +45,8 @@ class DownloadCacheTest(unittest.TestCase):
         client.run("install mypkg/0.1@user/testing")
         content = load(log_trace_file)
         self.assertEqual(6, content.count('"_action": "DOWNLOAD"'))
-        # 6 files cached, plus "locks" folder = 7
-        self.assertEqual(7, len(os.listdir(cache_folder)))
+        # 6 files cached, plus "locks" folder and "index.sqlite" = 8
+        self.assertEqual(8, len(os.listdir(cache_folder)))
 
         os.remove(log_trace_file)
         client.run("remove * -f")
@@ -147,8 +154,8 @@ class DownloadCacheTest(unittest.TestCase):
         self.assertTrue(os.path.exists(local_path2))
         self.assertEqual("some query", client.load("myfile2.txt"))
 
-        # 2 files cached, plus "locks" folder = 3
-        self.assertEqual(3, len(os.listdir(cache_folder)))
+        # 2 files cached, plus "locks" folder and "index.sqlite" = 4
+        self.assertEqual(4, len(os.listdir(cache_folder)))
 
         # remove remote file
         os.remove(file_path)
@@ -169,6 +176,64 @@ class DownloadCacheTest(unittest.TestCase):
         self.assertIn("ERROR: conanfile.py: Error in source() method, line 7", client.out)
         self.assertIn("Not found: http://localhost", client.out)
 
+    def test_cache_clean(self):
+        client = TestClient(default_server_user=True)
+        client.run("cache clean", assert_error=True)
+        self.assertIn("ERROR: There is no 'storage.download_cache' defined", client.out)
+
+        client.save({"conanfile.py": GenConanfile().with_package_file("header.h", "header")})
+        client.run("create . mypkg/0.1@user/testing")
+        client.run("upload * --all --confirm")
+        cache_folder = temp_folder()
+        client.run('config set storage.download_cache="%s"' % cache_folder)
+        client.run("remove * -f")
+        client.run("install mypkg/0.1@user/testing")
+        client.run("remove * -f")
+        client.run("install mypkg/0.1@user/testing")
+
+        client.run("cache clean --max-size=1GB --max-age=30d")
+        self.assertIn("Download cache: 7 hits, 5 misses (58.3% hit rate)", client.out)
+        self.assertIn("Removed 0 files, 0 bytes reclaimed", client.out)
+        client.run("cache clean")
+        self.assertIn("Removed 5 files", client.out)
+        self.assertEqual(["index.sqlite", "locks"], sorted(os.listdir(cache_folder)))
+
+        client.run("cache clean --max-size=1ZB", assert_error=True)
+        self.assertIn("ERROR: Incorrect size definition: 1ZB", client.out)
+
+    def test_max_size_eviction(self):
+        client = TestClient(default_server_user=True)
+        client.save({"conanfile.py": GenConanfile().with_package_file("header.h", "header")})
+        client.run("create . mypkg/0.1@user/testing")
+        client.run("upload * --all --confirm")
+        cache_folder = temp_folder()
+        client.run('config set storage.download_cache="%s"' % cache_folder)
+        client.run("config set storage.download_cache_max_size=0")
+        client.run("remove * -f")
+        client.run("install mypkg/0.1@user/testing")
+        # Every new download evicts the previous ones, the install still works
+        self.assertEqual(["index.sqlite", "locks"], sorted(os.listdir(cache_folder)))
+
+    def test_download_links(self):
+        client = TestClient(default_server_user=True)
+        client.save({"conanfile.py": GenConanfile().with_package_file("header.h", "header")})
+        client.run("create . mypkg/0.1@user/testing")
+        client.run("upload * --all --confirm")
+        cache_folder = temp_folder()
+        client.run('config set storage.download_cache="%s"' % cache_folder)
+        client.run("config set storage.download_cache_links=True")
+        for _ in range(2):
+            client.run("remove * -f")
+            client.run("install mypkg/0.1@user/testing")
+            layout = client.cache.package_layout(ConanFileReference.loads("mypkg/0.1@user/testing"))
+            pref = PackageReference(layout.ref, NO_SETTINGS_PACKAGE_ID)
+            self.assertEqual("header", load(os.path.join(layout.package(pref), "header.h")))
+        for f in os.listdir(cache_folder):
+            if f not in ("locks", "index.sqlite"):
+                self.assertFalse(os.stat(os.path.join(cache_folder, f)).st_mode & stat.S_IWRITE)
+        client.run("cache clean")
+        self.assertIn("Removed 5 files", client.out)
+
     @pytest.mark.skipif(get_env("TESTING_REVISIONS_ENABLED", False), reason="Hybrid test with both v1 and v2")
     def test_revision0_v2_skip(self):
         client = TestClient(default_server_user=True)
@@ -285,3 +350,79 @@ class CachedDownloaderUnitTest(unittest.TestCase):
         self.cached_downloader.download("testurl", file_path)
         self.assertEqual(self.file_downloader.calls["testurl"], 1)
         self.assertEqual("testurl", load(file_path))
+
+    def test_evict_least_recently_used(self):
+        self.cached_downloader.download("testurl1")
+        self.cached_downloader.download("testurl2")
+        self.cached_downloader.download("testurl1")  # now testurl2 is the least recently used
+        self.assertEqual((1, 2), self.cached_downloader.stats())
+
+        removed, reclaimed = self.cached_downloader.evict(max_size=len("testurl1"))
+        self.assertEqual((1, len("testurl2")), (removed, reclaimed))
+        self.cached_downloader.download("testurl1")
+        self.cached_downloader.download("testurl2")
+        self.assertEqual(self.file_downloader.calls["testurl1"], 1)
+        self.assertEqual(self.file_downloader.calls["testurl2"], 2)
+
+    def test_evict_max_age(self):
+        self.cached_downloader.download("testurl")
+        self.assertEqual((0, 0), self.cached_downloader.evict(max_age=timedelta(hours=1)))
+        self.assertEqual((1, len("testurl")),
+                         self.cached_downloader.evict(max_age=timedelta(seconds=0)))
+        self.cached_downloader.download("testurl")
+        self.assertEqual(self.file_downloader.calls["testurl"], 2)
+
+    def test_evict_removed_concurrently(self):
+        self.cached_downloader.download("testurl")
+        listdir = os.listdir
+        with patch("os.listdir", side_effect=lambda folder: listdir(folder) + ["f" * 64]):
+            self.assertEqual((1, len("testurl")), self.cached_downloader.evict(max_size=0))
+
+    def test_evict_on_miss_over_limits(self):
+        cached_downloader = CachedFileDownloader(temp_folder(), self.file_downloader,
+                                                 max_size=2 * len("testurl1"))
+        # The cache folder is not listed while the index is within the limits
+        with patch("os.listdir", side_effect=AssertionError("Listed")):
+            cached_downloader.download("testurl1")
+            cached_downloader.download("testurl2")
+        cached_downloader.download("testurl3")
+        cached_downloader.download("testurl3")
+        cached_downloader.download("testurl2")
+        cached_downloader.download("testurl1")
+        self.assertEqual(self.file_downloader.calls["testurl1"], 2)
+        self.assertEqual(self.file_downloader.calls["testurl2"], 1)
+
+    def test_index_errors(self):
+        cached_downloader = CachedFileDownloader(temp_folder(), self.file_downloader,
+                                                 max_size=1000)
+        # The errors of the index are logged, they don't fail the downloads
+        with patch("sqlite3.connect", side_effect=sqlite3.OperationalError("database is locked")):
+            self.assertEqual(b"testurl", cached_downloader.download("testurl"))
+            self.assertEqual(b"testurl", cached_downloader.download("testurl"))
+        self.assertEqual(self.file_downloader.calls["testurl"], 1)
+
+    def test_links(self):
+        cached_downloader = CachedFileDownloader(temp_folder(), self.file_downloader, links=True)
+        folder = temp_folder()
+        for name in ("myfile.txt", "myfile2.txt"):
+            file_path = os.path.join(folder, name)
+            cached_downloader.download("testurl", file_path)
+            self.assertEqual("testurl", load(file_path))
+            # Linked files share the cached blob, it cannot be modified through them
+            self.assertFalse(os.stat(file_path).st_mode & stat.S_IWRITE)
+        self.assertEqual(self.file_downloader.calls["testurl"], 1)
+        # Downloading again on top of an existing file works
+        cached_downloader.download("testurl", file_path)
+        self.assertEqual("testurl", load(file_path))
+
+    def test_links_user_download(self):
+        cached_downloader = CachedFileDownloader(temp_folder(), self.file_downloader,
+                                                 user_download=True, links=True)
+        file_path = os.path.join(temp_folder(), "myfile.txt")
+        checksum = hashlib.sha256(b"testurl").hexdigest()
+        cached_downloader.download("testurl", file_path, sha256=checksum)
+        # The user downloads are independent writable files, the cached one is not modified
+        self.assertTrue(os.stat(file_path).st_mode & stat.S_IWRITE)
+        save(file_path, "modified")
+        cached_downloader.download("testurl", file_path, sha256=checksum)
+        self.assertEqual("testurl", load(file_path))
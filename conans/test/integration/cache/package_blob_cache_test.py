@@ -0,0 +1,78 @@
+import os
+import stat
+import unittest
+
+from conans.model.ref import ConanFileReference, PackageReference
+from conans.test.assets.genconanfile import GenConanfile
+from conans.test.utils.test_files import temp_folder
+from conans.client.tools.env import environment_append
+from conans.test.utils.tools import NO_SETTINGS_PACKAGE_ID, TestClient
+from conans.util.files import load, save
+
+
+class PackageBlobCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.client = TestClient(default_server_user=True)
+        self.client.save({"conanfile.py": GenConanfile().with_package_file("include/header.h",
+                                                                           "header")})
+        self.client.run("create . mypkg/0.1@user/testing")
+        self.client.run("upload * --all --confirm")
+        self.blob_folder = temp_folder()
+        self.pref = PackageReference(ConanFileReference.loads("mypkg/0.1@user/testing"),
+                                     NO_SETTINGS_PACKAGE_ID)
+
+    def _install(self):
+        client = TestClient(servers=self.client.servers, users=self.client.users)
+        client.run('config set storage.package_blob_cache="%s"' % self.blob_folder)
+        client.run("install mypkg/0.1@user/testing")
+        package_folder = client.cache.package_layout(self.pref.ref).package(self.pref)
+        self.assertEqual("header", load(os.path.join(package_folder, "include", "header.h")))
+        return client
+
+    def test_reuse_among_homes(self):
+        client = self._install()
+        self.assertNotIn("reused from the package blob cache", client.out)
+        self.assertEqual(1, len(os.listdir(self.blob_folder)))
+
+        client = self._install()
+        self.assertIn("Package %s reused from the package blob cache" % NO_SETTINGS_PACKAGE_ID,
+                      client.out)
+        # The metadata has the checksums of the original downloaded files
+        metadata = client.cache.package_layout(self.pref.ref).load_metadata()
+        self.assertIn("conan_package.tgz", metadata.packages[NO_SETTINGS_PACKAGE_ID].checksums)
+        client.run("upload * --all --confirm")
+
+    def test_installed_files_writable(self):
+        self._install()
+        client = self._install()
+        self.assertIn("reused from the package blob cache", client.out)
+        package_folder = client.cache.package_layout(self.pref.ref).package(self.pref)
+        header = os.path.join(package_folder, "include", "header.h")
+        self.assertTrue(os.stat(header).st_mode & stat.S_IWRITE)
+        save(header, "modified")
+        entry = os.listdir(self.blob_folder)[0]
+        self.assertEqual("header", load(os.path.join(self.blob_folder, entry, "p", "include",
+                                                     "header.h")))
+
+        # Read-only installed packages can share the files of the entry
+        with environment_append({"CONAN_READ_ONLY_CACHE": "1"}):
+            client = self._install()
+        package_folder = client.cache.package_layout(self.pref.ref).package(self.pref)
+        self.assertFalse(os.stat(os.path.join(package_folder, "include", "header.h")).st_mode
+                         & stat.S_IWRITE)
+
+    def test_corrupted_entry(self):
+        self._install()
+        entry = os.listdir(self.blob_folder)[0]
+        header = os.path.join(self.blob_folder, entry, "p", "include", "header.h")
+        self.assertFalse(os.stat(header).st_mode & stat.S_IWRITE)
+        os.chmod(header, stat.S_IRWXU)
+        save(header, "corrupted")
+
+        client = self._install()
+        self.assertNotIn("reused from the package blob cache", client.out)
+
+        # The entry was replaced by the downloaded one
+        client = self._install()
+        self.assertIn("reused from the package blob cache", client.out)
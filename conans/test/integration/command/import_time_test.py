@@ -0,0 +1,89 @@
+import os
+import subprocess
+import sys
+import textwrap
+import unittest
+
+import pytest
+
+import conans
+from conans.test.utils.tools import TestClient
+
+
+def import_times(module):
+    """ imports the module in a new interpreter, with 'python -X importtime'
+    :return: {imported module: cumulative import time in microseconds}
+    """
+    env = os.environ.copy()
+    env["PYTHONPATH"] = os.pathsep.join([os.path.dirname(os.path.dirname(conans.__file__)),
+                                         env.get("PYTHONPATH", "")])
+    process = subprocess.Popen([sys.executable, "-X", "importtime", "-c", "import %s" % module],
+                               env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    _, stderr = process.communicate()
+    assert process.returncode == 0, stderr.decode()
+    result = {}
+    for line in stderr.decode().splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        result[name.strip()] = int(cumulative)
+    return result
+
+
+@pytest.mark.skipif(sys.version_info < (3, 7), reason="Requires 'python -X importtime' and "
+                                                      "module __getattr__")
+class ImportTimeTest(unittest.TestCase):
+    """ regression benchmark of the startup of the conan command, the modules that are only
+    needed by some commands or recipes are imported when they are used
+    """
+
+    def test_command_startup(self):
+        times = import_times("conans.client.command")
+        lazy = ["conans.client.build.cmake", "conans.client.build.msbuild",
+                "conans.client.build.meson", "conans.client.generators.cmake",
+                "conans.client.generators.cmake_find_package_multi",
+                "conans.client.generators.visualstudio", "conans.client.rest.cacert",
+                "conan.tools.cmake", "conan.tools.microsoft", "conan.tools.gnu",
+                "patch_ng", "semver", "tqdm"]
+        self.assertEqual([], [m for m in lazy if m in times])
+
+    def test_lazy_attributes(self):
+        from conans import CMake, MSBuildToolchain
+        from conans.client.build.cmake import CMake as _CMake
+        self.assertIs(_CMake, CMake)
+        self.assertEqual("MSBuildToolchain", MSBuildToolchain.__name__)
+        with self.assertRaisesRegex(ImportError, "Unknown"):
+            from conans import Unknown  # noqa
+
+        from conans.client.generators import GeneratorManager, TXTGenerator
+        self.assertIs(TXTGenerator, GeneratorManager()["txt"])
+
+
+class StarImportTest(unittest.TestCase):
+
+    def test_lazy_attributes_exported(self):
+        namespace = {}
+        exec("from conans import *", namespace)
+        for name in ("ConanFile", "CMake", "AutoToolsBuildEnvironment", "Meson", "MSBuild",
+                     "VisualStudioBuildEnvironment", "RunEnvironment", "MakeToolchain",
+                     "MSBuildToolchain", "tools"):
+            self.assertIn(name, namespace)
+        self.assertIn("CMake", dir(conans))
+
+        namespace = {}
+        exec("from conans.client.generators import *", namespace)
+        self.assertIn("TXTGenerator", namespace)
+
+    def test_recipe(self):
+        client = TestClient()
+        client.save({"conanfile.py": textwrap.dedent("""
+            from conans import *
+            class Pkg(ConanFile):
+                settings = "os", "compiler", "build_type", "arch"
+                def build(self):
+                    cmake = CMake(self, build_type="Debug")
+                    self.output.info("BUILD TYPE: %s" % cmake.build_type)
+                    tools.save("file.txt", "contents")
+            """)})
+        client.run("create . pkg/0.1@")
+        self.assertIn("pkg/0.1: BUILD TYPE: Debug", client.out)
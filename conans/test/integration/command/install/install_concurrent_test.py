@@ -0,0 +1,71 @@
+import os
+import subprocess
+import sys
+import threading
+import time
+import unittest
+
+import pytest
+
+import conans
+from conans.model.ref import ConanFileReference
+from conans.test.utils.test_files import temp_folder
+from conans.test.utils.tools import GenConanfile, TestClient
+
+
+class InstallConcurrentTest(unittest.TestCase):
+    """ the installs of recipes that are in the cache only take their shared read lock, so the
+    concurrent installs sharing a cache don't serialize on the popular ones
+    """
+
+    def setUp(self):
+        self.user_home = temp_folder()
+        self.client = TestClient(cache_folder=os.path.join(self.user_home, ".conan"))
+        self.client.save({"conanfile.py": GenConanfile()})
+        self.client.run("create . zlib/1.2.11@")
+        for name in ("liba", "libb", "libc"):
+            self.client.save({"conanfile.py": GenConanfile().with_require("zlib/1.2.11")})
+            self.client.run("create . %s/0.1@" % name)
+        self.client.save({"conanfile.txt": "[requires]\nliba/0.1\nlibb/0.1\nlibc/0.1"},
+                         clean_first=True)
+
+    def test_not_blocked_by_readers(self):
+        # As a build of zlib, that holds its read lock
+        layout = self.client.cache.package_layout(ConanFileReference.loads("zlib/1.2.11"))
+        with layout.conanfile_read_lock(self.client.out):
+            thread = threading.Thread(target=self.client.run, args=("install .",))
+            thread.daemon = True
+            thread.start()
+            thread.join(60)
+            self.assertFalse(thread.is_alive())
+        self.assertIn("zlib/1.2.11 from local cache - Cache", self.client.out)
+        self.assertNotIn("locked by another concurrent conan process", self.client.out)
+
+    @pytest.mark.slow
+    def test_concurrent_installs(self):
+        """ stress benchmark, N processes installing the same graph from one cache """
+        processes = 8
+        iterations = 3
+        env = os.environ.copy()
+        env["CONAN_USER_HOME"] = self.user_home
+        env["PYTHONPATH"] = os.pathsep.join([os.path.dirname(os.path.dirname(conans.__file__)),
+                                             env.get("PYTHONPATH", "")])
+        script = ("import sys; from conans.client.command import main\n"
+                  "for _ in range(%d):\n"
+                  "    try:\n"
+                  "        main(['install', '.', '--build=never'])\n"
+                  "    except SystemExit as e:\n"
+                  "        if e.code:\n"
+                  "            raise\n" % iterations)
+        start = time.time()
+        running = [subprocess.Popen([sys.executable, "-c", script], cwd=self.client.current_folder,
+                                    env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+                   for _ in range(processes)]
+        outputs = [p.communicate()[0].decode() for p in running]
+        elapsed = time.time() - start
+        sys.stdout.write("%d processes x %d installs: %.2fs\n" % (processes, iterations, elapsed))
+
+        for process, output in zip(running, outputs):
+            self.assertEqual(0, process.returncode, output)
+            self.assertEqual(iterations, output.count("zlib/1.2.11 from local cache - Cache"))
+            self.assertNotIn("locked by another concurrent conan process", output)
@@ -1,6 +1,9 @@
+import os
+import textwrap
 import unittest
+from collections import OrderedDict
 
-from conans.test.utils.tools import GenConanfile, TestClient
+from conans.test.utils.tools import GenConanfile, NO_SETTINGS_PACKAGE_ID, TestClient, TestServer
 
 
 class InstallParallelTest(unittest.TestCase):
@@ -28,3 +31,145 @@ class InstallParallelTest(unittest.TestCase):
         self.assertIn("Downloading binary packages in %s parallel threads" % threads, client.out)
         for i in range(counter):
             self.assertIn("pkg%s/0.1@user/testing: Package installed" % i, client.out)
+
+    def test_parallel_build(self):
+        client = TestClient()
+        client.save({"conanfile.py": textwrap.dedent("""
+            import os
+            from conans import ConanFile
+
+            class Pkg(ConanFile):
+                def build(self):
+                    self.run('python -c "print(\\'Running %s\\')"' % self.name)
+                    with open("built.txt", "w") as f:
+                        f.write(self.name)
+
+                def package(self):
+                    self.copy("built.txt")
+            """)})
+        client.run("export . pkga/0.1@")
+        client.run("export . pkgb/0.1@")
+        client.save({"conanfile.py": GenConanfile().with_require("pkga/0.1")
+                                                  .with_require("pkgb/0.1")})
+        client.run("export . pkgc/0.1@")
+        client.save({"conanfile.txt": "[requires]\npkgc/0.1\npkga/0.1"}, clean_first=True)
+
+        client.run("config set general.parallel_build=4")
+        client.run("install . --build=missing")
+        self.assertIn("Building binary packages in 4 parallel threads", client.out)
+        self.assertIn("pkga/0.1: Running pkga", client.out)
+        self.assertIn("pkgb/0.1: Running pkgb", client.out)
+        for pkg in ("pkga", "pkgb", "pkgc"):
+            self.assertIn("%s/0.1: Package '" % pkg, client.out)
+        # The consumer is only built once its dependencies are finished
+        self.assertLess(str(client.out).index("pkga/0.1: Package '"),
+                        str(client.out).index("pkgc/0.1: Building your package"))
+        self.assertLess(str(client.out).index("pkgb/0.1: Package '"),
+                        str(client.out).index("pkgc/0.1: Building your package"))
+
+    def test_parallel_build_error(self):
+        client = TestClient()
+        client.save({"conanfile.py": textwrap.dedent("""
+            from conans import ConanFile
+
+            class Pkg(ConanFile):
+                def build(self):
+                    if self.name == "pkga":
+                        raise Exception("Build broken!")
+            """)})
+        client.run("export . pkga/0.1@")
+        client.run("export . pkgb/0.1@")
+        client.save({"conanfile.py": GenConanfile().with_require("pkga/0.1")
+                                                  .with_require("pkgb/0.1")})
+        client.run("export . pkgc/0.1@")
+        client.save({"conanfile.txt": "[requires]\npkgc/0.1"}, clean_first=True)
+
+        client.run("config set general.parallel_build=2")
+        client.run("install . --build=missing", assert_error=True)
+        self.assertIn("Build broken!", client.out)
+        self.assertNotIn("pkgc/0.1: Building your package", client.out)
+
+    def test_parallel_binaries_query(self):
+        servers = OrderedDict([("default", TestServer([("*/*@*/*", "*")], [("*/*@*/*", "*")])),
+                               ("other", TestServer([("*/*@*/*", "*")], [("*/*@*/*", "*")]))])
+        client = TestClient(servers=servers, users={"default": [("lasote", "mypass")],
+                                                    "other": [("lasote", "mypass")]})
+        client.run("config set general.parallel_download=4")
+        client.save({"conanfile.py": GenConanfile()})
+        for i in range(3):
+            client.run("create . pkg%s/0.1@user/testing" % i)
+        client.run("upload pkg0* --all --confirm -r=default")
+        client.run("upload pkg1* --all --confirm -r=other")
+        client.run("upload pkg2* --confirm -r=default")
+        client.run("remove * -f")
+
+        conanfile_txt = "[requires]\npkg0/0.1@user/testing\npkg1/0.1@user/testing\n" \
+                        "pkg2/0.1@user/testing"
+        client.save({"conanfile.txt": conanfile_txt}, clean_first=True)
+        client.run("install . --build=missing")
+        self.assertIn("pkg0/0.1@user/testing:%s - Download" % NO_SETTINGS_PACKAGE_ID, client.out)
+        self.assertIn("pkg1/0.1@user/testing:%s - Download" % NO_SETTINGS_PACKAGE_ID, client.out)
+        self.assertIn("pkg2/0.1@user/testing:%s - Build" % NO_SETTINGS_PACKAGE_ID, client.out)
+        self.assertIn("pkg0/0.1@user/testing: Package installed", client.out)
+        self.assertIn("pkg1/0.1@user/testing: Package installed", client.out)
+
+    def test_parallel_binaries_query_disabled_remotes(self):
+        client = TestClient(default_server_user=True)
+        client.run("config set general.parallel_download=4")
+        client.save({"conanfile.py": GenConanfile()})
+        client.run("export . pkg/0.1@user/testing")
+        client.run("remote disable default")
+        client.save({"conanfile.txt": "[requires]\npkg/0.1@user/testing"}, clean_first=True)
+        client.run("install . --build=missing")
+        self.assertIn("pkg/0.1@user/testing:%s - Build" % NO_SETTINGS_PACKAGE_ID, client.out)
+
+    def test_parallel_recipes_download(self):
+        client = TestClient(default_server_user=True)
+        client.run("config set general.parallel_download=4")
+        client.save({"conanfile.py": GenConanfile()})
+        for i in range(3):
+            client.run("create . pkg%s/0.1@user/testing" % i)
+        client.save({"conanfile.py": GenConanfile().with_require("pkg0/0.1@user/testing")
+                                                  .with_require("pkg1/0.1@user/testing")
+                                                  .with_require("pkg2/0.1@user/testing")})
+        client.run("create . consumer/0.1@user/testing")
+        client.run("upload * --all --confirm")
+        client.run("remove * -f")
+
+        client.run("install consumer/0.1@user/testing")
+        for i in range(3):
+            self.assertIn("pkg%s/0.1@user/testing: Downloaded recipe revision" % i, client.out)
+            self.assertIn("pkg%s/0.1@user/testing from 'default' - Downloaded" % i, client.out)
+            self.assertIn("pkg%s/0.1@user/testing: Package installed" % i, client.out)
+        client.run("info consumer/0.1@user/testing")
+        self.assertIn("Remote: default", client.out)
+
+    def test_parallel_recipes_download_login(self):
+        server = TestServer(read_permissions=[("*/*@*/*", "user")],
+                            write_permissions=[("*/*@*/*", "user")], users={"user": "password"})
+        client = TestClient(servers={"default": server}, users={"default": [("user", "password")]})
+        hook_path = os.path.join(client.cache.hooks_path, "thread_hook.py")
+        client.save({hook_path: textwrap.dedent("""
+            import threading
+
+            def pre_download_recipe(output, reference, **kwargs):
+                output.info("Thread %s" % threading.current_thread().name)
+            """)})
+        client.run("config set hooks.thread_hook")
+        client.run("config set general.parallel_download=4")
+        client.save({"conanfile.py": GenConanfile()})
+        client.run("create . pkg0/0.1@user/testing")
+        client.run("create . pkg1/0.1@user/testing")
+        client.run("upload * --all --confirm")
+        client.run("remove * -f")
+        client.run("user --clean")
+
+        # The login is requested in the main thread, when the prefetch fails without credentials
+        client.save({"conanfile.txt": "[requires]\npkg0/0.1@user/testing\npkg1/0.1@user/testing"},
+                    clean_first=True)
+        client.run("install .")
+        self.assertEqual(1, str(client.out).count("Please log in"))
+        self.assertEqual(2, str(client.out).count("Thread MainThread"))
+        for i in range(2):
+            self.assertIn("pkg%s/0.1@user/testing: Downloaded recipe revision" % i, client.out)
+            self.assertIn("pkg%s/0.1@user/testing: Package installed" % i, client.out)
@@ -20,6 +20,7 @@ from conans.test.utils.tools import NO_SETTINGS_PACKAGE_ID, TestClient, \
     TestServer, GenConanfile
 from conans.util.env_reader import get_env
 from conans.util.files import load
+from conans.util.locks import KERNEL_LOCKS
 
 
 class RemoveLocksTest(unittest.TestCase):
@@ -31,16 +32,18 @@ class RemoveLocksTest(unittest.TestCase):
         ref = ConanFileReference.loads("Hello/0.1@lasote/testing")
         conan_folder = client.cache.package_layout(ref).base_folder()
         self.assertIn("locks", os.listdir(conan_folder))
-        self.assertTrue(os.path.exists(conan_folder + ".count"))
-        self.assertTrue(os.path.exists(conan_folder + ".count.lock"))
+        lock_files = [conan_folder + ".lock"] if KERNEL_LOCKS else [conan_folder + ".count",
+                                                                    conan_folder + ".count.lock"]
+        for lock_file in lock_files:
+            self.assertTrue(os.path.exists(lock_file))
         client.run("remove * --locks", assert_error=True)
         self.assertIn("ERROR: Specifying a pattern is not supported", client.out)
         client.run("remove", assert_error=True)
         self.assertIn('ERROR: Please specify a pattern to be removed ("*" for all)', client.out)
         client.run("remove --locks")
         self.assertNotIn("locks", os.listdir(conan_folder))
-        self.assertFalse(os.path.exists(conan_folder + ".count"))
-        self.assertFalse(os.path.exists(conan_folder + ".count.lock"))
+        for lock_file in lock_files:
+            self.assertFalse(os.path.exists(lock_file))
 
 
 class RemoveRegistryTest(unittest.TestCase):
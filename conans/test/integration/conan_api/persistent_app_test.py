@@ -0,0 +1,172 @@
+import os
+import platform
+import socket
+import stat
+import subprocess
+import sys
+import textwrap
+import time
+import unittest
+
+import pytest
+from mock import patch
+from six import StringIO
+
+from conans.client.conan_api import ConanAPIV1
+from conans.client.daemon import daemon_address, run_in_daemon, stop_daemon
+from conans.client.tools.env import environment_append
+from conans.client.tools.files import chdir
+from conans.test.utils.mocks import TestBufferConanOutput
+from conans.test.utils.test_files import temp_folder
+from conans.util.files import save
+
+
+class PersistentAppTest(unittest.TestCase):
+
+    def setUp(self):
+        self.cache_folder = temp_folder()
+        self.output = TestBufferConanOutput()
+        self.api = ConanAPIV1(self.cache_folder, output=self.output, persistent=True)
+
+    def test_reused(self):
+        self.api.remote_list()
+        self.api.config_get("general.default_package_id_mode")
+        app = self.api.app
+        self.api.config_get("general.default_package_id_mode")
+        self.assertIs(app, self.api.app)
+        self.assertIs(app.cache, self.api.app.cache)
+
+        # The quiet calls don't use the persistent app, their output is different
+        self.api.remote_list(quiet=True)
+        self.assertIsNot(app, self.api.app)
+        self.api.config_get("general.default_package_id_mode")
+        self.assertIs(app, self.api.app)
+
+    def test_invalidated(self):
+        self.api.config_set("general.metadata_ttl", "3600")
+        app = self.api.app
+        self.api.config_get("general.metadata_ttl")
+        self.assertIsNot(app, self.api.app)
+        self.assertEqual(3600, self.api.app.config.metadata_ttl)
+
+        app = self.api.app
+        with environment_append({"CONAN_METADATA_TTL": "60"}):
+            self.api.config_get("general.metadata_ttl")
+        self.assertIsNot(app, self.api.app)
+
+        app = self.api.app
+        self.api.remote_add("myremote", "http://myremote.url")
+        self.api.remote_list()
+        self.assertIsNot(app, self.api.app)
+
+    def test_recipe_changed(self):
+        conanfile = textwrap.dedent("""
+            from conans import ConanFile
+            class Pkg(ConanFile):
+                def build(self):
+                    self.output.info("NUMBER 42!!")
+            """)
+        folder = temp_folder()
+        with chdir(folder):
+            save("conanfile.py", conanfile)
+            self.api.create(".", "pkg", "version", "user", "channel")
+            self.assertIn("pkg/version@user/channel: NUMBER 42!!", self.output)
+            save("conanfile.py", conanfile.replace("42", "123"))
+            self.api.create(".", "pkg", "version", "user", "channel")
+            self.assertIn("pkg/version@user/channel: NUMBER 123!!", self.output)
+
+    def test_recipe_modules_changed(self):
+        conanfile = textwrap.dedent("""
+            from conans import ConanFile
+            from helper import number
+            from tools.other import letter
+            class Pkg(ConanFile):
+                def source(self):
+                    self.output.info("NUMBER %s%s!!" % (number(), letter()))
+            """)
+        folder = temp_folder()
+        with chdir(folder):
+            save("conanfile.py", conanfile)
+            save("helper.py", "def number():\n    return 42")
+            save("tools/__init__.py", "")
+            save("tools/other.py", "def letter():\n    return 'A'")
+            self.api.source(".")
+            self.assertIn("NUMBER 42A!!", self.output)
+            save("helper.py", "def number():\n    return 123")
+            self.api.source(".")
+            self.assertIn("NUMBER 123A!!", self.output)
+            save("tools/other.py", "def letter():\n    return 'BB'")
+            self.api.source(".")
+            self.assertIn("NUMBER 123BB!!", self.output)
+
+
+@pytest.mark.skipif(platform.system() == "Windows", reason="The daemon uses Unix sockets")
+class ConanDaemonTest(unittest.TestCase):
+
+    def setUp(self):
+        self.cache_folder = temp_folder()
+        self._start()
+
+    def _start(self, setup_code=""):
+        code = "%sfrom conans.client.daemon import ConanDaemon; ConanDaemon(%r).serve()" \
+               % (setup_code, self.cache_folder)
+        env = os.environ.copy()
+        env["PYTHONPATH"] = os.pathsep.join([os.getcwd()] + sys.path)
+        self.daemon = subprocess.Popen([sys.executable, "-c", code], env=env,
+                                       stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        for _ in range(300):
+            if os.path.exists(daemon_address(self.cache_folder)):
+                break
+            time.sleep(0.1)
+        self.addCleanup(self._stop)
+
+    def _stop(self):
+        if not stop_daemon(self.cache_folder):
+            self.daemon.kill()
+        self.daemon.communicate()
+
+    def _run(self, args, cwd):
+        with chdir(cwd):
+            with patch("sys.stdout", new_callable=StringIO) as stdout:
+                with patch("sys.stderr", new_callable=StringIO) as stderr:
+                    exit_code = run_in_daemon(args, self.cache_folder)
+        return exit_code, stdout.getvalue() + stderr.getvalue()
+
+    def test_commands(self):
+        folder = temp_folder()
+        save(os.path.join(folder, "conanfile.py"), textwrap.dedent("""
+            import os
+            from conans import ConanFile
+            class Pkg(ConanFile):
+                def build(self):
+                    self.output.info("MYVAR=%s" % os.getenv("MYVAR"))
+            """))
+        with environment_append({"MYVAR": "myvalue"}):
+            exit_code, output = self._run(["create", ".", "pkg/0.1@"], folder)
+        self.assertEqual(0, exit_code)
+        self.assertIn("pkg/0.1: MYVAR=myvalue", output)
+        self.assertTrue(os.path.exists(os.path.join(self.cache_folder, "data", "pkg")))
+
+        exit_code, output = self._run(["export", "missing"], folder)
+        self.assertEqual(1, exit_code)
+        self.assertIn("ERROR: Conanfile not found", output)
+
+    def test_other_users_rejected(self):
+        address = daemon_address(self.cache_folder)
+        self.assertEqual(0o600, stat.S_IMODE(os.stat(address).st_mode))
+
+        if not hasattr(socket, "SO_PEERCRED"):
+            return
+        self._stop()
+        self._start("import os; os.getuid = lambda: os.geteuid() + 1; ")
+        exit_code, output = self._run(["--version"], temp_folder())
+        self.assertEqual(1, exit_code)
+        self.assertIn("The Conan daemon finished before completing the command", output)
+        self.daemon.kill()
+        _, stderr = self.daemon.communicate()
+        self.assertIn(b"Rejected a connection of the user", stderr)
+
+    def test_not_running(self):
+        self._stop()
+        self.assertIsNone(run_in_daemon(["--version"], self.cache_folder))
+        self.assertFalse(stop_daemon(self.cache_folder))
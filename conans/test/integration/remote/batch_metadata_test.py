@@ -0,0 +1,127 @@
+import time
+import unittest
+
+from mock import patch
+
+from conans import BATCH_METADATA
+from conans.client.rest.rest_client_common import RestCommonMethods
+from conans.model.ref import ConanFileReference
+from conans.test.assets.genconanfile import GenConanfile
+from conans.test.utils.tools import NO_SETTINGS_PACKAGE_ID, TestClient, TestRequester, \
+    TestServer
+
+
+class RecordingRequester(TestRequester):
+    """ records the (method, path) of the requests """
+    requests = []
+
+    def get(self, url, **kwargs):
+        RecordingRequester.requests.append(("GET", url.split("/v2/", 1)[-1]))
+        return super(RecordingRequester, self).get(url, **kwargs)
+
+    def post(self, url, **kwargs):
+        RecordingRequester.requests.append(("POST", url.split("/v2/", 1)[-1]))
+        return super(RecordingRequester, self).post(url, **kwargs)
+
+
+class BatchMetadataTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = TestServer(users={"user": "password"},
+                                 write_permissions=[("*/*@*/*", "*")])
+        servers = {"default": self.server}
+        self.uploader = TestClient(servers=servers, users={"default": [("user", "password")]},
+                                   revisions_enabled=True)
+        for name in ("liba", "libb", "libc"):
+            self.uploader.save({"conanfile.py": GenConanfile()})
+            self.uploader.run("create . %s/0.1@user/testing" % name)
+        self.uploader.run("upload * --all --confirm")
+        self.consumer = TestClient(servers=servers, users={"default": [("user", "password")]},
+                                   revisions_enabled=True, requester_class=RecordingRequester)
+        conanfile = GenConanfile().with_require("liba/0.1@user/testing")\
+                                  .with_require("libb/0.1@user/testing")\
+                                  .with_require("libc/0.1@user/testing")
+        self.consumer.save({"conanfile.py": conanfile})
+
+    def _requests(self, command):
+        RecordingRequester.requests = []
+        self.consumer.run(command)
+        return RecordingRequester.requests
+
+    def test_server_metadata(self):
+        ref = ConanFileReference.loads("liba/0.1@user/testing")
+        rrev = self.server.server_store.get_last_revision(ref).revision
+        queries = [{"ref": "liba/0.1@user/testing",
+                    "packages": [NO_SETTINGS_PACKAGE_ID, "missing", NO_SETTINGS_PACKAGE_ID + "#kk"]},
+                   {"ref": "liba/0.1@user/testing#%s" % rrev},
+                   {"ref": "liba/0.1@user/testing#kk", "packages": [NO_SETTINGS_PACKAGE_ID]},
+                   {"ref": "missing/0.1@user/testing"}]
+        response = self.server.app.post_json("/v2/conans/metadata", {"references": queries})
+        recipe, revision, missing_revision, missing = response.json["references"]
+
+        self.assertEqual("liba/0.1@user/testing#%s" % rrev, recipe["ref"])
+        self.assertIn("conanfile.py", recipe["manifest"])
+        package = recipe["packages"][NO_SETTINGS_PACKAGE_ID]
+        self.assertIn("[settings]", package["conaninfo"])
+        self.assertIn("conaninfo.txt", package["manifest"])
+        self.assertEqual(404, recipe["packages"]["missing"]["error"]["status"])
+        self.assertEqual(404, recipe["packages"][NO_SETTINGS_PACKAGE_ID + "#kk"]["error"]["status"])
+        self.assertEqual(recipe["time"], revision["time"])
+        self.assertEqual(404, missing_revision["error"]["status"])
+        self.assertNotIn("packages", missing_revision)
+        self.assertEqual(404, missing["error"]["status"])
+
+    def test_install(self):
+        requests = self._requests("install .")
+        self.assertIn(("POST", "conans/metadata"), requests)
+        # The binaries are not queried one by one, their conaninfo.txt is only downloaded with
+        # the package
+        self.assertEqual([], [url for _, url in requests
+                              if "packages" in url and url.endswith("latest")])
+        self.assertEqual(3, len([url for _, url in requests if url.endswith("conaninfo.txt")]))
+        self.assertIn("liba/0.1@user/testing:%s - Download" % NO_SETTINGS_PACKAGE_ID,
+                      self.consumer.out)
+
+        # Neither the updates of the recipes and binaries in the cache
+        requests = self._requests("install . --update")
+        self.assertEqual([("POST", "conans/metadata")] * 2,
+                         [r for r in requests if r[0] == "POST"])
+        self.assertEqual([], [url for _, url in requests if url.endswith(("latest", ".txt"))])
+        self.assertIn("liba/0.1@user/testing:%s - Cache" % NO_SETTINGS_PACKAGE_ID,
+                      self.consumer.out)
+
+        # The updates are found, the cached responses are not used
+        time.sleep(1)  # The revision timestamps resolution
+        self.uploader.save({"conanfile.py": str(GenConanfile()) + "\n# New revision"})
+        self.uploader.run("create . libb/0.1@user/testing")
+        self.uploader.run("upload libb/0.1@user/testing --all")
+        self.consumer.run("install . --update --metadata-ttl=3600")
+        self.assertIn("libb/0.1@user/testing from 'default' - Updated", self.consumer.out)
+        self.assertIn("libb/0.1@user/testing:%s - Download" % NO_SETTINGS_PACKAGE_ID,
+                      self.consumer.out)
+
+    def test_manifests_not_cached(self):
+        self.consumer.run("install .")
+        self.consumer.run("config set general.metadata_ttl=3600")
+        get_json = RestCommonMethods.get_json
+        batches = []
+
+        def recording_get_json(rest, url, data=None, headers=None, cached=False):
+            if data:
+                packages = any("packages" in query for query in data["references"])
+                batches.append(("packages" if packages else "manifests", cached))
+            return get_json(rest, url, data, headers, cached)
+
+        with patch.object(RestCommonMethods, "get_json", recording_get_json):
+            self.consumer.run("install . --update")
+        # The manifests are only requested to check the updates, never from the cache
+        self.assertEqual([("manifests", False), ("packages", True)], batches)
+
+    def test_without_capability(self):
+        # The same capabilities for both APIs
+        self.server.test_server.ra.api_v2.server_capabilities.remove(BATCH_METADATA)
+        requests = self._requests("install .")
+        self.assertNotIn(("POST", "conans/metadata"), requests)
+        self.assertEqual(6, len([url for _, url in requests if url.endswith("conaninfo.txt")]))
+        self.assertIn("liba/0.1@user/testing:%s - Download" % NO_SETTINGS_PACKAGE_ID,
+                      self.consumer.out)
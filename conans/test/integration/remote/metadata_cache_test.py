@@ -0,0 +1,114 @@
+import os
+import time
+import unittest
+
+from conans import BATCH_METADATA, SERVER_CAPABILITIES
+from conans.client.rest.metadata_cache import METADATA_CACHE
+from conans.model.ref import ConanFileReference
+from conans.test.assets.genconanfile import GenConanfile
+from conans.test.utils.tools import TestClient, TestRequester, TestServer
+from conans.util.files import load
+
+
+class RecordingRequester(TestRequester):
+    """ records the (path, status) of the GET requests """
+    requests = []
+
+    def get(self, url, **kwargs):
+        response = super(RecordingRequester, self).get(url, **kwargs)
+        RecordingRequester.requests.append((url.split("/v2/", 1)[-1].split("/v1/", 1)[-1],
+                                            response.status_code))
+        return response
+
+
+class RemoteMetadataCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        # The requests of each reference, the batched ones are checked in batch_metadata_test
+        capabilities = set(SERVER_CAPABILITIES) - {BATCH_METADATA}
+        server = TestServer(users={"user": "password"}, write_permissions=[("*/*@*/*", "*")],
+                            server_capabilities=capabilities)
+        servers = {"default": server}
+        self.uploader = TestClient(servers=servers, users={"default": [("user", "password")]},
+                                   revisions_enabled=True)
+        self.consumer = TestClient(servers=servers, users={"default": [("user", "password")]},
+                                   revisions_enabled=True, requester_class=RecordingRequester)
+        self.uploader.save({"conanfile.py": GenConanfile()})
+        self.uploader.run("create . pkg/0.1@user/testing")
+        self.uploader.run("upload pkg/0.1@user/testing --all")
+        self.consumer.save({"conanfile.py": GenConanfile().with_require("pkg/[>0.0]@user/testing")})
+        self.consumer.run("install .")
+        RecordingRequester.requests = []
+
+    def _requests(self, command):
+        RecordingRequester.requests = []
+        self.consumer.run(command)
+        return RecordingRequester.requests
+
+    def _installed_recipe(self):
+        layout = self.consumer.cache.package_layout(ConanFileReference.loads("pkg/0.1@user/testing"))
+        return load(layout.conanfile())
+
+    def test_ttl(self):
+        self.consumer.run("remove pkg* -f")
+        requests = self._requests("install . --metadata-ttl=3600")
+        self.assertEqual([], [url for url, _ in requests
+                              if url.endswith(("ping", "latest")) or "search?" in url])
+        self.assertIn("pkg/0.1@user/testing: Downloaded recipe revision", self.consumer.out)
+
+        # A new revision is not seen until the cached one expires
+        time.sleep(1)  # Newer than the installed one
+        self.uploader.save({"conanfile.py": str(GenConanfile()) + "\n# New revision"})
+        self.uploader.run("create . pkg/0.1@user/testing")
+        self.uploader.run("upload pkg/0.1@user/testing --all")
+        self.consumer.run("remove pkg* -f")
+        self.consumer.run("install . --metadata-ttl=3600")
+        self.assertNotIn("# New revision", self._installed_recipe())
+
+        # The updates always revalidate the cached responses
+        requests = self._requests("install . --update --metadata-ttl=3600")
+        self.assertTrue([url for url, _ in requests if url.endswith("latest")])
+        self.assertIn("pkg/0.1@user/testing: Downloaded recipe revision", self.consumer.out)
+        self.assertIn("# New revision", self._installed_recipe())
+
+        # The TTL of the configuration
+        self.consumer.run("config set general.metadata_ttl=3600")
+        self.consumer.run("remove pkg* -f")
+        requests = self._requests("install .")
+        self.assertEqual([], [url for url, _ in requests if url.endswith("latest")])
+        requests = self._requests("install . --update")
+        self.assertTrue([url for url, _ in requests if url.endswith("latest")])
+
+    def test_revalidation(self):
+        # The cached responses are revalidated, the unchanged ones don't have a body
+        requests = self._requests("install . --update")
+        latest = [status for url, status in requests if url.endswith("latest")]
+        searches = [status for url, status in requests if "search?" in url]
+        self.assertEqual([304], searches)
+        self.assertTrue(latest)
+        self.assertEqual({304}, set(latest))
+
+    def test_invalidated_by_upload(self):
+        self.consumer.save({"conanfile.py": str(GenConanfile()) + "\n# New revision"},
+                           clean_first=True)
+        self.consumer.run("create . pkg/0.1@user/testing")
+        self.consumer.run("upload pkg/0.1@user/testing --all")
+        self.consumer.run("remove pkg* -f")
+        requests = self._requests("install pkg/0.1@user/testing --metadata-ttl=3600")
+        self.assertEqual([200], [status for url, status in requests if url.endswith("ping")])
+        self.assertTrue(os.path.exists(os.path.join(self.consumer.cache_folder, METADATA_CACHE)))
+
+    def test_user_changed(self):
+        os.remove(os.path.join(self.consumer.cache_folder, METADATA_CACHE))  # The anonymous ones
+        self.consumer.run("user user -p password -r default")
+        self.consumer.run("remove pkg* -f")
+        self.consumer.run("install . --metadata-ttl=3600")
+        self.consumer.run("remove pkg* -f")
+        requests = self._requests("install . --metadata-ttl=3600")
+        self.assertEqual([], [url for url, _ in requests if "search?" in url])
+
+        # The responses cached for the user are not used anonymously
+        self.consumer.run("user --clean")
+        self.consumer.run("remove pkg* -f")
+        requests = self._requests("install . --metadata-ttl=3600")
+        self.assertEqual([200], [status for url, status in requests if "search?" in url])
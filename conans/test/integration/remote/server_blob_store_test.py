@@ -0,0 +1,113 @@
+import os
+import unittest
+from io import BytesIO
+
+from mock import patch
+
+from conans.model.ref import ConanFileReference
+from conans.server.service.authorize import BasicAuthorizer
+from conans.server.service.v2.service_v2 import ConanServiceV2
+from conans.test.assets.genconanfile import GenConanfile
+from conans.test.utils.tools import TestClient, TestServer
+from conans.util.files import load
+
+
+class ServerBlobStoreTest(unittest.TestCase):
+
+    def _blobs(self, server):
+        folder = server.server_store.blobs._folder
+        return sorted(os.path.join(folder, subfolder, blob) for subfolder in os.listdir(folder)
+                      for blob in os.listdir(os.path.join(folder, subfolder)))
+
+    def test_checksum_deploy(self):
+        client = TestClient(default_server_user=True, revisions_enabled=True)
+        server = client.servers["default"]
+        client.save({"conanfile.py": GenConanfile().with_exports_sources("*"),
+                     "file.txt": "contents"})
+        client.run("create . pkg/0.1@user/testing")
+        client.run("upload pkg/0.1@user/testing --all")
+        blobs = self._blobs(server)
+        self.assertEqual(6, len(blobs))  # The files of the recipe and the package
+        self.assertTrue(all(os.stat(blob).st_nlink == 2 for blob in blobs))
+
+        client.run("copy pkg/0.1@user/testing user/stable --all")
+        with patch("conans.client.rest.file_uploader.FileUploader._upload_file") as upload:
+            client.run("upload pkg/0.1@user/stable --all")
+            self.assertEqual(0, upload.call_count)
+        self.assertEqual(blobs, self._blobs(server))
+        self.assertTrue(all(os.stat(blob).st_nlink == 3 for blob in blobs))
+
+        client.run("remove pkg/0.1@user/stable -f")
+        client.run("install pkg/0.1@user/stable")
+        self.assertIn("pkg/0.1@user/stable: Package installed", client.out)
+
+        # The files that are not in the server have to be uploaded
+        path = os.path.join(client.current_folder, "deployed.txt")
+        self.assertFalse(server.server_store.blobs.deploy("0" * 40, path))
+        self.assertFalse(server.server_store.blobs.deploy("../../../file", path))
+        self.assertFalse(os.path.exists(path))
+
+        client.run("remove pkg/0.1@user/testing -r=default -f")
+        self.assertTrue(all(os.stat(blob).st_nlink == 2 for blob in blobs))
+        client.run("remove pkg/0.1@user/stable -r=default -f")
+        self.assertEqual([], self._blobs(server))
+
+    def test_remove_checks_removed_blobs(self):
+        client = TestClient(default_server_user=True, revisions_enabled=True)
+        server = client.servers["default"]
+        client.save({"conanfile.py": GenConanfile().with_exports_sources("*"),
+                     "file.txt": "contents"})
+        client.run("export . pkg/0.1@user/testing")
+        client.save({"file.txt": "other contents"})
+        client.run("export . other/0.1@user/testing")
+        client.run("upload * --confirm")
+        blobs = self._blobs(server)
+
+        store = server.server_store
+        with patch.object(store.blobs, "_blob_path", side_effect=store.blobs._blob_path) as path:
+            client.run("remove pkg/0.1@user/testing -r=default -f")
+            # Only the blobs of the removed files are checked
+            self.assertEqual(3, path.call_count)
+        remaining = self._blobs(server)
+        self.assertEqual(3, len(remaining))
+        self.assertTrue(set(remaining).issubset(blobs))
+
+        # The blobs removed meanwhile by another request are skipped
+        for blob in remaining:
+            os.unlink(blob)
+        client.run("remove other/0.1@user/testing -r=default -f")
+        self.assertEqual([], self._blobs(server))
+
+    def test_temporary_files_outside_revisions(self):
+        client = TestClient(default_server_user=True, revisions_enabled=True)
+        client.save({"conanfile.py": GenConanfile().with_exports_sources("*"),
+                     "file.txt": "contents"})
+        client.run("export . pkg/0.1@user/testing")
+        client.run("copy pkg/0.1@user/testing user/stable")
+        listings = []
+        rename = os.rename
+
+        def listing_rename(src, dst):
+            listings.extend(os.listdir(os.path.dirname(dst)))
+            rename(src, dst)
+
+        with patch("os.rename", side_effect=listing_rename):
+            client.run("upload pkg/0.1@user/testing")
+            client.run("upload pkg/0.1@user/stable")  # Deployed from the blobs
+        self.assertIn("conanfile.py", listings)
+        self.assertFalse([f for f in listings if f.endswith((".upload", ".blob"))])
+
+    def test_replaced_file(self):
+        server = TestServer()
+        store = server.server_store
+        service = ConanServiceV2(BasicAuthorizer([], [("*/*@*/*", "*")]), store)
+        ref = ConanFileReference.loads("pkg/0.1@user/testing#rev")
+        for contents in (b"contents", b"other contents"):  # A retried or forced upload
+            service.upload_recipe_file(BytesIO(contents), {}, ref, "conanfile.py", "user")
+
+        # The blob of the replaced file is removed
+        self.assertEqual(b"other contents", load(store.get_conanfile_file_path(ref, "conanfile.py"),
+                                                 binary=True))
+        blobs = self._blobs(server)
+        self.assertEqual(1, len(blobs))
+        self.assertEqual(2, os.stat(blobs[0]).st_nlink)
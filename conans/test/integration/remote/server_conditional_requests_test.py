@@ -0,0 +1,94 @@
+import os
+import unittest
+
+from mock import patch
+
+from conans.model.ref import ConanFileReference
+from conans.test.assets.genconanfile import GenConanfile
+from conans.test.utils.tools import TestClient
+from conans.util.files import load, save, sha1sum
+
+
+class ServerConditionalRequestsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.client = TestClient(default_server_user=True, revisions_enabled=True)
+        self.server = self.client.servers["default"]
+        self.client.save({"conanfile.py": GenConanfile()})
+        self.client.run("create . pkg/0.1@user/testing")
+        self.client.run("upload pkg/0.1@user/testing --all")
+        self.ref = ConanFileReference.loads("pkg/0.1@user/testing")
+        self.rrev = self.server.server_store.get_last_revision(self.ref).revision
+        self.url = "/v2/conans/pkg/0.1/user/testing/revisions/%s" % self.rrev
+
+    def test_file_etag_and_range(self):
+        url = self.url + "/files/conanfile.py"
+        path = self.server.server_store.get_conanfile_file_path(
+            self.ref.copy_with_rev(self.rrev), "conanfile.py")
+        contents = load(path).encode()
+
+        # The files uploaded just now are hashed every time, until their stat is reliable
+        with patch("conans.util.hash_cache.RACY_SECONDS", -1):
+            with patch("conans.server.store.server_store.sha1sum", side_effect=sha1sum) as hashes:
+                response = self.server.app.get(url)
+                etag = response.headers["ETag"]
+                self.assertEqual('"%s"' % sha1sum(path), etag)
+                self.assertEqual(contents, response.body)
+                response = self.server.app.get(url, headers={"If-None-Match": etag}, status=304)
+                self.assertEqual(1, hashes.call_count)
+        self.assertEqual(etag, response.headers["ETag"])
+        self.assertEqual(b"", response.body)
+        # If-None-Match takes precedence over If-Modified-Since
+        response = self.server.app.get(url, headers={"If-None-Match": '"other"',
+                                                     "If-Modified-Since":
+                                                     response.headers.get("Date", "")})
+        self.assertEqual(contents, response.body)
+
+        response = self.server.app.get(url, headers={"Range": "bytes=5-", "If-Range": etag},
+                                       status=206)
+        self.assertEqual(contents[5:], response.body)
+        self.assertEqual("bytes 5-%s/%s" % (len(contents) - 1, len(contents)),
+                         response.headers["Content-Range"])
+        # The file changed, the whole file
+        response = self.server.app.get(url, headers={"Range": "bytes=5-",
+                                                     "If-Range": '"other"'}, status=200)
+        self.assertEqual(contents, response.body)
+
+        # The stored checksum is not used once the file changes
+        os.remove(path)  # Not modified in place, it is a link to its blob
+        save(path, "new contents")
+        response = self.server.app.get(url, headers={"If-None-Match": etag})
+        self.assertEqual(b"new contents", response.body)
+        self.assertEqual('"%s"' % sha1sum(path), response.headers["ETag"])
+
+        self.server.app.get(self.url + "/files/missing.txt", status=404)
+
+    def test_revisions_etag(self):
+        urls = self.url.rsplit("/", 1)[0], self.url.rsplit("/", 2)[0] + "/latest"
+        for i, url in enumerate(urls):
+            response = self.server.app.get(url)
+            etag = response.headers["ETag"]
+            self.server.app.get(url, headers={"If-None-Match": etag}, status=304)
+
+            # A new revision
+            self.client.save({"conanfile.py": str(GenConanfile()) + "\n# %s" % i})
+            self.client.run("export . pkg/0.1@user/testing")
+            self.client.run("upload pkg/0.1@user/testing")
+            response = self.server.app.get(url, headers={"If-None-Match": etag})
+            self.assertNotEqual(etag, response.headers["ETag"])
+
+    def test_removed_checksums(self):
+        url = self.url + "/files/conanfile.py"
+        with patch("conans.util.hash_cache.RACY_SECONDS", -1):
+            self.server.app.get(url)
+        file_hashes = self.server.server_store._file_hashes
+        folder = self.server.server_store.base_folder(self.ref.copy_with_rev(self.rrev))
+
+        def stored_paths():
+            with file_hashes._connect() as cursor:
+                cursor.execute("SELECT path FROM hashes")
+                return [path for path, in cursor.fetchall() if path.startswith(folder)]
+
+        self.assertEqual(1, len(stored_paths()))
+        self.client.run("remove pkg/0.1@user/testing -f -r default")
+        self.assertEqual([], stored_paths())
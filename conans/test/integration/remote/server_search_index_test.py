@@ -0,0 +1,144 @@
+import os
+import shutil
+import textwrap
+import unittest
+
+from mock import patch
+
+from conans.test.assets.genconanfile import GenConanfile
+from conans.test.utils.tools import TestClient
+from conans.util.files import load
+
+
+class ServerSearchIndexTest(unittest.TestCase):
+
+    def test_search_index(self):
+        client = TestClient(default_server_user=True, revisions_enabled=True)
+        server = client.servers["default"]
+        conanfile = textwrap.dedent("""
+            from conans import ConanFile
+            class Pkg(ConanFile):
+                settings = "os"
+                options = {"shared": [True, False]}
+                default_options = {"shared": False}
+            """)
+        client.save({"conanfile.py": conanfile})
+        client.run("create . pkg/0.1@user/testing -s os=Linux")
+        client.run("create . pkg/0.1@user/testing -s os=Windows -o pkg:shared=True")
+        with patch("conans.search.packages_index.load", side_effect=load) as loads:
+            client.run("upload pkg/0.1@user/testing --all")
+            # The server indexes the uploaded packages, the searches don't parse them again
+            call_count = loads.call_count
+            client.run('search pkg/0.1@user/testing -r=default -q "os=Windows"')
+            self.assertIn("shared: True", client.out)
+            self.assertNotIn("os: Linux", client.out)
+            client.run('search pkg/0.1@user/testing -r=default -q "shared=False"')
+            self.assertIn("os: Linux", client.out)
+            self.assertNotIn("os: Windows", client.out)
+            self.assertEqual(call_count, loads.call_count)
+
+        url = "/v2/conans/pkg/0.1/user/testing/search"
+        response = server.app.get(url, params={"q": "os=Linux"})
+        self.assertEqual(1, len(response.json))
+        etag = response.headers["ETag"]
+        response = server.app.get(url, params={"q": "os=Linux"},
+                                  headers={"If-None-Match": etag}, status=304)
+        self.assertEqual(b"", response.body)
+        response = server.app.get(url, headers={"If-None-Match": etag})
+        self.assertEqual(2, len(response.json))
+        self.assertNotEqual(etag, response.headers["ETag"])
+
+        package_id = list(response.json)[0]
+        client.run("remove pkg/0.1@user/testing -p %s -r=default -f" % package_id)
+        response = server.app.get(url)
+        self.assertEqual(1, len(response.json))
+        self.assertNotIn(package_id, response.json)
+
+        client.run("remove pkg/0.1@user/testing -r=default -f")
+        client.run("upload pkg/0.1@user/testing")
+        response = server.app.get(url)
+        self.assertEqual({}, response.json)
+
+    def test_package_revisions(self):
+        client = TestClient(default_server_user=True, revisions_enabled=True)
+        server = client.servers["default"]
+        client.save({"conanfile.py": GenConanfile().with_settings("os")})
+        client.run("create . pkg/0.1@user/testing -s os=Linux")
+        client.run("create . pkg/0.1@user/testing -s os=Windows")
+        client.run("upload pkg/0.1@user/testing --all")
+        client.run("upload pkg/0.1@user/testing --all")
+        store = server.server_store
+
+        def search(**params):
+            with patch("conans.server.store.search_index.list_folder_subdirs") as list_folder,\
+                    patch.object(store, "get_last_package_revision") as last_revision:
+                response = server.app.get("/v2/conans/pkg/0.1/user/testing/search",
+                                          params=params)
+                # The latest revisions of the packages are in the index
+                self.assertFalse(list_folder.called)
+                self.assertFalse(last_revision.called)
+            return response.json
+
+        self.assertEqual(2, len(search()))
+        self.assertEqual(["Linux"], [info["settings"]["os"]
+                                     for info in search(q="os=Linux").values()])
+
+        package_id = list(search(q="os=Windows"))[0]
+        client.run("remove pkg/0.1@user/testing -p %s -r=default -f" % package_id)
+        self.assertEqual(["Linux"], [info["settings"]["os"] for info in search().values()])
+
+        # Built again from the store
+        os.remove(store.search_index._dbfile)
+        self.assertEqual(1, len(store.search_index.search_recipes()[0]))
+        self.assertEqual(["Linux"], [info["settings"]["os"] for info in search().values()])
+
+    def test_recipes_catalogue(self):
+        client = TestClient(default_server_user=True)
+        server = client.servers["default"]
+        client.save({"conanfile.py": GenConanfile()})
+        refs = ["zlib/1.0@user/testing", "zlib/1.1@user/testing", "zlib-ng/2.0@user/testing",
+                "openssl/1.0@user/testing", "Zlib/0.1@user/stable"]
+        for ref in refs:
+            client.run("export . %s" % ref)
+        client.run("upload * --confirm")
+
+        def search(pattern, *args):
+            client.run("search %s -r=default --raw %s" % (pattern, " ".join(args)))
+            return str(client.out).splitlines()
+
+        self.assertEqual(["Zlib/0.1@user/stable", "zlib/1.0@user/testing",
+                          "zlib/1.1@user/testing", "zlib-ng/2.0@user/testing"], search("zlib*"))
+        self.assertEqual(["zlib/1.0@user/testing", "zlib/1.1@user/testing"],
+                         search("zlib/*", "--case-sensitive"))
+        self.assertEqual(["Zlib/0.1@user/stable", "zlib/1.1@user/testing"],
+                         search("zlib/*.1@*"))
+        self.assertEqual(["openssl/1.0@user/testing", "zlib/1.0@user/testing"],
+                         search("*/1.0@*"))
+
+        response = server.app.get("/v2/conans/search", params={"limit": 2})
+        self.assertEqual(["Zlib/0.1@user/stable", "openssl/1.0@user/testing"],
+                         response.json["results"])
+        response = server.app.get("/v2/conans/search",
+                                  params={"limit": 2, "after": response.json["next"]})
+        self.assertEqual(["zlib/1.0@user/testing", "zlib/1.1@user/testing"],
+                         response.json["results"])
+        response = server.app.get("/v2/conans/search",
+                                  params={"limit": 2, "after": response.json["next"]})
+        self.assertEqual({"results": ["zlib-ng/2.0@user/testing"]}, response.json)
+        with patch("conans.client.rest.rest_client_common.SEARCH_PAGE_SIZE", 2):
+            self.assertEqual(5, len(search("*")))
+
+        client.run("remove zlib/1.1@user/testing -r=default -f")
+        self.assertEqual(["zlib/1.0@user/testing"], search("zlib/*", "--case-sensitive"))
+
+        # Built again from the store
+        os.remove(server.server_store.search_index._dbfile)
+        self.assertEqual(4, len(search("*")))
+
+        # The recipes copied to or removed from the store in other ways are detected
+        store = server.server_store.store
+        shutil.copytree(os.path.join(store, "zlib", "1.0"), os.path.join(store, "zlib", "2.0"))
+        shutil.rmtree(os.path.join(store, "openssl"))
+        self.assertEqual(["zlib/1.0@user/testing", "zlib/2.0@user/testing"],
+                         search("zlib/*", "--case-sensitive"))
+        self.assertEqual(4, len(search("*")))
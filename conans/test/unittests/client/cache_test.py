@@ -3,6 +3,7 @@
 import os
 import unittest
 
+from mock import patch
 from six import StringIO
 
 from conans.client.cache.cache import ClientCache
@@ -78,3 +79,14 @@ class CacheTest(unittest.TestCase):
             localdb = self.cache.localdb
             self.assertIsNotNone(localdb.encryption_key)
             self.assertEqual(localdb.encryption_key, "key")
+
+    def test_settings_parsed_once(self):
+        settings = self.cache.settings
+        settings.os = "Linux"
+        with patch("conans.client.cache.cache.Settings.loads") as loads:
+            settings = self.cache.settings
+        self.assertFalse(loads.called)
+        self.assertIsNone(settings.os.value)
+
+        save(self.cache.settings_path, "os: [Windows, MyOS]")
+        self.assertEqual(["MyOS", "Windows"], self.cache.settings.os.values_range)
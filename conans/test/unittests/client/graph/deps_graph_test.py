@@ -110,3 +110,31 @@ class DepsGraphTest(unittest.TestCase):
         deps.add_edge(n2, n32, None)
         deps.add_edge(n32, n5, None)
         self.assertEqual([[n5, n31], [n32], [n2], [n1]], deps.by_levels())
+
+    def test_levels_cache_invalidation(self):
+        ref1 = ConanFileReference.loads("Hello/1.0@user/stable")
+        ref2 = ConanFileReference.loads("Hello/2.0@user/stable")
+        ref3 = ConanFileReference.loads("Hello/3.0@user/stable")
+
+        deps = DepsGraph()
+        n1 = Node(ref1, 1, context=CONTEXT_HOST)
+        n2 = Node(ref2, 2, context=CONTEXT_HOST)
+        n3 = Node(ref3, 3, context=CONTEXT_HOST)
+        deps.add_node(n1)
+        deps.add_node(n2)
+        deps.add_edge(n1, n2, None)
+        levels = deps.by_levels()
+        self.assertEqual([[n2], [n1]], levels)
+        self.assertEqual([[n1], [n2]], deps.inverse_levels())
+        # The returned levels can be modified by the caller without affecting the graph
+        levels.pop()
+        levels[0].append(n3)
+        self.assertEqual([[n2], [n1]], deps.by_levels())
+
+        deps.add_node(n3)
+        self.assertEqual([[n2, n3], [n1]], deps.by_levels())
+        deps.add_edge(n2, n3, None)
+        self.assertEqual([[n3], [n2], [n1]], deps.by_levels())
+        self.assertEqual([[n1], [n2], [n3]], deps.inverse_levels())
+        # A subset only takes into account the edges between its nodes
+        self.assertEqual([[n1, n3]], deps.by_levels(nodes_subset={n1, n3}))
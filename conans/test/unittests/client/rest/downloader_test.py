@@ -1,11 +1,18 @@
+import os
 import re
 import tempfile
 import unittest
 
+import six
+
+from conans.client.cmd.uploader import compress_files
 from conans.client.downloaders.file_downloader import FileDownloader
+from conans.client.downloaders.tgz_stream_extractor import TgzStreamExtractor
 from conans.errors import ConanException
+from conans.paths import PACKAGE_TGZ_NAME
 from conans.test.utils.mocks import TestBufferConanOutput
-from conans.util.files import load
+from conans.test.utils.test_files import temp_folder
+from conans.util.files import load, md5sum, save, save_files, sha1sum
 
 
 class _ConfigMock:
@@ -120,6 +127,24 @@ class DownloaderUnitTest(unittest.TestCase):
         with self.assertRaisesRegexp(ConanException, r"Incorrect Content-Range header"):
             downloader.download("fake_url", file_path=self.target)
 
+    def test_resume_download_of_changed_file(self):
+        class ChangedFileRequester(MockRequester):
+            """ the file is replaced after the interrupted download, the Range is not served
+            """
+            def get(self, *args, **kwargs):
+                if_range = (kwargs.get("headers") or {}).get("If-Range")
+                if if_range is not None:
+                    assert if_range == '"old"'
+                    self._data, self._chunk_size, self._accept_ranges = b"new data", 8, False
+                return super(ChangedFileRequester, self).get(*args, **kwargs)
+
+        requester = ChangedFileRequester(b"old data", chunk_size=4,
+                                         echo_header={"ETag": '"old"'})
+        downloader = FileDownloader(requester=requester, output=self.out, verify=None,
+                                    config=_ConfigMock())
+        downloader.download("fake_url", file_path=self.target)
+        self.assertEqual(b"new data", load(self.target, binary=True))
+
     def test_download_with_compressed_content_and_bigger_content_length(self):
         expected_content = b"some data"
         echo_header = {"Content-Encoding": "gzip", "Content-Length": len(expected_content) + 1}
@@ -139,3 +164,38 @@ class DownloaderUnitTest(unittest.TestCase):
         downloader.download("fake_url", file_path=self.target)
         actual_content = load(self.target, binary=True)
         self.assertEqual(expected_content, actual_content)
+
+    def test_stream_extract_tgz(self):
+        folder = temp_folder()
+        save_files(folder, {"include/header.h": "header", "lib/mylib.a": "x" * 300000})
+        tgz_path = compress_files({"include/header.h": os.path.join(folder, "include/header.h"),
+                                   "lib/mylib.a": os.path.join(folder, "lib/mylib.a")},
+                                  {}, PACKAGE_TGZ_NAME, temp_folder())
+        data = load(tgz_path, binary=True)
+        downloader = FileDownloader(requester=MockRequester(data), output=self.out, verify=None,
+                                    config=_ConfigMock())
+
+        dest_folder = temp_folder()
+        extractor = TgzStreamExtractor(PACKAGE_TGZ_NAME, dest_folder)
+        downloader.download("fake_url", stream=extractor, md5=md5sum(tgz_path))
+        self.assertEqual("header", load(os.path.join(dest_folder, "include", "header.h")))
+        self.assertEqual("x" * 300000, load(os.path.join(dest_folder, "lib", "mylib.a")))
+        self.assertEqual(sha1sum(tgz_path), extractor.checksums["sha1"])
+
+        extractor = TgzStreamExtractor(PACKAGE_TGZ_NAME, dest_folder)
+        with six.assertRaisesRegex(self, ConanException, "md5 signature failed"):
+            downloader.download("fake_url", stream=extractor, md5="kk")
+        self.assertFalse(os.path.exists(dest_folder))
+
+    def test_stream_extract_interrupted(self):
+        header = os.path.join(temp_folder(), "header.h")
+        save(header, "header")
+        tgz_path = compress_files({"header.h": header}, {}, PACKAGE_TGZ_NAME, temp_folder())
+        data = load(tgz_path, binary=True)
+        downloader = FileDownloader(requester=MockRequester(data, chunk_size=len(data) // 2),
+                                    output=self.out, verify=None, config=_ConfigMock())
+        dest_folder = temp_folder()
+        extractor = TgzStreamExtractor(PACKAGE_TGZ_NAME, dest_folder)
+        with six.assertRaisesRegex(self, ConanException, "Error while downloading/extracting"):
+            downloader.download("fake_url", stream=extractor)
+        self.assertFalse(os.path.exists(dest_folder))
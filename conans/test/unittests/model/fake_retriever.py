@@ -1,4 +1,5 @@
 import os
+from contextlib import contextmanager
 
 from conans import DEFAULT_REVISION_V1
 from conans.client.graph.graph import Node, RECIPE_CONSUMER, CONTEXT_HOST
@@ -31,3 +32,10 @@ class Retriever(object):
     def get_recipe(self, ref, check_updates, update, remote_name, recorder):  # @UnusedVariable
         conan_path = os.path.join(self.folder, "data", ref.dir_repr(), CONANFILE)
         return conan_path, None, None, ref.copy_with_rev(DEFAULT_REVISION_V1)
+
+    @contextmanager
+    def recipes_prefetch(self):
+        yield
+
+    def prefetch_recipes(self, refs, remotes, check_updates=False):  # @UnusedVariable
+        pass
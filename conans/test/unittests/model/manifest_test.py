@@ -1,7 +1,13 @@
 import os
+import time
 import unittest
+from multiprocessing.pool import ThreadPool
 
-from conans.model.manifest import FileTreeManifest
+from mock import patch
+
+from conans.client.tools import environment_append
+from conans.model.manifest import FileTreeManifest, PARALLEL_HASH_MIN_BYTES, forget_hashes
+from conans.util.files import md5sum
 from conans.test.utils.test_files import temp_folder
 from conans.util.files import load, md5, save
 
@@ -45,3 +51,61 @@ class ManifestTest(unittest.TestCase):
         # Not included the pycs or pyo
         self.assertEqual(set(read_manifest.file_sums.keys()),
                           set(["conanfile.py"]))
+
+    def test_hash_cache(self):
+        tmp_dir = temp_folder()
+        dbfile = os.path.join(temp_folder(), "hashes.sqlite")
+        files = {"file%d.txt" % i: "content %d" % i for i in range(10)}
+        files["racy.txt"] = "modified right now"
+        for filename, content in files.items():
+            save(os.path.join(tmp_dir, filename), content)
+            if filename != "racy.txt":
+                past = time.time() - 100
+                os.utime(os.path.join(tmp_dir, filename), (past, past))
+
+        def create():
+            with patch("conans.model.manifest.md5sum", side_effect=md5sum) as hashed:
+                manifest = FileTreeManifest.create(tmp_dir)
+            hashed_files = set(os.path.basename(c[0][0]) for c in hashed.call_args_list)
+            return manifest, hashed_files
+
+        with environment_append({"CONAN_MANIFEST_HASH_CACHE": dbfile}):
+            manifest, hashed = create()
+            self.assertEqual(set(files), hashed)
+            for filename, content in files.items():
+                self.assertEqual(md5(content), manifest.file_sums[filename])
+
+            # Unchanged files are not read again, the recently modified is not trusted
+            manifest2, hashed = create()
+            self.assertEqual({"racy.txt"}, hashed)
+            self.assertEqual(manifest, manifest2)
+
+            # Modifying a file, even keeping its size and modification time, is detected
+            path = os.path.join(tmp_dir, "file1.txt")
+            stat = os.stat(path)
+            os.remove(path)
+            save(path, "CONTENT 1")
+            os.utime(path, (stat.st_atime, stat.st_mtime))
+            manifest3, hashed = create()
+            self.assertEqual({"racy.txt", "file1.txt"}, hashed)
+            self.assertEqual(md5("CONTENT 1"), manifest3.file_sums["file1.txt"])
+
+            # The hashes of a removed folder are dropped
+            forget_hashes(tmp_dir)
+            _, hashed = create()
+            self.assertEqual(set(files), hashed)
+
+    def test_parallel_only_big_files(self):
+        tmp_dir = temp_folder()
+        files = {"file%d.txt" % i: "content %d" % i for i in range(10)}
+        for filename, content in files.items():
+            save(os.path.join(tmp_dir, filename), content)
+        with patch("conans.model.manifest.ThreadPool", side_effect=ThreadPool) as pool:
+            manifest = FileTreeManifest.create(tmp_dir)
+            self.assertFalse(pool.called)
+
+            save(os.path.join(tmp_dir, "big.bin"), "x" * PARALLEL_HASH_MIN_BYTES)
+            manifest_big = FileTreeManifest.create(tmp_dir)
+            self.assertTrue(pool.called)
+        self.assertEqual(manifest.file_sums, {f: m for f, m in manifest_big.file_sums.items()
+                                              if f != "big.bin"})
@@ -1,3 +1,4 @@
+import textwrap
 import unittest
 
 import six
@@ -6,6 +7,61 @@ from conans.errors import ConanException
 from conans.model.settings import Settings, bad_value_msg, undefined_field, undefined_value
 
 
+class SettingsCopyTest(unittest.TestCase):
+
+    def setUp(self):
+        self.settings = Settings.loads(textwrap.dedent("""
+            os: [Windows, Linux]
+            compiler:
+                gcc:
+                    version: ["8", "9"]
+                    libcxx: [libstdc++, libstdc++11]
+                Visual Studio:
+                    runtime: [MD, MT]
+            build_type: [None, Debug, Release]
+            """))
+        self.settings.compiler = "gcc"
+        self.settings.compiler.version = "8"
+
+    def test_copies_independent(self):
+        copy = self.settings.copy()
+        copy2 = copy.copy()
+        copy.compiler.version = "9"
+        copy.compiler.libcxx = "libstdc++11"
+        copy2.compiler = "Visual Studio"
+        copy2.compiler.runtime = "MT"
+        self.settings.os = "Linux"
+
+        self.assertEqual("compiler=gcc\ncompiler.version=8\nos=Linux",
+                         self.settings.values.dumps())
+        self.assertEqual("compiler=gcc\ncompiler.libcxx=libstdc++11\ncompiler.version=9",
+                         copy.values.dumps())
+        self.assertEqual("compiler=Visual Studio\ncompiler.runtime=MT", copy2.values.dumps())
+
+    def test_copies_remove(self):
+        copy = self.settings.copy()
+        copy.compiler.remove("Visual Studio")
+        copy.compiler.version.remove("9")
+        del copy.compiler.libcxx
+        copy.remove("build_type")
+        copy.constraint({"os": ["Linux"], "compiler": None})
+
+        self.assertEqual(["compiler", "os"], copy.fields)
+        self.assertEqual(["Linux"], copy.os.values_range)
+        self.assertEqual(["gcc"], copy.compiler.values_range)
+        self.assertEqual(["8"], copy.compiler.version.values_range)
+        with six.assertRaisesRegex(self, ConanException, "'settings.compiler.libcxx' doesn't"):
+            copy.compiler.libcxx = "libstdc++"
+
+        self.assertEqual(["build_type", "compiler", "os"], self.settings.fields)
+        self.assertEqual(["Linux", "Windows"], self.settings.os.values_range)
+        self.assertEqual(["Visual Studio", "gcc"], self.settings.compiler.values_range)
+        self.assertEqual(["8", "9"], self.settings.compiler.version.values_range)
+        self.settings.compiler.libcxx = "libstdc++"
+        self.settings.compiler = "Visual Studio"
+        self.settings.compiler.runtime = "MD"
+
+
 class SettingsLoadsTest(unittest.TestCase):
 
     def test_none_value(self):
@@ -68,7 +68,7 @@ class MockRemoteManager(object):
         self.packages = packages or []
         self.count = Counter()
 
-    def search_recipes(self, remote, pattern, ignorecase):  # @UnusedVariable
+    def search_recipes(self, remote, pattern, ignorecase, cached=False):  # @UnusedVariable
         self.count[pattern] += 1
         return self.packages
 
@@ -87,6 +87,7 @@ class GraphTest(unittest.TestCase):
                                         self.resolver, None)
         cache = Mock()
         cache.config.default_package_id_mode = "semver_direct_mode"
+        cache.config.parallel_download = None
         self.binaries_analyzer = GraphBinariesAnalyzer(cache, self.output, self.remote_manager)
 
     def build_graph(self, content, options="", settings=""):
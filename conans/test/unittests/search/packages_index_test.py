@@ -0,0 +1,78 @@
+import os
+import sqlite3
+import unittest
+from collections import OrderedDict
+
+from mock import patch
+
+from conans.model.info import ConanInfo
+from conans.search.packages_index import create_tables, postfix_to_sql, query_package_infos, \
+    sync_package_infos
+from conans.search.query_parse import infix_to_postfix
+from conans.search.search import filter_packages
+from conans.test.utils.test_files import temp_folder
+from conans.util.files import save
+
+conaninfo = """[settings]
+    arch=%s
+    compiler=gcc
+    compiler.version=%s
+    os=%s
+[options]
+    %s
+[recipe_hash]
+    hash%s
+"""
+
+
+class PackagesIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        folder = temp_folder()
+        self.paths = OrderedDict()
+        for i, (arch, version, os_, options) in enumerate([
+                ("x86", "4.9", "Linux", "shared=True"),
+                ("x86_64", "4.9", "Linux", "shared=False"),
+                ("x86_64", "7", "Windows", "shared=False\n    fPIC=True"),
+                ("armv8", "7", "Macos", "")]):
+            path = os.path.join(folder, "pkg%s" % i, "conaninfo.txt")
+            save(path, conaninfo % (arch, version, os_, options, i))
+            self.paths["pkg%s" % i] = path
+        self.connection = sqlite3.connect(":memory:")
+        self.cursor = self.connection.cursor()
+        create_tables(self.cursor)
+
+    def tearDown(self):
+        self.connection.close()
+
+    def test_same_results_as_filter_packages(self):
+        sync_package_infos(self.cursor, "ref", self.paths)
+        infos = OrderedDict()
+        for package_id, path in self.paths.items():
+            with open(path) as f:
+                infos[package_id] = ConanInfo.loads(f.read()).serialize_min()
+        for query in ['arch="x86_64"', "os=Linux AND shared=True", "os=Linux OR os=Macos",
+                      "compiler.version=7 AND (arch=armv8 OR fPIC=True)",
+                      "fPIC=None", "shared=None", "os=None", "os=FreeBSD", ""]:
+            condition = postfix_to_sql(infix_to_postfix(query))
+            result = query_package_infos(self.cursor, "ref", condition)
+            self.assertEqual(filter_packages(query, infos), result, query)
+
+    def test_only_modified_parsed(self):
+        with patch("conans.search.packages_index.ConanInfo.loads",
+                   side_effect=ConanInfo.loads) as loads:
+            sync_package_infos(self.cursor, "ref", self.paths)
+            self.assertEqual(4, loads.call_count)
+            sync_package_infos(self.cursor, "ref", self.paths)
+            self.assertEqual(4, loads.call_count)
+
+            save(self.paths["pkg0"], conaninfo % ("x86", "4.9", "Linux", "shared=False", 0))
+            del self.paths["pkg3"]
+            sync_package_infos(self.cursor, "ref", self.paths)
+            self.assertEqual(5, loads.call_count)
+
+        result = query_package_infos(self.cursor, "ref", postfix_to_sql(["shared=False"]))
+        self.assertEqual({"pkg0", "pkg1", "pkg2"}, set(result))
+        result = query_package_infos(self.cursor, "ref", postfix_to_sql([]))
+        self.assertEqual({"pkg0", "pkg1", "pkg2"}, set(result))
+        self.assertEqual("hash0", result["pkg0"]["recipe_hash"])
@@ -0,0 +1,102 @@
+import os
+import threading
+import time
+import unittest
+from multiprocessing.pool import ThreadPool
+
+import bottle
+import pytest
+import requests
+
+from conans.server.rest.wsgi_server import ConanWSGIServer
+from conans.test.utils.test_files import temp_folder
+from conans.test.utils.tools import get_free_port
+from conans.util.files import save
+
+
+def _serve(app, threads):
+    """ :return: (url, server), the server has to be shut down
+    """
+    port = get_free_port()
+    server = ConanWSGIServer(host="127.0.0.1", port=port, threads=threads)
+    thread = threading.Thread(target=bottle.run, kwargs={"app": app, "server": server,
+                                                         "quiet": True})
+    thread.daemon = True
+    thread.start()
+    url = "http://127.0.0.1:%s" % port
+    for _ in range(50):
+        try:
+            requests.get(url + "/ping")
+            break
+        except requests.ConnectionError:
+            time.sleep(0.1)
+    return url, server
+
+
+def _app(folder):
+    app = bottle.Bottle()
+
+    @app.route("/ping")
+    def ping():
+        return "pong"
+
+    @app.route("/slow")
+    def slow():
+        time.sleep(0.5)
+        return "slow"
+
+    @app.route("/files/<the_path>")
+    def get_file(the_path):
+        return bottle.static_file(the_path, root=folder)
+
+    return app
+
+
+class ConanWSGIServerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = temp_folder()
+        self.contents = os.urandom(3 * 1024 * 1024)
+        save(os.path.join(self.folder, "file.bin"), self.contents)
+
+    def test_concurrent_requests(self):
+        url, server = _serve(_app(self.folder), threads=4)
+        self.addCleanup(server.shutdown)
+        pool = ThreadPool(4)
+        start = time.time()
+        responses = pool.map(lambda _: requests.get(url + "/slow").text, range(4))
+        self.assertEqual(["slow"] * 4, responses)
+        self.assertLess(time.time() - start, 1.5)  # Not one after the other
+        pool.close()
+
+    def test_download(self):
+        for threads in (1, 4):
+            url, server = _serve(_app(self.folder), threads=threads)
+            self.addCleanup(server.shutdown)
+            response = requests.get(url + "/files/file.bin")
+            self.assertEqual(200, response.status_code)
+            self.assertEqual(self.contents, response.content)
+            response = requests.get(url + "/files/file.bin", headers={"Range": "bytes=10-19"})
+            self.assertEqual(206, response.status_code)
+            self.assertEqual(self.contents[10:20], response.content)
+            self.assertEqual(404, requests.get(url + "/files/missing.bin").status_code)
+
+    @pytest.mark.slow
+    def test_throughput_benchmark(self):
+        """ downloads of a file by N concurrent clients, served by 1 and N threads
+        """
+        clients = 8
+        requests_count = 64
+        for threads in (1, clients):
+            url, server = _serve(_app(self.folder), threads=threads)
+            self.addCleanup(server.shutdown)
+            pool = ThreadPool(clients)
+            start = time.time()
+            sizes = pool.map(lambda _: len(requests.get(url + "/files/file.bin").content),
+                             range(requests_count))
+            elapsed = time.time() - start
+            pool.close()
+            self.assertEqual([len(self.contents)] * requests_count, sizes)
+            print("%s clients, %s threads: %.1f requests/s, %.1f MB/s"
+                  % (clients, threads, requests_count / elapsed,
+                     sum(sizes) / elapsed / 1024 / 1024))
@@ -40,6 +40,15 @@ class ClientConfTest(unittest.TestCase):
         config = ConanClientConfigParser(os.path.join(tmp_dir, CONAN_CONF))
         self.assertEqual(config.env_vars["CONAN_TRACE_FILE"], "Path/with/quotes")
 
+    def test_manifest_hash_cache(self):
+        tmp_dir = temp_folder()
+        save(os.path.join(tmp_dir, CONAN_CONF), "")
+        config = ConanClientConfigParser(os.path.join(tmp_dir, CONAN_CONF))
+        self.assertNotIn("CONAN_MANIFEST_HASH_CACHE", config.env_vars)
+        save(os.path.join(tmp_dir, CONAN_CONF), "[general]\nmanifest_hash_cache=/tmp/hashes.db")
+        config = ConanClientConfigParser(os.path.join(tmp_dir, CONAN_CONF))
+        self.assertEqual("/tmp/hashes.db", config.env_vars["CONAN_MANIFEST_HASH_CACHE"])
+
     def test_proxies(self):
         tmp_dir = temp_folder()
         save(os.path.join(tmp_dir, CONAN_CONF), "")
@@ -1,16 +1,23 @@
 # coding=utf-8
 
+import io
 import os
 import platform
+import stat
 import tarfile
+import time
 import unittest
 
 import pytest
+from mock import patch
 
+from conans.client.tools import environment_append
 from conans.client.tools.files import chdir
 from conans.model.manifest import gather_files
 from conans.test.utils.test_files import temp_folder
-from conans.util.files import tar_extract, gzopen_without_timestamps, save
+from conans.util.files import tar_extract, gzopen_without_timestamps, load, save, save_files
+from conans.util import parallel_tar
+from conans.util.parallel_tar import MAX_MEMBER_SIZE
 
 
 class TarExtractTest(unittest.TestCase):
@@ -63,3 +70,71 @@ class TarExtractTest(unittest.TestCase):
             with open(self.tgz_file, 'rb') as file_handler:
                 tar_extract(file_handler, destination_dir)
             check_files(destination_dir)
+
+
+class ParallelTarExtractTest(unittest.TestCase):
+
+    def _tgz(self, folder):
+        tgz_path = os.path.join(temp_folder(), "file.tgz")
+        with open(tgz_path, "wb") as tgz_handle:
+            tgz = gzopen_without_timestamps("name", mode="w", fileobj=tgz_handle)
+            tgz.add(folder, arcname=".")
+            bad = tarfile.TarInfo(name="../outside.txt")
+            tgz.addfile(bad, io.BytesIO(b""))
+            tgz.close()
+        return tgz_path
+
+    def test_same_as_serial(self):
+        folder = temp_folder()
+        files = {"include/h%d.h" % i: "header %d" % i for i in range(300)}
+        files["lib/big.a"] = "x" * (2 * MAX_MEMBER_SIZE)
+        save_files(folder, files)
+        os.chmod(os.path.join(folder, "include", "h0.h"), 0o755)
+        if platform.system() != "Windows":
+            os.symlink("h1.h", os.path.join(folder, "include", "link.h"))
+            os.symlink("include", os.path.join(folder, "include_link"))
+        tgz_path = self._tgz(folder)
+
+        results = []
+        for threads in ("1", "8"):
+            dest = os.path.join(temp_folder(), "dest")
+            with environment_append({"CONAN_EXTRACT_THREADS": threads}):
+                with open(tgz_path, "rb") as f:
+                    results.append(tar_extract(f, dest))
+                with open(tgz_path, "rb") as f:  # Also streaming
+                    self.assertEqual(results[-1], tar_extract(f, dest, stream=True))
+            for name, content in files.items():
+                self.assertEqual(content, load(os.path.join(dest, name)))
+            self.assertTrue(os.stat(os.path.join(dest, "include", "h0.h")).st_mode & stat.S_IXUSR)
+            if platform.system() != "Windows":
+                self.assertEqual("h1.h", os.readlink(os.path.join(dest, "include", "link.h")))
+                self.assertEqual("include", os.readlink(os.path.join(dest, "include_link")))
+            self.assertFalse(os.path.exists(os.path.join(dest, "..", "outside.txt")))
+        self.assertEqual(results[0], results[1])
+        self.assertEqual(301, results[0][0])
+
+    def test_duplicated_members(self):
+        tgz_path = os.path.join(temp_folder(), "file.tgz")
+        with open(tgz_path, "wb") as tgz_handle:
+            tgz = gzopen_without_timestamps("name", mode="w", fileobj=tgz_handle)
+            for i in range(50):
+                for content in (b"first", b"last"):
+                    info = tarfile.TarInfo(name="file%d.txt" % i)
+                    info.size = len(content)
+                    tgz.addfile(info, io.BytesIO(content))
+            tgz.close()
+
+        write_member = parallel_tar._write_member
+
+        def slow_first(the_tar, tarinfo, data, destination_dir):
+            if data == b"first":
+                time.sleep(0.01)
+            write_member(the_tar, tarinfo, data, destination_dir)
+
+        dest = os.path.join(temp_folder(), "dest")
+        with environment_append({"CONAN_EXTRACT_THREADS": "8"}):
+            with patch.object(parallel_tar, "_write_member", side_effect=slow_first):
+                with open(tgz_path, "rb") as f:
+                    tar_extract(f, dest)
+        for i in range(50):
+            self.assertEqual("last", load(os.path.join(dest, "file%d.txt" % i)))
@@ -0,0 +1,98 @@
+import os
+import subprocess
+import sys
+import textwrap
+import threading
+import time
+import unittest
+
+import pytest
+
+from conans.test.utils.mocks import TestBufferConanOutput
+from conans.test.utils.test_files import temp_folder
+from conans.util.locks import KERNEL_LOCKS, KernelReadLock, KernelWriteLock
+
+
+@pytest.mark.skipif(not KERNEL_LOCKS, reason="Requires fcntl")
+class KernelLockTest(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = os.path.join(temp_folder(), "data", "pkg", "0.1", "user", "channel")
+        self.output = TestBufferConanOutput()
+
+    def _lock(self, lock_class):
+        return lock_class(self.folder, "pkg/0.1@user/channel", self.output)
+
+    def _acquire_in_thread(self, lock_class, acquired):
+        def acquire():
+            with self._lock(lock_class):
+                acquired.append(time.time())
+
+        thread = threading.Thread(target=acquire)
+        thread.start()
+        return thread
+
+    def test_readers_writer(self):
+        acquired = []
+        with self._lock(KernelReadLock):
+            with self._lock(KernelReadLock):  # Shared by the readers
+                thread = self._acquire_in_thread(KernelWriteLock, acquired)
+                time.sleep(0.2)
+                self.assertEqual([], acquired)
+                self.assertIn("is locked by another concurrent conan process", self.output)
+            time.sleep(0.2)
+            self.assertEqual([], acquired)
+            released = time.time()
+        thread.join()
+        # The writer is woken up as soon as the readers release it, without polling
+        self.assertLess(acquired[0] - released, 0.2)
+
+        with self._lock(KernelWriteLock):
+            thread = self._acquire_in_thread(KernelReadLock, acquired)
+            time.sleep(0.2)
+            self.assertEqual(1, len(acquired))
+        thread.join()
+        self.assertEqual(2, len(acquired))
+
+    def test_released_by_dead_process(self):
+        code = textwrap.dedent("""
+            import sys, time
+            from conans.util.locks import KernelWriteLock
+            with KernelWriteLock(sys.argv[1], "pkg", None):
+                sys.stdout.write("locked\\n")
+                sys.stdout.flush()
+                time.sleep(60)
+            """)
+        env = os.environ.copy()
+        env["PYTHONPATH"] = os.pathsep.join(sys.path)
+        process = subprocess.Popen([sys.executable, "-c", code, self.folder], env=env,
+                                   stdout=subprocess.PIPE)
+        self.assertEqual(b"locked\n", process.stdout.readline())
+        acquired = []
+        thread = self._acquire_in_thread(KernelReadLock, acquired)
+        time.sleep(0.2)
+        self.assertEqual([], acquired)
+        process.kill()
+        process.communicate()
+        thread.join()
+        self.assertEqual(1, len(acquired))
+
+    def test_removed_while_waiting(self):
+        acquired = []
+        lock = self._lock(KernelWriteLock)
+        with lock:
+            thread = self._acquire_in_thread(KernelWriteLock, acquired)
+            time.sleep(0.2)
+            os.remove(lock.files[0])
+            # A new lock file, the waiting thread must not own a lock of the removed one
+            with self._lock(KernelWriteLock):
+                time.sleep(0.2)
+                self.assertEqual([], acquired)
+        thread.join()
+        self.assertEqual(1, len(acquired))
+
+    def test_clean_on_error(self):
+        with self.assertRaises(ValueError):
+            with self._lock(KernelWriteLock):
+                raise ValueError()
+        self.assertFalse(os.path.exists(os.path.dirname(self.folder)))
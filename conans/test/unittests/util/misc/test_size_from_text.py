@@ -0,0 +1,21 @@
+import unittest
+
+import six
+
+from conans.errors import ConanException
+from conans.util.misc import size_from_text
+
+
+class SizeFromTextTestCase(unittest.TestCase):
+    def test_units(self):
+        self.assertEqual(size_from_text("512"), 512)
+        self.assertEqual(size_from_text("512B"), 512)
+        self.assertEqual(size_from_text("10KB"), 10 * 1024)
+        self.assertEqual(size_from_text("1.5M"), int(1.5 * 1024 ** 2))
+        self.assertEqual(size_from_text("2 gb"), 2 * 1024 ** 3)
+        self.assertEqual(size_from_text("1T"), 1024 ** 4)
+
+    def test_errors(self):
+        for size in ("", "GB", "1ZB", "-1", "1 2"):
+            with six.assertRaisesRegex(self, ConanException, "Incorrect size definition"):
+                size_from_text(size)
@@ -0,0 +1,59 @@
+import gzip
+import io
+import os
+import random
+import unittest
+
+from conans.client.cmd.uploader import compress_files
+from conans.client.tools import environment_append
+from conans.test.utils.test_files import temp_folder
+from conans.util.files import load, save, tar_extract
+from conans.util.parallel_gzip import BLOCK_SIZE, ParallelGzipWriter
+
+
+class ParallelGzipWriterTest(unittest.TestCase):
+
+    @staticmethod
+    def _compress(data, threads):
+        output = io.BytesIO()
+        writer = ParallelGzipWriter("file.tgz", output, 9, threads)
+        # Small writes not aligned with the blocks
+        for i in range(0, len(data), 100000):
+            writer.write(data[i:i + 100000])
+        writer.close()
+        return output.getvalue()
+
+    def test_standard_and_deterministic(self):
+        rand = random.Random(1)
+        data = bytes(bytearray(rand.randint(0, 20) for _ in range(3 * BLOCK_SIZE + 1234)))
+        compressed = self._compress(data, threads=4)
+        self.assertEqual(data, gzip.GzipFile(fileobj=io.BytesIO(compressed)).read())
+        # The result doesn't depend on the threads
+        self.assertEqual(compressed, self._compress(data, threads=2))
+
+        with gzip.GzipFile(fileobj=io.BytesIO(compressed)) as f:
+            f.read()
+            self.assertEqual(0, f.mtime)
+
+    def test_empty(self):
+        compressed = self._compress(b"", threads=2)
+        self.assertEqual(b"", gzip.GzipFile(fileobj=io.BytesIO(compressed)).read())
+
+    def test_compress_files(self):
+        folder = temp_folder()
+        files = {"file%d.txt" % i: os.path.join(folder, "file%d.txt" % i) for i in range(10)}
+        for name, path in files.items():
+            save(path, name * 100000)
+        with environment_append({"CONAN_COMPRESSION_THREADS": "4"}):
+            tgz_path = compress_files(files, {}, "conan_package.tgz", temp_folder())
+
+        dest_folder = temp_folder()
+        with open(tgz_path, "rb") as f:
+            tar_extract(f, dest_folder)
+        for name in files:
+            self.assertEqual(name * 100000, load(os.path.join(dest_folder, name)))
+
+        # A single thread produces the same file
+        with environment_append({"CONAN_COMPRESSION_THREADS": "1"}):
+            single_path = compress_files(files, {}, "conan_package.tgz", temp_folder())
+        self.assertEqual(load(tgz_path, binary=True), load(single_path, binary=True))
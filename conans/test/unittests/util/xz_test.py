@@ -7,11 +7,12 @@ import six
 from six import StringIO
 import pytest
 
-from conans import DEFAULT_REVISION_V1
+from conans import DEFAULT_REVISION_V1, REVISIONS
 from conans.client.output import ConanOutput
 from conans.client.tools.files import save, unzip
 from conans.errors import ConanException
 from conans.model.ref import ConanFileReference, PackageReference
+from conans.test.assets.genconanfile import GenConanfile
 from conans.test.utils.test_files import temp_folder
 from conans.test.utils.tools import NO_SETTINGS_PACKAGE_ID, TestClient, TestServer
 from conans.test.utils.mocks import TestBufferConanOutput
@@ -74,12 +75,53 @@ class Pkg(ConanFile):
                                                                              DEFAULT_REVISION_V1))
 
         package = server.server_store.package(pref)
+        # txz packages are supported, but not other formats
         save_files(package, {"conaninfo.txt": "#",
                              "conanmanifest.txt": "1",
-                             "conan_package.txz": "#"})
+                             "conan_package.tzst": "#"})
         client.run("install Pkg/0.1@user/channel", assert_error=True)
         self.assertIn("ERROR: This Conan version is not prepared to handle "
-                      "'conan_package.txz' file format", client.out)
+                      "'conan_package.tzst' file format", client.out)
+
+    @pytest.mark.skipif(not six.PY3, reason="only Py3")
+    def test_package_txz(self):
+        client = TestClient(default_server_user=True)
+        client.save({"conanfile.py": GenConanfile().with_package_file("include/header.h",
+                                                                      "header")})
+        client.run("create . pkg/0.1@user/channel")
+        client.run("config set general.compression_format=txz")
+        client.run("upload * --all --confirm")
+        pref = PackageReference(ConanFileReference.loads("pkg/0.1@user/channel"),
+                                NO_SETTINGS_PACKAGE_ID)
+        self.assertTrue(os.path.exists(os.path.join(client.cache.package_layout(pref.ref)
+                                                    .download_package(pref),
+                                                    "conan_package.txz")))
+
+        client2 = TestClient(servers=client.servers)
+        client2.run("install pkg/0.1@user/channel")
+        package_folder = client2.cache.package_layout(pref.ref).package(pref)
+        self.assertEqual("header", load(os.path.join(package_folder, "include", "header.h")))
+
+    @pytest.mark.skipif(not six.PY3, reason="only Py3")
+    def test_package_txz_not_supported_by_server(self):
+        server = TestServer(users={"user": "password"}, server_capabilities=[REVISIONS])
+        client = TestClient(servers={"default": server}, users={"default": [("user", "password")]})
+        client.save({"conanfile.py": GenConanfile()})
+        client.run("create . pkg/0.1@user/channel")
+        client.run("config set general.compression_format=txz")
+        client.run("upload * --all --confirm")
+        pref = PackageReference(ConanFileReference.loads("pkg/0.1@user/channel"),
+                                NO_SETTINGS_PACKAGE_ID)
+        download_folder = client.cache.package_layout(pref.ref).download_package(pref)
+        self.assertEqual(["conan_package.tgz"], os.listdir(download_folder))
+
+    def test_unsupported_compression_format(self):
+        client = TestClient(default_server_user=True)
+        client.save({"conanfile.py": GenConanfile()})
+        client.run("create . pkg/0.1@user/channel")
+        client.run("config set general.compression_format=zstd")
+        client.run("upload * --all --confirm", assert_error=True)
+        self.assertIn("Unsupported compression_format 'zstd'", client.out)
 
     @pytest.mark.skipif(not six.PY3, reason="only Py3")
     def test(self):
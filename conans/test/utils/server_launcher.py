@@ -41,7 +41,8 @@ class TestServerLauncher(object):
                                                    server_config.authorize_timeout)
         base_url = base_url or server_config.public_url
         self.server_store = get_server_store(server_config.disk_storage_path,
-                                             base_url, updown_auth_manager)
+                                             base_url, updown_auth_manager,
+                                             server_config.conan_folder)
 
         # Prepare some test users
         if not read_permissions:
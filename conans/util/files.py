@@ -17,6 +17,8 @@ from contextlib import contextmanager
 import six
 
 from conans.util.log import logger
+from conans.util.parallel_gzip import ParallelGzipWriter
+from conans.util.parallel_tar import parallel_extractall
 
 
 def walk(top, **kwargs):
@@ -282,6 +284,51 @@ def remove(path):
         raise
 
 
+_FICLONE = 0x40049409  # Linux ioctl to clone a file sharing its blocks (btrfs, xfs...)
+
+
+def _reflink(src, dst):
+    if platform.system() != "Linux":
+        return False
+    import fcntl
+    try:
+        with open(src, "rb") as src_file, open(dst, "wb") as dst_file:
+            fcntl.ioctl(dst_file.fileno(), _FICLONE, src_file.fileno())
+    except (IOError, OSError):
+        if os.path.exists(dst):
+            os.remove(dst)
+        return False
+    shutil.copystat(src, dst)
+    return True
+
+
+def _hardlink(src, dst):
+    if not hasattr(os, "link"):  # Python 2 in Windows
+        return False
+    try:
+        os.link(src, dst)
+    except (IOError, OSError):  # Different devices, filesystem without hardlinks...
+        return False
+    return True
+
+
+def link_or_copy(src, dst, hardlink=True):
+    """ Materializes the src file in dst without copying its contents when possible: a reflink
+    (copy-on-write clone) if the filesystem supports it, otherwise a hardlink, so src must be
+    read-only to not be modified through dst, and finally a regular copy
+    :param hardlink: False to never hardlink, dst is then an independent file, always writable
+    """
+    if os.path.lexists(dst):
+        remove(dst)
+    if hardlink:
+        if not _reflink(src, dst) and not _hardlink(src, dst):
+            shutil.copy2(src, dst)
+        return
+    if not _reflink(src, dst):
+        shutil.copy2(src, dst)
+    os.chmod(dst, os.stat(dst).st_mode | stat.S_IWRITE)
+
+
 def mkdir(path):
     """Recursive mkdir, doesnt fail if already existing"""
     if os.path.exists(path):
@@ -315,12 +362,18 @@ def gzopen_without_timestamps(name, mode="r", fileobj=None, **kwargs):
         previous tarfile open because arguments are not passed to GzipFile constructor
     """
     compresslevel = int(os.getenv("CONAN_COMPRESSION_LEVEL", 9))
+    # Defined, even to 1, the block format of ParallelGzipWriter is used, so the result doesn't
+    # depend on the number of threads. It is different from the output of gzip.GzipFile
+    threads = os.getenv("CONAN_COMPRESSION_THREADS")
 
     if mode not in ("r", "w"):
         raise ValueError("mode must be 'r' or 'w'")
 
     try:
-        fileobj = gzip.GzipFile(name, mode, compresslevel, fileobj, mtime=0)
+        if mode == "w" and threads and fileobj is not None:
+            fileobj = ParallelGzipWriter(name, fileobj, compresslevel, max(int(threads), 1))
+        else:
+            fileobj = gzip.GzipFile(name, mode, compresslevel, fileobj, mtime=0)
     except OSError:
         if fileobj is not None and mode == 'r':
             raise tarfile.ReadError("not a gzip file")
@@ -342,9 +395,16 @@ def gzopen_without_timestamps(name, mode="r", fileobj=None, **kwargs):
     return t
 
 
-def tar_extract(fileobj, destination_dir):
+def tar_extract(fileobj, destination_dir, stream=False):
     """Extract tar file controlling not absolute paths and fixing the routes
-    if the tar was zipped in windows"""
+    if the tar was zipped in windows. With stream=True the fileobj is read sequentially,
+    without seeking, so it can be a non-seekable stream.
+    The files are written by CONAN_EXTRACT_THREADS threads, if defined
+    :return: (number of extracted files, their size in bytes)
+    """
+    threads = int(os.getenv("CONAN_EXTRACT_THREADS", 1))
+    extracted = [0, 0]
+
     def badpath(path, base):
         # joinpath will ignore base if path is absolute
         return not realpath(abspath(joinpath(base, path))).startswith(base)
@@ -359,14 +419,21 @@ def tar_extract(fileobj, destination_dir):
             else:
                 # Fixes unzip a windows zipped file in linux
                 finfo.name = finfo.name.replace("\\", "/")
+                if finfo.isreg():
+                    extracted[0] += 1
+                    extracted[1] += finfo.size
                 yield finfo
 
-    the_tar = tarfile.open(fileobj=fileobj)
+    the_tar = tarfile.open(fileobj=fileobj, mode="r|*" if stream else "r")
     # NOTE: The errorlevel=2 has been removed because it was failing in Win10, it didn't allow to
     # "could not change modification time", with time=0
     # the_tar.errorlevel = 2  # raise exception if any error
-    the_tar.extractall(path=destination_dir, members=safemembers(the_tar))
+    if threads > 1:
+        parallel_extractall(the_tar, safemembers(the_tar), destination_dir, threads)
+    else:
+        the_tar.extractall(path=destination_dir, members=safemembers(the_tar))
     the_tar.close()
+    return extracted[0], extracted[1]
 
 
 def list_folder_subdirs(basedir, level):
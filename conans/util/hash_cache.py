@@ -0,0 +1,113 @@
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+
+from conans.util.log import logger
+
+HASHES_TABLE = "hashes"
+# Files modified this recently are not cached: another write within the resolution of the
+# filesystem timestamps could change the contents without changing the stat key
+RACY_SECONDS = 2
+
+
+def _ns(st, name):
+    value = getattr(st, "st_%s_ns" % name, None)
+    if value is None:  # Python 2
+        value = int(getattr(st, "st_%s" % name) * 1000000000)
+    return value
+
+
+def stat_key(path):
+    """ the (size, mtime_ns, inode, ctime_ns) that identifies the current contents of a file.
+    Any write or replacement of the file changes it. The ctime, that cannot be set, detects
+    the replacements reusing the inode and restoring the size and modification time
+    """
+    st = os.stat(path)
+    return st.st_size, _ns(st, "mtime"), st.st_ino, _ns(st, "ctime")
+
+
+class FileHashCache(object):
+    """ Persistent cache of the checksums of files, keyed by their absolute path and stat key,
+    so unchanged files do not need to be read again to compute a manifest.
+
+    It is only an optimization, any error accessing the database is logged and the files are
+    hashed as if they were not cached
+    """
+
+    def __init__(self, dbfile):
+        self._dbfile = dbfile
+
+    @contextmanager
+    def _connect(self):
+        folder = os.path.dirname(self._dbfile)
+        if not os.path.exists(folder):
+            os.makedirs(folder)
+        connection = sqlite3.connect(self._dbfile, timeout=60)
+        connection.text_factory = str
+        try:
+            cursor = connection.cursor()
+            cursor.execute("CREATE TABLE IF NOT EXISTS %s (path TEXT PRIMARY KEY, size INTEGER, "
+                           "mtime_ns INTEGER, inode INTEGER, ctime_ns INTEGER, hash TEXT)"
+                           % HASHES_TABLE)
+            yield cursor
+            connection.commit()
+        finally:
+            connection.close()
+
+    @staticmethod
+    def _prefix_range(folder):
+        """ the paths inside a folder sort between "folder/" and "folder" followed by the
+        character after the separator ("0" for "/")
+        """
+        folder = os.path.normpath(folder)
+        return folder + os.sep, folder + chr(ord(os.sep) + 1)
+
+    def folder_hashes(self, folder, keys):
+        """ :param keys: {abs_path: stat_key} of the current files of the folder
+        :return: {abs_path: hash} of the files whose stored stat key is still the same
+        """
+        try:
+            with self._connect() as cursor:
+                cursor.execute("SELECT path, size, mtime_ns, inode, ctime_ns, hash FROM %s "
+                               "WHERE path >= ? AND path < ?" % HASHES_TABLE,
+                               self._prefix_range(folder))
+                rows = cursor.fetchall()
+        except Exception as e:
+            logger.error("Error reading the file hash cache %s: %s" % (self._dbfile, str(e)))
+            return {}
+        return {row[0]: row[-1] for row in rows if keys.get(row[0]) == tuple(row[1:-1])}
+
+    def update_folder(self, folder, keys, hashes):
+        """ stores the hashes of the files of a folder, dropping the entries of the files that
+        no longer exist in it
+        :param keys: {abs_path: stat_key} of all the files of the folder
+        :param hashes: {abs_path: hash} of the files that were hashed
+        """
+        racy_ns = (time.time() - RACY_SECONDS) * 1000000000
+        try:
+            with self._connect() as cursor:
+                cursor.execute("SELECT path FROM %s WHERE path >= ? AND path < ?"
+                               % HASHES_TABLE, self._prefix_range(folder))
+                removed = [(path, ) for path, in cursor.fetchall() if path not in keys]
+                cursor.executemany("DELETE FROM %s WHERE path = ?" % HASHES_TABLE, removed)
+                cursor.executemany("INSERT OR REPLACE INTO %s (path, size, mtime_ns, inode, "
+                                   "ctime_ns, hash) VALUES (?, ?, ?, ?, ?, ?)" % HASHES_TABLE,
+                                   [(path, ) + keys[path] + (file_hash, )
+                                    for path, file_hash in hashes.items()
+                                    if keys[path][1] < racy_ns])
+        except Exception as e:
+            logger.error("Error writing the file hash cache %s: %s" % (self._dbfile, str(e)))
+
+    def remove(self, paths):
+        """ drops the entries of the given files, and of the files inside the given folders,
+        once they are removed, so the entries of deleted files don't accumulate
+        """
+        try:
+            with self._connect() as cursor:
+                for path in paths:
+                    path = os.path.normpath(path)
+                    cursor.execute("DELETE FROM %s WHERE path = ? OR (path >= ? AND path < ?)"
+                                   % HASHES_TABLE, (path, ) + self._prefix_range(path))
+        except Exception as e:
+            logger.error("Error writing the file hash cache %s: %s" % (self._dbfile, str(e)))
@@ -0,0 +1,32 @@
+import importlib
+import sys
+
+
+def lazy_attributes(module_globals, attributes):
+    """ defines attributes of a module that are imported on first use (PEP 562 module
+    __getattr__ and __dir__), so importing the module doesn't import all of them. The Python
+    versions without module __getattr__ import them now. The module must list them in its
+    __all__ to export them with "from module import *".
+
+    :param module_globals: the globals() of the module
+    :param attributes: {attribute name: module that defines it}
+    """
+    def __getattr__(name):
+        try:
+            module_name = attributes[name]
+        except KeyError:
+            raise AttributeError("module '%s' has no attribute '%s'"
+                                 % (module_globals["__name__"], name))
+        value = getattr(importlib.import_module(module_name), name)
+        module_globals[name] = value
+        return value
+
+    def __dir__():
+        return sorted(set(module_globals) | set(attributes))
+
+    if sys.version_info < (3, 7):  # FIXME: Remove when Python < 3.7 is not supported
+        for attribute in attributes:
+            __getattr__(attribute)
+    else:
+        module_globals["__getattr__"] = __getattr__
+        module_globals["__dir__"] = __dir__
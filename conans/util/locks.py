@@ -1,3 +1,4 @@
+import errno
 import os
 import time
 
@@ -6,6 +7,13 @@ import fasteners
 from conans.util.files import load, save
 from conans.util.log import logger
 
+try:
+    import fcntl
+except ImportError:  # Windows, only the polled locks are available
+    fcntl = None
+
+KERNEL_LOCKS = fcntl is not None
+
 
 class NoLock(object):
 
@@ -36,10 +44,9 @@ class Lock(object):
 
     @staticmethod
     def clean(folder):
-        if os.path.exists(folder + ".count"):
-            os.remove(folder + ".count")
-        if os.path.exists(folder + ".count.lock"):
-            os.remove(folder + ".count.lock")
+        for lock_file in (folder + ".count", folder + ".count.lock", folder + ".lock"):
+            if os.path.exists(lock_file):
+                os.remove(lock_file)
 
     def __init__(self, folder, locked_item, output):
         self._count_file = folder + ".count"
@@ -106,15 +113,93 @@ class WriteLock(Lock):
         if exc_type is not None:
             # If there was an exception while locking this, might be empty
             # Try to clean up the trailing filelocks
-            try:
-                os.remove(self._count_file)
-                os.remove(self._count_lock_file)
-                path = os.path.dirname(self._count_file)
-                for _ in range(3):
-                    try:  # Take advantage that os.rmdir does not delete non-empty dirs
-                        os.rmdir(path)
-                    except Exception:
-                        break  # not empty
-                    path = os.path.dirname(path)
+            _remove_lock_files(self.files)
+
+
+def _remove_lock_files(files):
+    try:
+        for f in files:
+            os.remove(f)
+        path = os.path.dirname(files[0])
+        for _ in range(3):
+            try:  # Take advantage that os.rmdir does not delete non-empty dirs
+                os.rmdir(path)
             except Exception:
-                pass
+                break  # not empty
+            path = os.path.dirname(path)
+    except Exception:
+        pass
+
+
+class KernelLock(Lock):
+    """ shared (readers) or exclusive (writer) lock of the kernel (flock) on a lock file. The
+    waiting processes are woken up as soon as it is released, and the kernel releases it when
+    the process dies, so there are no stale locks. The flock locks are owned by the open file,
+    the threads of the same process exclude each other too.
+    """
+    _exclusive = None
+
+    def __init__(self, folder, locked_item, output):
+        super(KernelLock, self).__init__(folder, locked_item, output)
+        self._lock_file = folder + ".lock"
+        self._fd = None
+
+    @property
+    def files(self):
+        return self._lock_file,
+
+    def _try_lock(self, fd, operation):
+        try:
+            fcntl.flock(fd, operation | fcntl.LOCK_NB)
+            return True
+        except (IOError, OSError) as e:
+            if e.errno not in (errno.EAGAIN, errno.EACCES):
+                raise
+            return False
+
+    def _is_current(self, fd):
+        """ the lock file could be removed (conan remove) while waiting for it, the lock of the
+        removed one doesn't exclude the processes that open the new one
+        """
+        try:
+            return os.fstat(fd).st_ino == os.stat(self._lock_file).st_ino
+        except OSError:
+            return False
+
+    def __enter__(self):
+        operation = fcntl.LOCK_EX if self._exclusive else fcntl.LOCK_SH
+        folder = os.path.dirname(self._lock_file)
+        while True:
+            if not os.path.exists(folder):
+                try:
+                    os.makedirs(folder)
+                except OSError:  # Created by a concurrent process
+                    pass
+            fd = os.open(self._lock_file, os.O_RDWR | os.O_CREAT, 0o666)
+            try:
+                if not self._try_lock(fd, operation):
+                    self._info_locked()
+                    fcntl.flock(fd, operation)  # Blocks until it is released
+                if self._is_current(fd):
+                    self._fd = fd
+                    return
+            except BaseException:
+                os.close(fd)
+                raise
+            os.close(fd)
+
+    def __exit__(self, exc_type, exc_val, exc_tb):  # @UnusedVariable
+        fd, self._fd = self._fd, None
+        if exc_type is not None and self._exclusive:
+            # As the WriteLock, clean up the trailing lock file while it is still locked
+            _remove_lock_files(self.files)
+        fcntl.flock(fd, fcntl.LOCK_UN)
+        os.close(fd)
+
+
+class KernelReadLock(KernelLock):
+    _exclusive = False
+
+
+class KernelWriteLock(KernelLock):
+    _exclusive = True
@@ -1,3 +1,5 @@
+import re
+
 import six
 
 try:
@@ -5,6 +7,8 @@ try:
 except ImportError:  # FIXME: Remove if Python2 support is removed
     from collections import Iterable
 
+from conans.errors import ConanException
+
 
 def make_tuple(value):
     """ Converts the value into a tuple if the value is an iterable with the following exceptions:
@@ -21,3 +25,13 @@ def make_tuple(value):
         return tuple(value)
     else:
         return value,
+
+
+def size_from_text(size):
+    """ Converts a size like "512", "10KB", "1.5M" or "2 GB" (1024 multiples) into bytes
+    """
+    match = re.match(r"^\s*(\d+(?:\.\d+)?)\s*([KMGT]?)B?\s*$", size, re.IGNORECASE)
+    if not match:
+        raise ConanException("Incorrect size definition: %s" % size)
+    value, unit = match.group(1), match.group(2).upper()
+    return int(float(value) * 1024 ** " KMGT".index(unit or " "))
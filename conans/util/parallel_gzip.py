@@ -0,0 +1,86 @@
+import os
+import struct
+import zlib
+from collections import deque
+from multiprocessing.pool import ThreadPool
+
+BLOCK_SIZE = 1024 * 1024
+
+
+def _compress_block(data, compresslevel, last):
+    compressor = zlib.compressobj(compresslevel, zlib.DEFLATED, -zlib.MAX_WBITS)
+    # A sync flush ends the block in a byte boundary, so the next independently compressed
+    # block can be just appended, the same deflate stream continues
+    mode = zlib.Z_FINISH if last else zlib.Z_SYNC_FLUSH
+    return compressor.compress(data) + compressor.flush(mode)
+
+
+class ParallelGzipWriter(object):
+    """ Writable file object that produces a standard single member gzip stream, compressing
+    blocks of BLOCK_SIZE bytes in a pool of threads (zlib releases the GIL while compressing).
+
+    The blocks are compressed independently, so the output only depends on the data and the
+    compression level, never on the number of threads. As gzopen_without_timestamps, the
+    modification time of the header is always 0, so the result is deterministic. It is not
+    the same output of gzip.GzipFile, that gzopen_without_timestamps() only uses when
+    CONAN_COMPRESSION_THREADS is not defined.
+    """
+
+    def __init__(self, name, fileobj, compresslevel, threads):
+        self._fileobj = fileobj
+        self._compresslevel = compresslevel
+        self._pool = ThreadPool(threads)
+        self._max_pending = threads * 2  # Bounds the memory used for the compressed blocks
+        self._pending = deque()
+        self._buffer = bytearray()
+        self._crc = zlib.crc32(b"") & 0xffffffff
+        self._size = 0
+        self._closed = False
+        self._write_header(name)
+
+    def _write_header(self, name):
+        fname = os.path.basename(name or "")
+        if fname.endswith(".gz"):
+            fname = fname[:-3]
+        fname = fname.encode("latin-1")
+        flags = 0x08 if fname else 0  # FNAME
+        extra_flags = 2 if self._compresslevel == 9 else (4 if self._compresslevel == 1 else 0)
+        self._fileobj.write(b"\x1f\x8b\x08" + struct.pack("<BIBB", flags, 0, extra_flags, 255))
+        if fname:
+            self._fileobj.write(fname + b"\x00")
+
+    def write(self, data):
+        if self._closed:
+            raise ValueError("write() on closed ParallelGzipWriter object")
+        data = bytes(data)
+        self._crc = zlib.crc32(data, self._crc) & 0xffffffff
+        self._size += len(data)
+        self._buffer.extend(data)
+        while len(self._buffer) >= BLOCK_SIZE:
+            block = bytes(self._buffer[:BLOCK_SIZE])
+            del self._buffer[:BLOCK_SIZE]
+            self._submit(block, last=False)
+        return len(data)
+
+    def tell(self):
+        return self._size
+
+    def _submit(self, block, last):
+        self._pending.append(self._pool.apply_async(_compress_block,
+                                                    (block, self._compresslevel, last)))
+        while len(self._pending) > self._max_pending:
+            self._fileobj.write(self._pending.popleft().get())
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._submit(bytes(self._buffer), last=True)
+            self._buffer = bytearray()
+            while self._pending:
+                self._fileobj.write(self._pending.popleft().get())
+            self._fileobj.write(struct.pack("<II", self._crc, self._size & 0xffffffff))
+        finally:
+            self._pool.close()
+            self._pool.join()
@@ -0,0 +1,102 @@
+import copy
+import errno
+import os
+import tarfile
+from collections import deque
+from multiprocessing.pool import ThreadPool
+
+import six
+
+MAX_PENDING_BYTES = 64 * 1024 * 1024  # Bounds the memory of the files read but not written yet
+MAX_MEMBER_SIZE = 16 * 1024 * 1024  # Bigger files are written from the reading thread
+
+
+def _makedirs(folder):
+    try:
+        os.makedirs(folder)
+    except OSError as e:  # Other worker might have created it concurrently
+        if e.errno != errno.EEXIST or not os.path.isdir(folder):
+            raise
+
+
+def _set_attrs(the_tar, tarinfo, path):
+    """ the same attributes that TarFile.extract() sets, it is thread safe as these methods
+    do not touch the state of the tar
+    """
+    try:
+        if six.PY2:
+            the_tar.chown(tarinfo, path)
+        else:
+            the_tar.chown(tarinfo, path, False)
+        if not tarinfo.issym():
+            the_tar.chmod(tarinfo, path)
+            the_tar.utime(tarinfo, path)
+    except tarfile.ExtractError:  # Not raised with the default errorlevel, as extract()
+        if the_tar.errorlevel > 1:
+            raise
+
+
+def _write_member(the_tar, tarinfo, data, destination_dir):
+    path = os.path.join(destination_dir, *tarinfo.name.split("/"))
+    folder = os.path.dirname(path)
+    if not os.path.isdir(folder):
+        _makedirs(folder)
+    if os.path.lexists(path):
+        os.unlink(path)
+    with open(path, "wb") as f:
+        f.write(data)
+    _set_attrs(the_tar, tarinfo, path)
+
+
+def parallel_extractall(the_tar, members, destination_dir, threads):
+    """ Extracts the members as TarFile.extractall(), but the tar is decompressed and read in
+    this thread while the regular files are created and written by a pool of threads, as for
+    packages with many small files the filesystem calls are the bottleneck.
+
+    Everything that is not a small regular file is extracted in this thread in the order of
+    the archive, after the previous files have been written, so directories, symlinks and
+    files overwriting other ones behave exactly as extractall().
+    """
+    pool = ThreadPool(threads)
+    pending = deque()
+    pending_size = [0]
+    submitted = set()  # The names of the pending members
+    directories = []
+
+    def wait_pending(max_size):
+        while pending and pending_size[0] > max_size:
+            size, result = pending.popleft()
+            result.get()
+            pending_size[0] -= size
+        if not pending:
+            submitted.clear()
+
+    try:
+        for tarinfo in members:
+            if tarinfo.isreg() and tarinfo.size <= MAX_MEMBER_SIZE:
+                if tarinfo.name in submitted:  # The last one wins, as extractall()
+                    wait_pending(-1)
+                submitted.add(tarinfo.name)
+                data = the_tar.extractfile(tarinfo).read()
+                pending.append((len(data), pool.apply_async(_write_member, (the_tar, tarinfo, data,
+                                                                            destination_dir))))
+                pending_size[0] += len(data)
+                wait_pending(MAX_PENDING_BYTES)
+                continue
+
+            wait_pending(-1)  # Keep the order of the archive
+            if tarinfo.isdir():
+                # The same as extractall(), the directories are writable until the end
+                directories.append(tarinfo)
+                tarinfo = copy.copy(tarinfo)
+                tarinfo.mode = 0o700
+            the_tar.extract(tarinfo, destination_dir)
+        wait_pending(-1)
+    finally:
+        pool.close()
+        pool.join()
+
+    # Set the attributes of the directories, deepest first, as extractall()
+    directories.sort(key=lambda d: d.name, reverse=True)
+    for tarinfo in directories:
+        _set_attrs(the_tar, tarinfo, os.path.join(destination_dir, *tarinfo.name.split("/")))
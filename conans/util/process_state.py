@@ -0,0 +1,51 @@
+import os
+import threading
+from contextlib import contextmanager
+
+
+class ProcessStateLock(object):
+    """ Serializes the threads that can modify the process-wide state (current directory,
+    environment variables, sys.path) while building packages concurrently.
+
+    The owner thread can temporarily release it while it is just waiting for a subprocess, so
+    other threads can make progress. When the lock is acquired back, the current directory and
+    the environment of the owner are restored.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._owner = None
+
+    @contextmanager
+    def hold(self):
+        self._lock.acquire()
+        self._owner = threading.current_thread()
+        try:
+            yield
+        finally:
+            self._owner = None
+            self._lock.release()
+
+    @contextmanager
+    def released(self):
+        owner = threading.current_thread()
+        if self._owner is not owner:  # Not in a concurrent build, nothing to release
+            yield
+            return
+
+        cwd = os.getcwd()
+        environ = os.environ.copy()
+        self._owner = None
+        self._lock.release()
+        try:
+            yield
+        finally:
+            self._lock.acquire()
+            self._owner = owner
+            os.chdir(cwd)
+            if os.environ != environ:
+                os.environ.clear()
+                os.environ.update(environ)
+
+
+process_state_lock = ProcessStateLock()
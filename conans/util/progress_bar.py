@@ -2,8 +2,6 @@ import os
 from contextlib import contextmanager
 import time
 
-from tqdm import tqdm
-
 from conans.client.output import ConanOutput
 
 TIMEOUT_BEAT_SECONDS = 30
@@ -25,10 +23,12 @@ class ProgressOutput(ConanOutput):
         super(ProgressOutput, self).__init__(output._stream, output._stream_err, output._color)
 
     def _write(self, data, newline=False):
+        from tqdm import tqdm
         end = "\n" if newline else ""
         tqdm.write(str(data), file=self._stream, end=end)
 
     def _write_err(self, data, newline=False):
+        from tqdm import tqdm
         end = "\n" if newline else ""
         tqdm.write(str(data), file=self._stream_err, end=end)
 
@@ -44,6 +44,7 @@ class Progress(object):
             self._description) if not post_description else post_description
         self._last_time = time.time()
         if self._output and self._output.is_terminal and self._description:
+            from tqdm import tqdm
             self._tqdm_bar = tqdm(total=self._total_length,
                                   desc=left_justify_description(self._description),
                                   file=self._output, unit="B", leave=False, dynamic_ncols=False,
@@ -74,6 +75,7 @@ class Progress(object):
 
     def pb_close(self):
         if self._tqdm_bar is not None:
+            from tqdm import tqdm
             self._tqdm_bar.close()
             msg = "\r{} [{:1.2f}k]".format(self._post_description, self._processed_size / 1024.0)
             tqdm.write(left_justify_message(msg), file=self._output, end="\n")
@@ -115,6 +117,7 @@ class ListWrapper(object):
             self._description) if not post_description else post_description
         self._last_time = time.time()
         if self._output and self._output.is_terminal:
+            from tqdm import tqdm
             self._tqdm_bar = tqdm(total=len(files_list),
                                   desc=left_justify_description(self._description),
                                   file=self._output, unit="files ", leave=False, dynamic_ncols=False,
@@ -130,6 +133,7 @@ class ListWrapper(object):
 
     def pb_close(self):
         if self._output and self._output.is_terminal:
+            from tqdm import tqdm
             self._tqdm_bar.close()
             msg = "\r{} [{} files]".format(self._post_description, self._total_length)
             tqdm.write(left_justify_message(msg), file=self._output, end="\n")
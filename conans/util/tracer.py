@@ -165,8 +165,15 @@ def log_download(url, duration):
     _append_action("DOWNLOAD", {"url": url, "duration": duration})
 
 
-def log_uncompressed_file(src_path, duration, dest_folder):
-    _append_action("UNZIP", {"src": src_path, "dst": dest_folder, "duration": duration})
+def log_uncompressed_file(src_path, duration, dest_folder, files=None, size=None):
+    props = {"src": src_path, "dst": dest_folder, "duration": duration}
+    if files is not None:
+        props["files"] = files
+        props["size"] = size
+        # Throughput, so extractions with different settings can be compared
+        props["files_per_second"] = files / duration if duration else None
+        props["bytes_per_second"] = size / duration if duration else None
+    _append_action("UNZIP", props)
 
 
 def log_compressed_files(files, duration, tgz_path):